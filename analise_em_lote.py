@@ -0,0 +1,93 @@
+# ==========================================
+# ANÁLISE EM LOTE (SEM INTERFACE)
+# ==========================================
+# Analisa um arquivo inteiro de funções (uma por linha) usando todos os núcleos
+# do computador e escreve um resultado JSON por linha (JSONL), assim que cada um fica pronto.
+#
+# Exemplo:
+#     python analise_em_lote.py exercicios.txt -o resultados.jsonl --prazo 30
+#
+# Linhas vazias e linhas começando com '#' são ignoradas.
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import as_completed
+
+from utils.execucao_limitada import TempoEsgotado, agendar, configurar_trabalhadores, executar_com_prazo
+from utils.motor_analise import SECOES, analisar_expressao
+
+
+def ler_expressoes(caminho):
+    """Lê as funções do arquivo, guardando o número da linha de cada uma."""
+    with open(caminho, encoding="utf-8") as arquivo:
+        for numero, linha in enumerate(arquivo, start=1):
+            texto = linha.strip()
+            if texto and not texto.startswith("#"):
+                yield numero, texto
+
+
+def analisar_item(numero, texto, tendencia, secoes, prazo):
+    """Analisa uma função em um processo trabalhador, com prazo para o item inteiro."""
+    inicio = time.perf_counter()
+    try:
+        relatorio = executar_com_prazo(analisar_expressao, texto, tendencia, secoes, prazo=prazo)
+        if "interpretacao" in relatorio["erros"]:
+            status = "invalida"
+        else:
+            status = "ok" if not relatorio["erros"] else "parcial"
+    except TempoEsgotado:
+        relatorio = {"entrada": texto, "erros": {"item": "tempo_esgotado"}}
+        status = "tempo_esgotado"
+    except Exception as erro:
+        relatorio = {"entrada": texto, "erros": {"item": f"{type(erro).__name__}: {erro}"}}
+        status = "erro"
+
+    relatorio["linha"] = numero
+    relatorio["status"] = status
+    relatorio["tempo_total"] = time.perf_counter() - inicio
+    return relatorio
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Analisa em lote as funções de um arquivo (uma por linha).")
+    parser.add_argument("arquivo", help="arquivo de texto com uma função por linha")
+    parser.add_argument("-o", "--saida", help="arquivo JSONL de saída (padrão: tela)")
+    parser.add_argument("--tendencia", default="0", help="ponto do limite (ex: 0, 1/2, oo, -oo)")
+    parser.add_argument("--prazo", type=float, default=60, help="tempo máximo por função, em segundos")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1,
+                        help="quantidade de processos (padrão: todos os núcleos)")
+    parser.add_argument("--secoes", nargs="+", choices=list(SECOES), help="analisa só estas seções")
+    args = parser.parse_args(argumentos)
+
+    configurar_trabalhadores(args.processos)
+
+    saida = open(args.saida, "w", encoding="utf-8") if args.saida else sys.stdout
+    resumo = {"ok": 0, "parcial": 0, "invalida": 0, "tempo_esgotado": 0, "erro": 0}
+    inicio = time.perf_counter()
+
+    try:
+        tarefas = [
+            agendar(analisar_item, numero, texto, args.tendencia, args.secoes, args.prazo)
+            for numero, texto in ler_expressoes(args.arquivo)
+        ]
+
+        # Escreve cada resultado assim que fica pronto (a ordem é a de término, use "linha" para ordenar)
+        for tarefa in as_completed(tarefas):
+            relatorio = tarefa.result()
+            resumo[relatorio["status"]] += 1
+            saida.write(json.dumps(relatorio, ensure_ascii=False) + "\n")
+            saida.flush()
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+
+    total = sum(resumo.values())
+    print(f"{total} funções em {time.perf_counter() - inicio:.1f}s: {resumo}", file=sys.stderr)
+    return 0 if resumo["erro"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+# ==========================================
+# BENCHMARK DAS ETAPAS DE ANÁLISE
+# ==========================================
+# Mede o tempo e o pico de memória de cada etapa (interpretação, gráfico, assíntotas,
+# limite, raízes, inequações, derivada e integral) para um conjunto de funções
+# representativas, salva tudo em JSON e compara com uma execução anterior.
+#
+# Exemplos:
+#     python benchmark.py -o antes.json
+#     python benchmark.py -o depois.json --comparar antes.json --tolerancia 1.25
+#
+# O cache em disco é desligado durante as medições (senão a segunda execução "roubaria").
+
+import os
+
+os.environ["LIMITE_CACHE_DESATIVADO"] = "1"
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from sympy import symbols, S
+from sympy.core.cache import clear_cache
+
+from utils.calcular_e_exibir_integral import calcular_integral
+from utils.calculos import calcular_limite_no_ponto, resolver_inequacoes, separar_raizes
+from utils.contexto_analise import obter_analise
+from utils.derivadas import calcular_derivada
+from utils.execucao_limitada import TempoEsgotado, executar_com_prazo
+from utils.gerar_dados_graficos import calcular_dados_grafico
+from utils.gerar_graficos import calcular_assintotas_verticais, calcular_assintotas_horizontais, \
+    calcular_assintota_obliqua
+from utils.avaliador_numerico import compilar_expressao, _subexpressoes_compiladas
+from utils.dominio import compilar_mascara, restricoes_do_dominio
+from utils.normalizadores import interpretar_expressao, _interpretar_canonica
+from utils.simplificacao import _simplificacao_guardada
+
+
+# ------------------------------------------
+# Corpus: (categoria, função)
+# ------------------------------------------
+CORPUS = [
+    ("racional", "(4 - x^2)/(2 + x)"),
+    ("racional", "(x^3 - 2x + 1)/(x^2 - 1)"),
+    ("racional", "1/(x^2 + 1)"),
+    ("racional", "(2x^2 + 3)/(x - 5)"),
+    ("trigonometrica", "sen(x)/x"),
+    ("trigonometrica", "x^2 * sin(x)"),
+    ("trigonometrica", "tan(x) + cos(2x)"),
+    ("raiz", "raiz(x^2 + 1)"),
+    ("raiz", "sqrt(x - 1)/(x - 3)"),
+    ("raiz", "x^(1/3) - x"),
+    ("log_exp", "log(x)/x"),
+    ("log_exp", "exp(-x^2)"),
+    ("log_exp", "x * exp(1/x)"),
+    ("por_partes", "abs(x)/x"),
+    ("por_partes", "floor(x)"),
+    ("por_partes", "abs(x - 1) + abs(x + 1)"),
+    ("patologica", "x^x^x/(exp(1/x) + sin(x^3))"),
+    ("patologica", "sin(1/x) * exp(-1/x^2)"),
+    ("patologica", "(x^30 - 1)/(x^17 + x^5 + 1)"),
+    ("patologica", "log(log(x)) * tan(sqrt(x))"),
+]
+
+
+# ------------------------------------------
+# Etapas medidas
+# ------------------------------------------
+def _etapa_interpretacao(variavel1, texto):
+    return interpretar_expressao(variavel1, texto)
+
+
+def _etapa_grafico(variavel1, texto):
+    return calcular_dados_grafico(variavel1, interpretar_expressao(variavel1, texto), 0)
+
+
+def _etapa_assintotas_verticais(variavel1, texto):
+    return calcular_assintotas_verticais(variavel1, interpretar_expressao(variavel1, texto))
+
+
+def _etapa_assintotas_horizontais(variavel1, texto):
+    return calcular_assintotas_horizontais(variavel1, interpretar_expressao(variavel1, texto))
+
+
+def _etapa_assintota_obliqua(variavel1, texto):
+    return calcular_assintota_obliqua(variavel1, interpretar_expressao(variavel1, texto))
+
+
+def _etapa_limite(variavel1, texto):
+    return calcular_limite_no_ponto(variavel1, interpretar_expressao(variavel1, texto), S.Zero)
+
+
+def _etapa_raizes(variavel1, texto):
+    return separar_raizes(variavel1, interpretar_expressao(variavel1, texto))
+
+
+def _etapa_inequacoes(variavel1, texto):
+    expr = interpretar_expressao(variavel1, texto)
+    return resolver_inequacoes(variavel1, expr, ">"), resolver_inequacoes(variavel1, expr, "<")
+
+
+def _etapa_derivada(variavel1, texto):
+    return calcular_derivada(variavel1, interpretar_expressao(variavel1, texto))
+
+
+def _etapa_integral(variavel1, texto):
+    return calcular_integral(variavel1, interpretar_expressao(variavel1, texto))
+
+
+ETAPAS = {
+    "interpretacao": _etapa_interpretacao,
+    "grafico": _etapa_grafico,
+    "assintotas_verticais": _etapa_assintotas_verticais,
+    "assintotas_horizontais": _etapa_assintotas_horizontais,
+    "assintota_obliqua": _etapa_assintota_obliqua,
+    "limite": _etapa_limite,
+    "raizes": _etapa_raizes,
+    "inequacoes": _etapa_inequacoes,
+    "derivada": _etapa_derivada,
+    "integral": _etapa_integral,
+}
+
+
+def limpar_caches_em_memoria():
+    """Esvazia os caches em memória (do projeto e do Sympy) para cada medição começar "do zero"."""
+    clear_cache()
+    _interpretar_canonica.cache_clear()
+    compilar_expressao.cache_clear()
+    _subexpressoes_compiladas.cache_clear()
+    restricoes_do_dominio.cache_clear()
+    compilar_mascara.cache_clear()
+    obter_analise.cache_clear()
+    _simplificacao_guardada.cache_clear()
+    calcular_integral.cache_clear()
+
+
+def medir_etapa(nome, texto, medir_memoria):
+    """
+    Roda dentro do processo trabalhador: mede uma etapa para uma função.
+    A interpretação do texto é feita antes (fora da medição) nas etapas que não são a própria interpretação.
+    """
+    variavel1 = symbols('x')
+    limpar_caches_em_memoria()
+    if nome != "interpretacao":
+        interpretar_expressao(variavel1, texto)
+
+    if medir_memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        ETAPAS[nome](variavel1, texto)
+        status = "ok"
+    except Exception as erro:
+        status = f"erro: {type(erro).__name__}"
+    tempo = time.perf_counter() - inicio
+
+    pico = None
+    if medir_memoria:
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return tempo, pico, status
+
+
+def executar_benchmark(corpus, etapas, repeticoes, prazo):
+    """Mede cada etapa de cada função: menor tempo entre as repetições e pico de memória."""
+    resultados = {}
+    for categoria, texto in corpus:
+        print(f"[{categoria}] {texto}", file=sys.stderr)
+        linha = resultados.setdefault(texto, {"categoria": categoria, "etapas": {}})
+
+        for nome in etapas:
+            medicao = {"tempo": None, "memoria_pico": None, "status": "ok"}
+            try:
+                # Tempo sem tracemalloc (ele deixa tudo mais lento); memória em uma rodada separada
+                tempos = []
+                for _ in range(repeticoes):
+                    tempo, _, status = executar_com_prazo(medir_etapa, nome, texto, False, prazo=prazo)
+                    tempos.append(tempo)
+                medicao["tempo"] = min(tempos)
+                medicao["status"] = status
+                _, pico, _ = executar_com_prazo(medir_etapa, nome, texto, True, prazo=prazo)
+                medicao["memoria_pico"] = pico
+            except TempoEsgotado:
+                medicao["status"] = "tempo_esgotado"
+                medicao["tempo"] = prazo
+
+            linha["etapas"][nome] = medicao
+
+    return resultados
+
+
+def comparar(atual, anterior, tolerancia, piso):
+    """
+    Lista as etapas que ficaram mais lentas: tempo novo maior que tolerancia × tempo antigo
+    e diferença acima do piso (em segundos), para não acusar ruído de medição.
+    """
+    regressoes = []
+    for texto, linha in atual.items():
+        antigas = anterior.get(texto, {}).get("etapas", {})
+        for nome, medicao in linha["etapas"].items():
+            antiga = antigas.get(nome)
+            if not antiga or antiga.get("tempo") is None or medicao["tempo"] is None:
+                continue
+            if medicao["tempo"] > antiga["tempo"] * tolerancia and medicao["tempo"] - antiga["tempo"] > piso:
+                regressoes.append((texto, nome, antiga["tempo"], medicao["tempo"]))
+    return regressoes
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark das etapas de análise.")
+    parser.add_argument("-o", "--saida", default="benchmark.json", help="arquivo JSON com os resultados")
+    parser.add_argument("--comparar", help="resultado anterior (JSON) para procurar regressões")
+    parser.add_argument("--tolerancia", type=float, default=1.25,
+                        help="fator de piora aceito antes de acusar regressão (padrão: 1.25)")
+    parser.add_argument("--piso", type=float, default=0.005,
+                        help="diferença mínima em segundos para acusar regressão (padrão: 0.005)")
+    parser.add_argument("--repeticoes", type=int, default=3, help="repetições de cada medição de tempo")
+    parser.add_argument("--prazo", type=float, default=30, help="tempo máximo por medição, em segundos")
+    parser.add_argument("--etapas", nargs="+", choices=list(ETAPAS), default=list(ETAPAS))
+    parser.add_argument("--categorias", nargs="+", help="mede só estas categorias do corpus")
+    args = parser.parse_args(argumentos)
+
+    corpus = [(c, t) for c, t in CORPUS if not args.categorias or c in args.categorias]
+    resultados = executar_benchmark(corpus, args.etapas, args.repeticoes, args.prazo)
+
+    relatorio = {
+        "data": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "resultados": resultados,
+    }
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+    # Resumo por etapa: soma dos tempos de todas as funções
+    print(f"\n{'etapa':<24}{'tempo total (s)':>16}{'pico máx. (KiB)':>18}")
+    for nome in args.etapas:
+        medicoes = [linha["etapas"][nome] for linha in resultados.values()]
+        tempo = sum(m["tempo"] or 0 for m in medicoes)
+        pico = max((m["memoria_pico"] or 0 for m in medicoes), default=0) / 1024
+        print(f"{nome:<24}{tempo:>16.3f}{pico:>18.0f}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)["resultados"]
+        regressoes = comparar(resultados, anterior, args.tolerancia, args.piso)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões) acima de {args.tolerancia}x:")
+            for texto, nome, antes, depois in regressoes:
+                print(f"  {nome:<24}{texto:<36}{antes:.4f}s -> {depois:.4f}s")
+            return 1
+        print("\nNenhuma regressão encontrada.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
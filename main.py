@@ -1,18 +1,26 @@
 # ==========================================
 # 1. IMPORTAÇÃO DE BIBLIOTECAS
 # ==========================================
+import uuid
+
 import streamlit as st
-from sympy import symbols, S
+from sympy import symbols, S, Float, nsimplify
 
-from utils.calcular_e_exibir_integral import calcular_e_exibir_integral
+from utils.calcular_e_exibir_integral import calcular_e_exibir_integral, calcular_e_exibir_integral_definida
 # SEUS IMPORTS ANTIGOS
-from utils.calculos import calcular_e_exibir_limite, analisar_inequacoes, calcular_raizes
+from utils.calculos import calcular_e_exibir_limite, analisar_inequacoes, calcular_raizes, \
+    calcular_limite_no_ponto, calcular_analise_local, separar_raizes
 from utils.css_config import obter_configuracao_tema, aplicar_css, renderizar_layout_colunas, renderizar_header
 from utils.gerar_dados_graficos import calcular_dados_grafico
-from utils.gerar_graficos import criar_figura_base, configurar_layout_grafico, adicionar_visualizacao_limite, \
-    inicializar_grafico, analisar_assintotas_verticais, analisar_assintotas_horizontais, analisar_assintotas_obliquas
+from utils.gerar_graficos import criar_figura_base, exibir_grafico, adicionar_visualizacao_limite, \
+    inicializar_grafico, analisar_assintotas_verticais, analisar_assintotas_horizontais, analisar_assintotas_obliquas, \
+    calcular_assintotas_verticais, calcular_assintotas_horizontais, calcular_assintota_obliqua, \
+    adicionar_marcadores_raizes
+from utils.execucao_limitada import agendar
+from utils.contexto_analise import obter_analise
 from utils.normalizadores import interpretar_expressao
 from utils.listas_de_exercicios import renderizar_pagina_listas
+from utils.diagnostico import obter_diagnostico
 
 # >>> NOVO IMPORT AQUI <<<
 from utils.derivadas import calcular_e_exibir_derivada
@@ -20,208 +28,315 @@ from utils.derivadas import calcular_e_exibir_derivada
 # ==========================================
 # FUNÇÕES DE ENTRADA (MANTIVE IGUAL)
 # ==========================================
-def obter_inputs(coluna):
+# Posições do controle deslizante "x tende a"
+TENDENCIAS = [-S.Infinity] + list(range(-100, 101)) + [S.Infinity]
+
+
+def obter_inputs(coluna, variavel1):
     with coluna:
         st.write("Digite a função em termos de x")
         st.write("(Ex: (4 - x^2)/(2 + x))")
         expr_input = st.text_input("Função f(x):", "(4 - x^2)/(2 + x)")
-        tendencias = list(range(-100, 101))
-        tendencias = [-S.Infinity] + tendencias + [S.Infinity]
-        tendencia = st.select_slider("x tende a:", options=tendencias, value=0)
+        tendencia = st.select_slider("x tende a:", options=TENDENCIAS, value=0)
+
+        # Pontos que o controle deslizante não tem (ex: 1/2, pi/4, 0.3); vazio = usa o controle
+        ponto_input = st.text_input("Ou digite o ponto (opcional):", "", placeholder="Ex: 1/2, pi/4, 0.3")
+        if ponto_input.strip():
+            try:
+                ponto = interpretar_expressao(variavel1, ponto_input)
+                if ponto.free_symbols or not (ponto.is_extended_real or ponto in [S.Infinity, -S.Infinity]):
+                    raise ValueError(ponto_input)
+                # Decimal digitado (ex: 0.3) vira fração exata (3/10), como os pontos do controle
+                tendencia = nsimplify(ponto, rational=True) if ponto.has(Float) else ponto
+            except Exception:
+                st.caption("Ponto inválido: usando o valor do controle deslizante.")
     return expr_input, tendencia
 
 # ==========================================
-# MAIN
+# PÁGINAS (FRAGMENTOS)
 # ==========================================
-def main():
-    # 1. Configurações Iniciais
-    variavel1 = symbols('x')
-    st.set_page_config(page_title="Analisador Completo de Funções", layout="wide")
+# Cada página é um fragmento do Streamlit: mexer num campo da página roda só a página,
+# sem refazer o cabeçalho e o CSS. Dentro da página de gráficos, o desenho do gráfico e os
+# botões de inequação são fragmentos menores ainda (rodam sozinhos quando clicados).
+# As entradas de cada fragmento são só os seus argumentos (e os campos dentro dele).
+# O diagnóstico de desempenho (?diagnostico=1 na URL) é criado e exibido dentro de cada
+# página: assim ele é refeito também quando só o fragmento roda de novo.
+
+@st.fragment
+def pagina_graficos(variavel1, theme):
+    """Página principal: gráfico, assíntotas, limite, inequações e raízes."""
+    diagnostico = obter_diagnostico()
+    col_esq, col_dir = renderizar_layout_colunas(theme['border_color'])
+    expr_input, tendencia = obter_inputs(col_esq, variavel1)
+
+    try:
+        with diagnostico.etapa("Interpretação"):
+            expr = interpretar_expressao(variavel1, expr_input)
 
-    # 2. Define a página inicial caso seja o primeiro acesso
-    if 'pagina_atual' not in st.session_state:
-        st.session_state['pagina_atual'] = "Gráficos"
+        # As análises não dependem umas das outras: todas começam ao mesmo tempo
+        # (em segundo plano) enquanto o gráfico é montado. Os resultados são
+        # exibidos depois, na ordem de sempre. Limites repetidos entre os painéis
+        # são calculados uma vez só (contexto de análise compartilhado).
+        analise = obter_analise(variavel1, expr)
+        calculos = {
+            "verticais": agendar(calcular_assintotas_verticais, variavel1, expr),
+            "horizontais": agendar(calcular_assintotas_horizontais, variavel1, expr),
+            "obliqua": agendar(calcular_assintota_obliqua, variavel1, expr),
+            "limite": agendar(calcular_limite_no_ponto, variavel1, expr, tendencia),
+            "analise_local": agendar(calcular_analise_local, variavel1, expr, tendencia),
+            "visualizacao_limite": agendar(analise.limite_em, tendencia),
+        }
+
+        # Tabela de limites para todas as posições do controle deslizante, em segundo plano,
+        # começando pelas mais próximas da atual (os próximos movimentos viram consultas).
+        # Cada sessão tem a sua: trocar de função aqui não para a tabela de outro visitante.
+        centro = float(tendencia) if S(tendencia).is_finite else 0.0
+        sessao = st.session_state.setdefault("id_sessao", uuid.uuid4().hex)
+        analise.agendar_tabela_de_limites(sorted(TENDENCIAS[1:-1], key=lambda p: abs(p - centro)), sessao)
+
+        with diagnostico.etapa("Amostragem do gráfico"):
+            x_vals, y_vals, x_min, x_max, y_lim = calcular_dados_grafico(variavel1, expr, tendencia)
 
-    # 3. Chama o cabeçalho azul no topo (sempre visível)
-    renderizar_header()
+        # As raízes numéricas reaproveitam a grade do gráfico (trocas de sinal)
+        calculos["raizes"] = agendar(separar_raizes, variavel1, expr, x_vals, y_vals)
+
+        with diagnostico.etapa("Figura base"):
+            inicializar_grafico(expr, col_esq)
+            fig = criar_figura_base(variavel1, x_vals, y_vals, tendencia, expr)
+
+        # ==========================================
+        # PREENCHENDO A COLUNA DA DIREITA (CÁLCULOS)
+        # ==========================================
+        with col_dir:
+            # Passando os argumentos EXATAMENTE como o seu arquivo exige:
+            with diagnostico.etapa("Assíntotas verticais"):
+                analisar_assintotas_verticais(variavel1, expr, fig, y_lim, calculos["verticais"])
+            with diagnostico.etapa("Assíntotas horizontais"):
+                analisar_assintotas_horizontais(variavel1, expr, fig, x_min, x_max, calculos["horizontais"])
+            with diagnostico.etapa("Assíntotas oblíquas"):
+                analisar_assintotas_obliquas(variavel1, expr, fig, x_vals, calculos["obliqua"])
+
+            with diagnostico.etapa("Limite"):
+                calcular_e_exibir_limite(variavel1, expr, tendencia, calculos["limite"], calculos["analise_local"])
+            with diagnostico.etapa("Visualização do limite"):
+                adicionar_visualizacao_limite(variavel1, fig, expr, tendencia, x_min, x_max, y_lim,
+                                              calculos["visualizacao_limite"])
+
+            with diagnostico.etapa("Inequações"):
+                analisar_inequacoes(variavel1, expr)
+            with diagnostico.etapa("Raízes"):
+                raizes_reais = calcular_raizes(variavel1, expr, calculos["raizes"])
+                adicionar_marcadores_raizes(fig, raizes_reais, x_min, x_max)
 
-    # 4. Configurações Visuais e Tema (sempre visíveis)
-    tema_escuro = st.toggle("🌙", value=True)
-    theme = obter_configuracao_tema(tema_escuro)
-    aplicar_css(theme)
+        # ==========================================
+        # EXIBINDO O GRÁFICO FINAL NA COLUNA ESQUERDA
+        # ==========================================
+        with col_esq:
+            # Layout + desenho ficam num fragmento: o modo "apenas a função" não refaz as análises
+            with diagnostico.etapa("Layout e serialização do gráfico"):
+                exibir_grafico(variavel1, expr, fig, theme, x_min, x_max, y_lim)
+    except Exception as e:
+        st.error(f"Não foi possível processar a função: {e}")
 
-    # ==========================================
-    # 5. CONTROLE DE NAVEGAÇÃO (A MÁGICA)
-    # ==========================================
+    diagnostico.exibir()
 
-    if st.session_state['pagina_atual'] == "Gráficos":
-        col_esq, col_dir = renderizar_layout_colunas(theme['border_color'])
-        expr_input, tendencia = obter_inputs(col_esq)
 
-        try:
-            expr = interpretar_expressao(variavel1, expr_input)
-            x_vals, y_vals, x_min, x_max, y_lim = calcular_dados_grafico(variavel1, expr, tendencia)
+@st.fragment
+def pagina_derivada(variavel1):
+    """Página da derivada com o passo a passo."""
+    diagnostico = obter_diagnostico()
 
-            modo_simples = inicializar_grafico(expr, col_esq)
-            fig = criar_figura_base(variavel1, x_vals, y_vals, tendencia, expr, modo_simples)
+    st.title("📈 Calculadora de Derivadas")
 
-            # ==========================================
-            # PREENCHENDO A COLUNA DA DIREITA (CÁLCULOS)
-            # ==========================================
-            with col_dir:
-                # Passando os argumentos EXATAMENTE como o seu arquivo exige:
-                analisar_assintotas_verticais(variavel1, expr, fig, y_lim)
-                analisar_assintotas_horizontais(variavel1, expr, fig, x_min, x_max)
-                analisar_assintotas_obliquas(variavel1, expr, fig, x_vals)
+    st.write("Digite uma função abaixo para ver o resultado e o passo a passo da derivação.")
 
-                calcular_e_exibir_limite(variavel1, expr, tendencia)
-                adicionar_visualizacao_limite(variavel1, fig, expr, tendencia, x_min, x_max, y_lim, modo_simples)
+    # 1. Dividimos a tela: Coluna maior pro texto, menor pro LaTeX
 
-                analisar_inequacoes(variavel1, expr)
-                calcular_raizes(variavel1, expr)
+    col_input, col_latex = st.columns([2, 1])
 
-            # ==========================================
-            # EXIBINDO O GRÁFICO FINAL NA COLUNA ESQUERDA
-            # ==========================================
-            with col_esq:
-                # Aplica o layout (agora com os limites dos eixos corretos)
-                configurar_layout_grafico(fig, theme, x_min, x_max, y_lim)
+    with col_input:
 
-                # Desenha o gráfico na tela
-                st.plotly_chart(fig, use_container_width=True)
-        except Exception as e:
-            st.error(f"Não foi possível processar a função: {e}")
+        expr_input_derivada = st.text_input("Função f(x):", value="x**2 * sin(x)")
 
+    # Variável para segurar a função depois de lida
 
+    expr_deriv = None
 
-#botão das deri
+    if expr_input_derivada:
 
-    elif st.session_state['pagina_atual'] == "Derivada":
+        try:
 
-        st.title("📈 Calculadora de Derivadas")
+            # Tenta ler o que o usuário digitou
 
-        st.write("Digite uma função abaixo para ver o resultado e o passo a passo da derivação.")
+            expr_deriv = interpretar_expressao(variavel1, expr_input_derivada)
 
-        # 1. Dividimos a tela: Coluna maior pro texto, menor pro LaTeX
+            # Se leu com sucesso, exibe o LaTeX na coluna da direita!
 
-        col_input, col_latex = st.columns([2, 1])
+            with col_latex:
 
-        with col_input:
+                st.markdown("<br>", unsafe_allow_html=True)  # Dá um espacinho para alinhar com a caixa de texto
 
-            expr_input_derivada = st.text_input("Função f(x):", value="x**2 * sin(x)")
+                # Importando o latex do sympy rapidinho caso não esteja no topo do arquivo
 
-        # Variável para segurar a função depois de lida
+                from sympy import latex
 
-        expr_deriv = None
+                st.latex(rf"f(x) = {latex(expr_deriv)}")
 
-        if expr_input_derivada:
 
-            try:
+        except Exception:
+
+            # Se o usuário estiver digitando e a função ainda estiver "quebrada" (ex: "x + ")
+
+            with col_latex:
 
-                # Tenta ler o que o usuário digitou
+                st.markdown("<br><br>", unsafe_allow_html=True)
 
-                expr_deriv = interpretar_expressao(variavel1, expr_input_derivada)
+                st.caption("⏳ Aguardando função válida...")
 
-                # Se leu com sucesso, exibe o LaTeX na coluna da direita!
+    st.markdown("<br>", unsafe_allow_html=True)
 
-                with col_latex:
+    # 2. Se a função é válida, roda os cálculos!
 
-                    st.markdown("<br>", unsafe_allow_html=True)  # Dá um espacinho para alinhar com a caixa de texto
+    if expr_deriv is not None:
 
-                    # Importando o latex do sympy rapidinho caso não esteja no topo do arquivo
+        try:
+            with diagnostico.etapa("Derivada"):
+                calcular_e_exibir_derivada(variavel1, expr_deriv)
 
-                    from sympy import latex
+        except Exception as e:
 
-                    st.latex(rf"f(x) = {latex(expr_deriv)}")
+            st.error("Não foi possível calcular a derivada dessa função.")
 
+    diagnostico.exibir()
 
-            except Exception:
 
-                # Se o usuário estiver digitando e a função ainda estiver "quebrada" (ex: "x + ")
+@st.fragment
+def pagina_integral(variavel1, theme):
+    """Página da integral (indefinida ou definida, com a área no gráfico)."""
+    diagnostico = obter_diagnostico()
 
-                with col_latex:
+    st.title("🧮 Calculadora de Integrais")
 
-                    st.markdown("<br><br>", unsafe_allow_html=True)
+    # Indefinida (primitiva + C) ou definida (número entre dois limites, com a área no gráfico)
+    tipo_integral = st.radio("Tipo de integral:", ["Indefinida", "Definida"], horizontal=True)
 
-                    st.caption("⏳ Aguardando função válida...")
+    if tipo_integral == "Indefinida":
+        st.write("Digite uma função abaixo para ver o resultado e o passo a passo da integração indefinida.")
+    else:
+        st.write("Digite uma função e os limites de integração para ver o valor da integral e a área no gráfico.")
 
-        st.markdown("<br>", unsafe_allow_html=True)
+    # 1. Dividimos a tela: Coluna maior pro texto, menor pro LaTeX
 
-        # 2. Se a função é válida, roda os cálculos!
+    col_input, col_latex = st.columns([2, 1])
 
-        if expr_deriv is not None:
+    with col_input:
 
-            try:
-                calcular_e_exibir_derivada(variavel1, expr_deriv)
+        # Coloquei aquela função clássica que você testou antes como exemplo
 
-            except Exception as e:
+        expr_input_integral = st.text_input("Função f(x):", value="(4 - x**2)/(x + 2)")
 
-                st.error("Não foi possível calcular a derivada dessa função.")
+    if tipo_integral == "Definida":
+        col_a, col_b = st.columns(2)
+        with col_a:
+            texto_a = st.text_input("Limite inferior (a):", value="0")
+        with col_b:
+            texto_b = st.text_input("Limite superior (b):", value="1")
 
+    # Variável para segurar a função depois de lida
 
+    expr_int = None
 
-    elif st.session_state['pagina_atual'] == "Integral":
+    if expr_input_integral:
 
-        st.title("🧮 Calculadora de Integrais")
+        try:
 
-        st.write("Digite uma função abaixo para ver o resultado e o passo a passo da integração indefinida.")
+            # Tenta ler o que o usuário digitou usando a sua função normalizadora
 
-        # 1. Dividimos a tela: Coluna maior pro texto, menor pro LaTeX
+            expr_int = interpretar_expressao(variavel1, expr_input_integral)
 
-        col_input, col_latex = st.columns([2, 1])
+            # Se leu com sucesso, exibe o LaTeX na coluna da direita!
 
-        with col_input:
+            with col_latex:
 
-            # Coloquei aquela função clássica que você testou antes como exemplo
+                st.markdown("<br>", unsafe_allow_html=True)  # Espacinho para alinhar
 
-            expr_input_integral = st.text_input("Função f(x):", value="(4 - x**2)/(x + 2)")
+                from sympy import latex
 
-        # Variável para segurar a função depois de lida
+                st.latex(rf"f(x) = {latex(expr_int)}")
 
-        expr_int = None
 
-        if expr_input_integral:
+        except Exception:
 
-            try:
+            # Se o usuário estiver no meio da digitação e o código quebrar
 
-                # Tenta ler o que o usuário digitou usando a sua função normalizadora
+            with col_latex:
 
-                expr_int = interpretar_expressao(variavel1, expr_input_integral)
+                st.markdown("<br><br>", unsafe_allow_html=True)
 
-                # Se leu com sucesso, exibe o LaTeX na coluna da direita!
+                st.caption("⏳ Aguardando função válida...")
 
-                with col_latex:
+    st.markdown("<br>", unsafe_allow_html=True)
 
-                    st.markdown("<br>", unsafe_allow_html=True)  # Espacinho para alinhar
+    # 2. Se a função é válida, roda os cálculos chamando a sua função!
 
-                    from sympy import latex
+    if expr_int is not None:
 
-                    st.latex(rf"f(x) = {latex(expr_int)}")
+        try:
 
+            with diagnostico.etapa("Integral"):
+                if tipo_integral == "Definida":
+                    try:
+                        a = interpretar_expressao(variavel1, texto_a)
+                        b = interpretar_expressao(variavel1, texto_b)
+                    except Exception:
+                        a = b = None
+
+                    if a is None or b is None or a.free_symbols or b.free_symbols:
+                        st.error("Os limites de integração devem ser números (ex: 0, 1/2, pi, oo).")
+                    else:
+                        calcular_e_exibir_integral_definida(variavel1, expr_int, a, b, theme)
+                else:
+                    calcular_e_exibir_integral(variavel1, expr_int)
 
-            except Exception:
+        except Exception as e:
 
-                # Se o usuário estiver no meio da digitação e o código quebrar
+            st.error("Não foi possível calcular a integral dessa função.")
 
-                with col_latex:
+    diagnostico.exibir()
 
-                    st.markdown("<br><br>", unsafe_allow_html=True)
 
-                    st.caption("⏳ Aguardando função válida...")
+# ==========================================
+# MAIN
+# ==========================================
+def main():
+    # 1. Configurações Iniciais
+    variavel1 = symbols('x')
+    st.set_page_config(page_title="Analisador Completo de Funções", layout="wide")
 
-        st.markdown("<br>", unsafe_allow_html=True)
+    # 2. Define a página inicial caso seja o primeiro acesso
+    if 'pagina_atual' not in st.session_state:
+        st.session_state['pagina_atual'] = "Gráficos"
 
-        # 2. Se a função é válida, roda os cálculos chamando a sua função!
+    # 3. Chama o cabeçalho azul no topo (sempre visível)
+    renderizar_header()
 
-        if expr_int is not None:
+    # 4. Configurações Visuais e Tema (sempre visíveis)
+    tema_escuro = st.toggle("🌙", value=True)
+    theme = obter_configuracao_tema(tema_escuro)
+    aplicar_css(theme)
 
-            try:
+    # ==========================================
+    # 5. CONTROLE DE NAVEGAÇÃO (A MÁGICA)
+    # ==========================================
 
-                calcular_e_exibir_integral(variavel1, expr_int)
+    if st.session_state['pagina_atual'] == "Gráficos":
+        pagina_graficos(variavel1, theme)
 
-            except Exception as e:
+    elif st.session_state['pagina_atual'] == "Derivada":
+        pagina_derivada(variavel1)
 
-                st.error("Não foi possível calcular a integral dessa função.")
+    elif st.session_state['pagina_atual'] == "Integral":
+        pagina_integral(variavel1, theme)
 
     elif st.session_state['pagina_atual'] == "Listas":
         renderizar_pagina_listas()
@@ -0,0 +1,154 @@
+# Sympy: Biblioteca de matemática simbólica. Aqui ela expande a função em série perto do ponto
+# (Laurent/Puiseux truncada) e só recorre ao limit quando a série não existe (ex: sen(1/x)).
+from sympy import AccumBounds, I, PoleError, S, Symbol, limit
+
+from utils.cache_persistente import em_cache
+from utils.dominio import restricao_violada
+from utils.execucao_limitada import executar_com_prazo
+
+
+# ==========================================
+# ANÁLISE LOCAL (SÉRIE PERTO DO PONTO)
+# ==========================================
+# Em vez de calcular o limite bilateral e depois substituir o ponto para ver se deu 0/0,
+# expande f(a + t) e f(a - t) (t > 0) em série truncada UMA vez por ponto. Do termo
+# dominante de cada lado saem os limites laterais, a classificação do ponto (contínua,
+# removível, salto, polo) e o comportamento da função perto dele.
+
+# Ordem de truncamento da série (o termo dominante quase sempre aparece bem antes)
+ORDEM_SERIE = 3
+
+# Distância até o ponto, sempre positiva: x = a + t pela direita e x = a - t pela esquerda
+_t = Symbol("t", positive=True)
+
+# Textos da classificação do ponto
+CLASSIFICACOES = {
+    "continua": "Contínua no ponto",
+    "removivel": "Descontinuidade removível (furo)",
+    "salto": "Descontinuidade de salto",
+    "borda": "Borda do domínio (o limite só existe de um lado)",
+    "polo": "Polo (a função vai ao infinito)",
+    "essencial": "Descontinuidade essencial (os limites laterais não existem)",
+    "fora": "Fora do domínio (a função não é real perto do ponto)",
+}
+
+
+class AnaliseLocal:
+    """
+    Comportamento de f perto de um ponto finito: limites laterais (None quando não existem nos reais),
+    valor f(ponto) (None fora do domínio) e o termo dominante de cada lado, já escrito em x.
+    """
+
+    def __init__(self, ponto, limite_esquerda, limite_direita, valor, termo_esquerda, termo_direita,
+                 fora_do_dominio=False):
+        self.ponto = ponto
+        self.limite_esquerda = limite_esquerda
+        self.limite_direita = limite_direita
+        self.valor = valor
+        self.termo_esquerda = termo_esquerda
+        self.termo_direita = termo_direita
+        self.fora_do_dominio = fora_do_dominio
+
+    @property
+    def limite(self):
+        """Limite bilateral: igual aos laterais quando coincidem; ∞ complexo em polos de sinais opostos."""
+        esquerda, direita = self.limite_esquerda, self.limite_direita
+        if esquerda is None or direita is None:
+            return None
+        if esquerda == direita:
+            return direita
+        if esquerda.is_infinite and direita.is_infinite:
+            return S.ComplexInfinity
+        return None
+
+    @property
+    def classificacao(self):
+        """Chave de CLASSIFICACOES que descreve o ponto."""
+        esquerda, direita = self.limite_esquerda, self.limite_direita
+        if esquerda is None and direita is None:
+            return "fora" if self.fora_do_dominio else "essencial"
+        if esquerda is None or direita is None:
+            return "borda"
+        if esquerda.is_infinite or direita.is_infinite:
+            return "polo"
+        if esquerda != direita:
+            return "salto"
+        if self.valor is not None and self.valor == direita:
+            return "continua"
+        return "removivel"
+
+    @property
+    def descricao(self):
+        """Classificação em texto (com o sinal de cada lado, no caso de polo)."""
+        texto = CLASSIFICACOES[self.classificacao]
+        if self.classificacao == "polo":
+            return f"{texto}: {self.limite_esquerda} pela esquerda, {self.limite_direita} pela direita"
+        if self.classificacao == "removivel":
+            return f"{texto}: o limite é {self.limite}"
+        if self.classificacao == "borda":
+            if self.limite_esquerda is None:
+                return f"{texto}: {self.limite_direita} pela direita"
+            return f"{texto}: {self.limite_esquerda} pela esquerda"
+        return texto
+
+
+def _termo_dominante(expr, variavel1, ponto, lado):
+    """
+    Primeiro termo da série de f(ponto + lado·t) em t → 0⁺, ou None se a série não existe.
+    Série só com o O(t^n): a função some mais rápido que t^n, e o termo dominante é 0.
+    """
+    try:
+        principal = expr.subs(variavel1, ponto + lado * _t).series(_t, 0, ORDEM_SERIE).removeO()
+        termo = principal.as_leading_term(_t) if principal != 0 else S.Zero
+    except (PoleError, NotImplementedError, ValueError, TypeError):
+        return None
+    return None if termo.has(S.NaN, AccumBounds) else termo
+
+
+def _limite_lateral(expr, variavel1, ponto, lado, termo):
+    """Limite lateral a partir do termo dominante; sem série, recorre ao limit do Sympy."""
+    if termo is None:
+        resultado = limit(expr, variavel1, ponto, "+" if lado > 0 else "-")
+    elif termo.has(I):
+        return None  # Desse lado a função não é real (ex: raiz de número negativo)
+    else:
+        resultado = limit(termo, _t, 0, "+")
+
+    # Oscilação (AccumBounds), valor complexo ou indefinido: o limite lateral não existe nos reais
+    if resultado.has(I, AccumBounds) or not resultado.is_extended_real:
+        return None
+    return resultado
+
+
+def _analisar(expr, variavel1, ponto):
+    """Roda no processo trabalhador: expande dos dois lados e monta a AnaliseLocal."""
+    termos, limites = {}, {}
+    for lado in (-1, 1):
+        # Lado fora do domínio real (ex: x < 0 em raiz(x) perto de 0): nem tenta a série
+        if restricao_violada(variavel1, expr, ponto + lado * _t):
+            termos[lado] = limites[lado] = None
+            continue
+        termos[lado] = _termo_dominante(expr, variavel1, ponto, lado)
+        limites[lado] = _limite_lateral(expr, variavel1, ponto, lado, termos[lado])
+
+    # f(ponto) só conta se for um número real finito (senão o ponto está fora do domínio)
+    valor = expr.subs(variavel1, ponto)
+    if not (valor.is_extended_real and valor.is_finite):
+        valor = None
+
+    # Termo dominante escrito em x: t = x - a pela direita e t = a - x pela esquerda
+    em_x = {
+        lado: termo.subs(_t, lado * (variavel1 - ponto)) if termo is not None and not termo.has(I) else None
+        for lado, termo in termos.items()
+    }
+    # Dos dois lados a série é complexa (ex: log(x) em x = -5): o ponto está fora do domínio real
+    fora_do_dominio = all(termo is not None and termo.has(I) for termo in termos.values())
+    return AnaliseLocal(ponto, limites[-1], limites[1], valor, em_x[-1], em_x[1], fora_do_dominio)
+
+
+def analisar_localmente(variavel1, expr, ponto):
+    """AnaliseLocal de expr perto do ponto (finito), com cache e prazo."""
+    return em_cache(
+        "analise_local", expr, (variavel1, ponto),
+        lambda: executar_com_prazo(_analisar, expr, variavel1, ponto)
+    )
@@ -0,0 +1,108 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Sympy: Biblioteca de matemática simbólica. Aqui usamos o "lambdify", que transforma
+# a expressão simbólica em uma função Python que trabalha direto com vetores do Numpy.
+from sympy import lambdify, preorder_traversal
+
+from utils.dominio import mascara_do_dominio
+
+
+# ==========================================
+# AVALIADOR NUMÉRICO COMPILADO (VETORIZADO)
+# ==========================================
+
+# Tamanho (em módulo) a partir do qual as contas exatas com o número ficam caras demais
+LIMITE_VALOR_EXATO = 1e100
+
+
+@lru_cache(maxsize=256)
+def compilar_expressao(variavel1, expr):
+    """
+    Converte a expressão do Sympy em uma função numérica vetorizada (Numpy).
+    A compilação é feita uma única vez por expressão e reaproveitada depois.
+    """
+    return lambdify(variavel1, expr, modules="numpy")
+
+
+def avaliar_em_grade(variavel1, expr, x_vals, ponto_a_ponto=True):
+    """
+    Avalia a expressão em todos os pontos de uma vez só.
+    Pontos fora do domínio (máscara de utils/dominio.py: denominador zero, raiz de negativo,
+    log de não positivo) e resultados complexos voltam como NaN, sem try/except por ponto.
+    Com ponto_a_ponto=False, devolve None quando o Numpy não entende a função
+    (o plano B ponto a ponto seria lento demais para grades enormes).
+    """
+    x_vals = np.asarray(x_vals, dtype=float)
+    dentro = mascara_do_dominio(variavel1, expr, x_vals)
+
+    try:
+        funcao = compilar_expressao(variavel1, expr)
+        # Desliga os avisos do Numpy (ex: "divide by zero"), pois tratamos tudo com máscaras
+        with np.errstate(all="ignore"):
+            y = np.asarray(funcao(x_vals))
+
+        # Se a função for constante (ex: f(x) = 5), o lambdify devolve um único número
+        y = np.broadcast_to(y, x_vals.shape)
+
+        # Resultados complexos (parte imaginária relevante) não existem nos reais
+        if np.iscomplexobj(y):
+            imaginaria = np.abs(y.imag) > 1e-12
+            y = np.where(imaginaria, np.nan, y.real)
+
+        y = np.array(y, dtype=float)
+    except Exception:
+        # Algumas funções não têm equivalente no Numpy: cai no cálculo ponto a ponto
+        if not ponto_a_ponto:
+            return None
+        return _avaliar_ponto_a_ponto(variavel1, expr, x_vals, dentro)
+
+    # Fora do domínio e infinito (não desenhável): NaN
+    y[~dentro | ~np.isfinite(y)] = np.nan
+    return y
+
+
+def _avaliar_ponto_a_ponto(variavel1, expr, x_vals, dentro):
+    """
+    Plano B: substitui ponto a ponto (lento, usado só quando o Numpy não entende a função).
+    Só os pontos dentro do domínio são calculados.
+    """
+    y_vals = np.full(x_vals.shape, np.nan)
+    for i in np.flatnonzero(dentro):
+        try:
+            y_vals[i] = float(expr.subs(variavel1, x_vals[i]))
+        except Exception:
+            pass  # Resultado complexo, indefinido ou que o Sympy não consegue avaliar: fica NaN
+    y_vals[~np.isfinite(y_vals)] = np.nan
+    return y_vals
+
+
+@lru_cache(maxsize=256)
+def _subexpressoes_compiladas(variavel1, expr):
+    """Cada subexpressão que depende da variável, já compilada (uma vez por expressão)."""
+    return tuple(
+        lambdify(variavel1, no, modules="numpy")
+        for no in preorder_traversal(expr)
+        if not no.is_Atom and no.has(variavel1)
+    )
+
+
+def substituicao_exata_viavel(variavel1, expr, ponto):
+    """
+    False se substituir o ponto na expressão exata (Sympy) poderia criar números gigantescos:
+    ex: x^x^x em x = 100 vira 100^(100^100), e gamma(gamma(x)) em x = 20 um inteiro enorme;
+    contas assim travam o processo inteiro. A conferência é em ponto flutuante: nenhuma
+    subexpressão com x pode passar de LIMITE_VALOR_EXATO (ou estourar) no ponto. Se o Numpy
+    não consegue avaliar alguma delas (ex: factorial), também não dá para garantir.
+    """
+    x = float(ponto)
+    for funcao in _subexpressoes_compiladas(variavel1, expr):
+        try:
+            with np.errstate(all="ignore"):
+                valor = abs(complex(funcao(x)))
+        except Exception:
+            return False  # Estourou ou o Numpy não entende a função
+        if valor > LIMITE_VALOR_EXATO:
+            return False
+    return True
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import sympy
+from sympy import srepr
+
+from utils.normalizadores import chave_expressao
+
+
+# ==========================================
+# CACHE PERSISTENTE (SQLITE EM DISCO)
+# ==========================================
+# Guarda o resultado das análises simbólicas (limites, raízes, etc.) em um arquivo
+# SQLite. Assim o mesmo cálculo não é refeito para cada visitante nem depois que
+# o servidor reinicia.
+
+# Aumente este número quando mudar a forma de calcular algum resultado:
+# todas as entradas antigas passam a ser ignoradas e são apagadas.
+VERSAO_CACHE = 4
+
+# Quantidade máxima de resultados guardados (os menos usados são removidos primeiro)
+TAMANHO_MAXIMO = int(os.environ.get("LIMITE_CACHE_TAMANHO", 5000))
+
+# A versão do Sympy também faz parte da versão: atualizar a biblioteca invalida o cache
+_VERSAO_COMPLETA = f"{VERSAO_CACHE}|sympy-{sympy.__version__}"
+
+_trava = threading.Lock()
+_banco_preparado = False
+
+
+def _caminho_banco():
+    """Arquivo do banco: variável de ambiente ou a pasta .cache na raiz do projeto."""
+    caminho = os.environ.get("LIMITE_CACHE_ARQUIVO")
+    if caminho:
+        return caminho
+
+    diretorio_utils = os.path.dirname(os.path.abspath(__file__))
+    diretorio_raiz = os.path.dirname(diretorio_utils)
+    return os.path.join(diretorio_raiz, ".cache", "analises.sqlite3")
+
+
+def cache_ativo():
+    """O cache pode ser desligado com LIMITE_CACHE_DESATIVADO=1 (útil para medir desempenho)."""
+    return os.environ.get("LIMITE_CACHE_DESATIVADO", "") not in ("1", "true", "sim")
+
+
+def _conectar():
+    """Abre o banco e, na primeira vez, cria as tabelas e descarta versões antigas."""
+    global _banco_preparado
+
+    caminho = _caminho_banco()
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    conexao = sqlite3.connect(caminho, timeout=5)
+
+    if not _banco_preparado:
+        with conexao:
+            conexao.execute("CREATE TABLE IF NOT EXISTS meta (nome TEXT PRIMARY KEY, valor TEXT)")
+            conexao.execute(
+                "CREATE TABLE IF NOT EXISTS entradas ("
+                "chave TEXT PRIMARY KEY, valor BLOB, ultimo_acesso REAL)"
+            )
+            linha = conexao.execute("SELECT valor FROM meta WHERE nome = 'versao'").fetchone()
+            if linha is None or linha[0] != _VERSAO_COMPLETA:
+                # Versão diferente: nada do que está salvo é confiável
+                conexao.execute("DELETE FROM entradas")
+                conexao.execute(
+                    "INSERT OR REPLACE INTO meta (nome, valor) VALUES ('versao', ?)",
+                    (_VERSAO_COMPLETA,)
+                )
+        _banco_preparado = True
+
+    return conexao
+
+
+def gerar_chave(operacao, expr, parametros=()):
+    """
+    Monta a chave do cache a partir do identificador estável da expressão,
+    do nome da operação e dos parâmetros (ex: variável e ponto de tendência).
+    """
+    texto = f"{operacao}|{chave_expressao(expr)}|{srepr(tuple(parametros))}"
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def em_cache(operacao, expr, parametros, calcular, guardar=None):
+    """
+    Devolve o resultado salvo para (operação, expressão, parâmetros).
+    Se ainda não existir, chama calcular(), salva e devolve o resultado.
+    guardar(resultado), se dado, decide se o resultado vai para o disco
+    (ex: um resultado cortado pelo prazo serve agora, mas não deve ficar salvo).
+    Qualquer problema com o arquivo do banco apenas desliga o cache (o cálculo sempre acontece).
+    """
+    if not cache_ativo():
+        return calcular()
+
+    chave = gerar_chave(operacao, expr, parametros)
+
+    try:
+        with _trava:
+            conexao = _conectar()
+            try:
+                linha = conexao.execute("SELECT valor FROM entradas WHERE chave = ?", (chave,)).fetchone()
+                if linha is not None:
+                    with conexao:
+                        conexao.execute(
+                            "UPDATE entradas SET ultimo_acesso = ? WHERE chave = ?", (time.time(), chave)
+                        )
+                    return pickle.loads(linha[0])
+            finally:
+                conexao.close()
+    except Exception:
+        return calcular()
+
+    # Calcula fora da trava para não segurar outras consultas enquanto o Sympy trabalha
+    resultado = calcular()
+    if guardar is not None and not guardar(resultado):
+        return resultado
+
+    try:
+        _salvar(chave, resultado)
+    except Exception:
+        pass
+
+    return resultado
+
+
+def _salvar(chave, resultado):
+    """Grava o resultado e remove os menos usados se o banco passou do tamanho máximo."""
+    valor = pickle.dumps(resultado)
+    with _trava:
+        conexao = _conectar()
+        try:
+            with conexao:
+                conexao.execute(
+                    "INSERT OR REPLACE INTO entradas (chave, valor, ultimo_acesso) VALUES (?, ?, ?)",
+                    (chave, valor, time.time())
+                )
+                total = conexao.execute("SELECT COUNT(*) FROM entradas").fetchone()[0]
+                if total > TAMANHO_MAXIMO:
+                    # Política LRU: apaga os que foram acessados há mais tempo
+                    conexao.execute(
+                        "DELETE FROM entradas WHERE chave IN ("
+                        "SELECT chave FROM entradas ORDER BY ultimo_acesso ASC LIMIT ?)",
+                        (total - TAMANHO_MAXIMO,)
+                    )
+        finally:
+            conexao.close()
+
+
+def limpar_cache():
+    """Apaga todos os resultados salvos."""
+    with _trava:
+        conexao = _conectar()
+        try:
+            with conexao:
+                conexao.execute("DELETE FROM entradas")
+        finally:
+            conexao.close()
@@ -1,28 +1,293 @@
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
 import streamlit as st
 import sympy as sp
+from sympy.integrals import manualintegrate as mi
+
+from utils.cache_persistente import em_cache
+from utils.derivadas import Passo, gerar_passos_latex
+from utils.execucao_limitada import TempoEsgotado, MENSAGEM_TEMPO_ESGOTADO, executar_com_prazo
+from utils.gerar_dados_graficos import amostrar_funcao
+from utils.gerar_graficos import configurar_layout_grafico
+from utils.integracao_numerica import integrar_numericamente
+from utils.operacoes_simbolicas import integrar
+from utils.reducao_grafico import compactar, traco_de_linha
+
+# Tempo máximo (em segundos) da integração por regras; depois disso vai para o integrate completo
+PRAZO_REGRAS_INTEGRAL = 3
+
+# Tempo máximo (em segundos) para achar o valor exato da integral definida; depois, conta numérica
+PRAZO_INTEGRAL_DEFINIDA = 3
+
+# Erro estimado (relativo) acima do qual a conta numérica é considerada não confiável
+ERRO_NUMERICO_ACEITAVEL = 1e-6
+
+
+@lru_cache(maxsize=128)
+def calcular_integral(variavel1, expr):
+    """
+    Parte matemática (sem interface) da página de integrais.
+    Retorna (integral sem a constante C, árvore de regras do manualintegrate ou None).
+    Primeiro tenta as regras de tabela (rápidas e com passo a passo); se não servirem,
+    usa o integrate completo do Sympy, que não tem passos.
+    """
+    try:
+        resposta = em_cache(
+            "integral_regras", expr, (variavel1,),
+            lambda: executar_com_prazo(_integrar_por_regras, expr, variavel1, prazo=PRAZO_REGRAS_INTEGRAL)
+        )
+    except TempoEsgotado:
+        resposta = None
+
+    if resposta is not None:
+        return resposta
+
+    return integrar(expr, variavel1), None
+
+
+def _integrar_por_regras(expr, variavel1):
+    """Roda no processo trabalhador: árvore de regras e resultado, ou None se alguma parte não tem regra."""
+    regra = mi.integral_steps(expr, variavel1)
+    if any(isinstance(r, mi.DontKnowRule) for r in _percorrer_regras(regra)):
+        return None
+    return regra.eval(), regra
+
+
+def _percorrer_regras(regra):
+    """Todas as regras da árvore (a própria e as de dentro)."""
+    yield regra
+    for campo in vars(regra).values():
+        filhas = campo if isinstance(campo, list) else [campo]
+        for filha in filhas:
+            if isinstance(filha, mi.Rule):
+                yield from _percorrer_regras(filha)
 
 
 def calcular_e_exibir_integral(variavel, expr):
     # Removi o título extra e o separador para não brigar com o título da main.py
 
     try:
-        # 1. Calcula o resultado real direto
-        resultado = sp.integrate(expr, variavel)
+        # 1. Calcula o resultado (regras de tabela primeiro, integrate completo se precisar)
+        resultado, regra = calcular_integral(variavel, expr)
         resultado_latex = sp.latex(resultado)
 
         # 2. Exibe o resultado principal
         st.write("O resultado da integral indefinida é:")
         st.latex(rf"{resultado_latex} + C")
 
-        # 3. Passo a Passo (O Expander)
-        with st.expander("Ver detalhes do cálculo"):
-            st.write("Aplicando as regras de integração para funções elementares:")
-
-            # Aqui sim mostramos a integral completa bonitona!
+        # 3. Passo a Passo (só monta o LaTeX dos passos se a pessoa pedir)
+        if regra is None:
+            st.info("Esta integral foi resolvida pelos algoritmos gerais do Sympy, sem passo a passo.")
+        elif st.toggle("Ver detalhes do cálculo", key="detalhes_integral"):
+            st.write("Aplicando as regras de integração:")
+            for passo in gerar_passos_latex(gerar_passos_integral(regra)):
+                st.latex(passo)
             st.latex(rf"\int {sp.latex(expr)} \, dx = {resultado_latex} + C")
 
-            st.info(
-                "Nota: Para funções polinomiais, trigonométricas e raízes, utilizamos as tabelas fundamentais de integração.")
+    except TempoEsgotado:
+        st.warning(MENSAGEM_TEMPO_ESGOTADO)
+    except Exception as e:
+        st.error(f"Não foi possível calcular a integral: {e}")
+
+
+# ==========================================
+# INTEGRAL DEFINIDA
+# ==========================================
+
+def calcular_integral_definida(variavel1, expr, a, b):
+    """
+    Integral de expr entre a e b.
+    Retorna (valor, exato, erro_estimado): primeiro tenta o valor exato (com prazo curto);
+    se não sair, usa a quadratura numérica vetorizada (exige limites finitos).
+    """
+    try:
+        valor = em_cache(
+            "integral_definida", expr, (variavel1, a, b),
+            lambda: executar_com_prazo(sp.integrate, expr, (variavel1, a, b), prazo=PRAZO_INTEGRAL_DEFINIDA)
+        )
+    except TempoEsgotado:
+        valor = None
+
+    # Aceita número real ou ±∞ (integral divergente); Integral não resolvida ou NaN vão para a conta numérica
+    if valor is not None and not valor.has(sp.Integral) and valor.is_extended_real:
+        return valor, True, 0.0
+
+    if not (a.is_finite and b.is_finite):
+        raise ValueError("Sem valor exato, e a conta numérica precisa de limites finitos.")
+
+    valor, erro = integrar_numericamente(variavel1, expr, float(a), float(b))
+    return sp.Float(valor), False, erro
+
+
+def criar_grafico_area(variavel1, expr, a, b, theme):
+    """Gráfico da função com a área entre a e b pintada (reaproveita a amostragem adaptativa)."""
+    a, b = float(min(a, b)), float(max(a, b))
+    margem = max(b - a, 1.0) * 0.25
+    x_vals, y_vals, y_lim = amostrar_funcao(variavel1, expr, a - margem, b + margem)
+    x_area, y_area, _ = amostrar_funcao(variavel1, expr, a, b)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=x_area, y=compactar(np.nan_to_num(y_area)), mode='lines', name='Área', fill='tozeroy',
+        line=dict(width=0), fillcolor='rgba(51, 136, 255, 0.35)'
+    ))
+    fig.add_trace(traco_de_linha(
+        x_vals, y_vals, a - margem, b + margem, mode='lines', name='f(x)',
+        line=dict(width=3, color='#3388ff')
+    ))
+
+    configurar_layout_grafico(fig, theme, a - margem, b + margem, y_lim)
+    fig.update_layout(title="Área sob a curva")
+    return fig
+
+
+def calcular_e_exibir_integral_definida(variavel, expr, a, b, theme):
+    try:
+        valor, exato, erro = calcular_integral_definida(variavel, expr, a, b)
+        integral_latex = rf"\int_{{{sp.latex(a)}}}^{{{sp.latex(b)}}} {sp.latex(expr)} \, dx"
+
+        if exato:
+            st.write("O valor exato da integral definida é:")
+            st.latex(rf"{integral_latex} = {sp.latex(valor)}")
+            if not valor.is_Number and valor.is_finite is not False:
+                st.caption(f"≈ {float(valor.evalf()):.10g}")
+        else:
+            st.write("Valor aproximado (quadratura numérica de Gauss-Kronrod):")
+            st.latex(rf"{integral_latex} \approx {float(valor):.12g}")
+            st.caption(f"Erro estimado: {erro:.2e}")
+            if erro > ERRO_NUMERICO_ACEITAVEL * max(1.0, abs(float(valor))):
+                st.warning("A conta numérica não convergiu: a integral pode divergir "
+                           "(ex: assíntota vertical dentro do intervalo).")
 
+        if a.is_finite and b.is_finite:
+            st.plotly_chart(criar_grafico_area(variavel, expr, a, b, theme), use_container_width=True)
+
+    except TempoEsgotado:
+        st.warning(MENSAGEM_TEMPO_ESGOTADO)
     except Exception as e:
-        st.error(f"Não foi possível calcular a integral: {e}")
\ No newline at end of file
+        st.error(f"Não foi possível calcular a integral definida: {e}")
+
+
+# ==========================================
+# PASSO A PASSO DA INTEGRAL
+# ==========================================
+# O manualintegrate devolve uma árvore de regras (soma, constante, substituição, partes...).
+# Cada tipo de regra tem sua explicação registrada em PASSOS_INTEGRAL, no mesmo formato
+# dos passos da derivada (objetos Passo, com o LaTeX montado só quando exibido).
+
+PASSOS_INTEGRAL = {}
+
+# Regras de tabela (uma linha só): tipo -> nome exibido
+NOMES_REGRAS_TABELA = {
+    mi.ConstantRule: "Constante",
+    mi.PowerRule: "Regra da Potência",
+    mi.NestedPowRule: "Regra da Potência",
+    mi.ExpRule: "Exponencial",
+    mi.ReciprocalRule: "Logaritmo",
+    mi.TrigRule: "Trigonométrica",
+    mi.HyperbolicRule: "Hiperbólica",
+    mi.ArctanRule: "Arco-tangente",
+    mi.ArcsinRule: "Arco-seno",
+}
+
+
+def passo_integral(*tipos):
+    """Registra a função decorada como a explicação das regras de integração informadas."""
+    def registrar(funcao):
+        for tipo in tipos:
+            PASSOS_INTEGRAL[tipo] = funcao
+        return funcao
+    return registrar
+
+
+def gerar_passos_integral(regra):
+    """Lista de Passo explicando a árvore de regras do manualintegrate."""
+    for tipo in type(regra).__mro__:
+        explicar = PASSOS_INTEGRAL.get(tipo)
+        if explicar is not None:
+            return explicar(regra)
+    return _passo_tabela(regra)
+
+
+def _integral_latex(regra, integrando=None):
+    """LaTeX de ∫ integrando d(variável); somas vão entre parênteses."""
+    integrando = regra.integrand if integrando is None else integrando
+    texto = sp.latex(integrando)
+    if isinstance(integrando, sp.Add):
+        texto = rf"\left({texto}\right)"
+    return rf"\int {texto} \, d{sp.latex(regra.variable)}"
+
+
+@passo_integral(mi.AtomicRule)
+def _passo_tabela(regra):
+    nome = next((NOMES_REGRAS_TABELA[t] for t in type(regra).__mro__ if t in NOMES_REGRAS_TABELA), "Tabela")
+    return [Passo(lambda: rf"\text{{{nome}: }} {_integral_latex(regra)} = {sp.latex(regra.eval())}")]
+
+
+@passo_integral(mi.AddRule)
+def _passo_soma(regra):
+    passos = [Passo(lambda: r"\text{Regra da Soma: Integra-se cada termo separadamente.}")]
+    for sub in regra.substeps:
+        passos.extend(gerar_passos_integral(sub))
+    passos.append(Passo(lambda: rf"\text{{Juntando os termos: }} {sp.latex(regra.eval())}"))
+    return passos
+
+
+@passo_integral(mi.ConstantTimesRule)
+def _passo_constante(regra):
+    passos = [Passo(lambda:
+        rf"\textbf{{Constante para fora:}} {_integral_latex(regra)} = "
+        rf"{sp.latex(regra.constant)} {_integral_latex(regra, regra.other)}")]
+    passos.extend(gerar_passos_integral(regra.substep))
+    return passos
+
+
+@passo_integral(mi.URule)
+def _passo_substituicao(regra):
+    passos = [
+        Passo(lambda: r"\textbf{Substituição:} \int f(g(x))\,g'(x)\,dx = \int f(u)\,du"),
+        Passo(lambda: rf"u = {sp.latex(regra.u_func)}"),
+    ]
+    passos.extend(gerar_passos_integral(regra.substep))
+    passos.append(Passo(lambda: rf"\text{{Voltando para }} {sp.latex(regra.variable)}: {sp.latex(regra.eval())}"))
+    return passos
+
+
+@passo_integral(mi.PartsRule)
+def _passo_partes(regra):
+    passos = [
+        Passo(lambda: r"\textbf{Integração por Partes:} \int u \, dv = uv - \int v \, du"),
+        Passo(lambda: rf"u = {sp.latex(regra.u)}, \quad dv = {sp.latex(regra.dv)} \, dx"),
+    ]
+    passos.extend(gerar_passos_integral(regra.v_step))
+    if regra.second_step is not None:
+        passos.extend(gerar_passos_integral(regra.second_step))
+    if regra.integrand is not None:
+        passos.append(Passo(lambda: rf"\text{{Aplicação: }} {_integral_latex(regra)} = {sp.latex(regra.eval())}"))
+    return passos
+
+
+@passo_integral(mi.CyclicPartsRule)
+def _passo_partes_ciclica(regra):
+    passos = [Passo(lambda: r"\textbf{Partes (cíclica):} a integral original reaparece e é isolada")]
+    for parte in regra.parts_rules:
+        passos.extend(_passo_partes(parte))
+    passos.append(Passo(lambda: rf"\text{{Isolando: }} {_integral_latex(regra)} = {sp.latex(regra.eval())}"))
+    return passos
+
+
+@passo_integral(mi.RewriteRule)
+def _passo_reescrita(regra):
+    passos = [Passo(lambda:
+        rf"\text{{Reescrevendo: }} {_integral_latex(regra)} = "
+        rf"{_integral_latex(regra, regra.rewritten)}")]
+    passos.extend(gerar_passos_integral(regra.substep))
+    return passos
+
+
+@passo_integral(mi.AlternativeRule)
+def _passo_alternativas(regra):
+    # Há mais de um caminho possível: mostra o primeiro
+    return gerar_passos_integral(regra.alternatives[0])
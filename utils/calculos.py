@@ -5,86 +5,189 @@ import streamlit as st
 # da mesma forma que um humano faria no papel (algebricamente), e não apenas aproximando números.
 from sympy import (
     symbols, sympify, limit, S, solve, denom, numer,
-    Poly, degree, solveset, Interval, latex
+    Poly, degree, solveset, Interval, latex, Float
 )
 
 from utils.normalizadores import formatar_solucao_inequacao
+from utils.contexto_analise import obter_analise
+from utils.execucao_limitada import TempoEsgotado, MENSAGEM_TEMPO_ESGOTADO, obter_resultado
+from utils.gerar_dados_graficos import calcular_dados_grafico
+from utils.operacoes_simbolicas import substituir_no_ponto
+from utils.raizes_numericas import raizes_na_grade
+
+# Quantas raízes reais no máximo são listadas no painel (ex: sen(1/x) tem dezenas na janela)
+MAXIMO_RAIZES_EXIBIDAS = 20
 
 
 # ==========================================
 # 6. CÁLCULO DE LIMITES E RAÍZES
 # ==========================================
 
-def calcular_e_exibir_limite(variavel1, expr, tendencia):
-    """Exibe o resultado numérico/simbólico do limite."""
+def calcular_limite_no_ponto(variavel1, expr, tendencia):
+    """
+    Parte matemática (sem interface) da análise do limite.
+    Retorna (resultado do limite, valor da substituição direta).
+    """
+    resultado = obter_analise(variavel1, expr).limite_em(tendencia)
+
+    # Tenta substituir direto para ver se dá erro (indeterminação 0/0)
+    substituicao = substituir_no_ponto(expr, variavel1, tendencia)
+    return resultado, substituicao
+
+
+def calcular_analise_local(variavel1, expr, tendencia):
+    """
+    Parte matemática (sem interface): limites laterais, classificação do ponto e termo dominante
+    (AnaliseLocal). Só existe para pontos finitos (None quando x → ±∞).
+    """
+    if tendencia in [S.Infinity, -S.Infinity]:
+        return None
+    return obter_analise(variavel1, expr).analise_local(tendencia)
+
+
+def _exibir_analise_local(variavel1, local):
+    """Limites laterais, classificação do ponto e comportamento da função perto dele."""
+    lateral = lambda valor: "não existe" if valor is None else str(valor)
+    st.write(f"Pela esquerda (x → {local.ponto}⁻): {lateral(local.limite_esquerda)}  ·  "
+             f"Pela direita (x → {local.ponto}⁺): {lateral(local.limite_direita)}")
+    st.write(f"**Classificação:** {local.descricao}")
+
+    # Comportamento dominante (só quando não é simplesmente uma constante)
+    for termo, seta in ((local.termo_esquerda, "^-"), (local.termo_direita, "^+")):
+        if termo is not None and termo.has(variavel1):
+            st.latex(rf"f(x) \approx {latex(termo)} \quad (x \to {latex(local.ponto)}{seta})")
+
+
+def calcular_e_exibir_limite(variavel1, expr, tendencia, calculo=None, calculo_local=None):
+    """
+    Exibe o resultado numérico/simbólico do limite e, em pontos finitos, a análise local
+    (limites laterais e classificação do ponto).
+    'calculo' e 'calculo_local' são os resultados agendados em paralelo (se não vierem, calcula aqui mesmo).
+    """
     st.subheader("Análise do Limite")
-    try:
-        # Define o texto visual para o ponto (Infinito usa símbolo ∞)
-        if tendencia == S.Infinity:
-            resultado = limit(expr, variavel1, S.Infinity)
-            ponto = "∞"
-        elif tendencia == -S.Infinity:
-            resultado = limit(expr, variavel1, -S.Infinity)
-            ponto = "-∞"
-        else:
-            resultado = limit(expr, variavel1, tendencia)
-            ponto = str(tendencia)
 
-        st.write(f"Limite quando x → {ponto}")
+    # Define o texto visual para o ponto (Infinito usa símbolo ∞)
+    if tendencia == S.Infinity:
+        ponto = "∞"
+    elif tendencia == -S.Infinity:
+        ponto = "-∞"
+    else:
+        ponto = str(tendencia)
 
-        # Tenta substituir direto para ver se dá erro (indeterminação 0/0)
-        substituicao = expr.subs(variavel1, tendencia)
+    st.write(f"Limite quando x → {ponto}")
+
+    # Análise local (série no ponto): é complementar, então uma falha aqui só a esconde
+    try:
+        local = obter_resultado(calculo_local, calcular_analise_local, variavel1, expr, tendencia)
+    except:
+        local = None
 
-        if substituicao in [S.NaN, S.ComplexInfinity]:
-            st.error("Indeterminação detectada!")
+    try:
+        if local is not None and local.limite is None:
+            st.error("O limite não existe: os limites laterais são diferentes (ou não existem).")
         else:
-            st.success(f"Resultado do limite: {resultado}")
+            resultado, substituicao = obter_resultado(calculo, calcular_limite_no_ponto, variavel1, expr, tendencia)
+            if substituicao in [S.NaN, S.ComplexInfinity]:
+                st.error("Indeterminação detectada!")
+            else:
+                st.success(f"Resultado do limite: {resultado}")
+    except TempoEsgotado:
+        st.warning(MENSAGEM_TEMPO_ESGOTADO)
     except:
         st.error("Não foi possível calcular o limite dessa expressão.")
 
+    if local is not None:
+        _exibir_analise_local(variavel1, local)
+
+
+def resolver_inequacoes(variavel1, expr, operador):
+    """
+    Parte matemática (sem interface): conjunto solução de f(x) <operador> 0
+    ('>', '<', '>=' ou '<='), e se ele vale para toda a reta (False: só na janela do gráfico).
+    """
+    quadro = obter_analise(variavel1, expr).quadro_de_sinais
+    return quadro.resolver(operador), quadro.completo
+
 
+def _exibir_inequacao(variavel1, expr, operador):
+    try:
+        sol, completo = resolver_inequacoes(variavel1, expr, operador)
+        st.write(formatar_solucao_inequacao(sol))
+        if not completo:
+            st.caption("Resultado numérico, válido no intervalo exibido no gráfico.")
+    except TempoEsgotado:
+        st.warning(MENSAGEM_TEMPO_ESGOTADO)
+    except:
+        st.error("Não foi possível resolver essa inequação.")
+
+
+@st.fragment
 def analisar_inequacoes(variavel1, expr):
-    """Botões para resolver f(x) > 0 e f(x) < 0."""
+    """
+    Botões para resolver f(x) > 0 e f(x) < 0 (ou ≥ e ≤), todos pelo mesmo quadro de sinais.
+    É um fragmento: clicar num botão roda só este trecho, não a página inteira.
+    """
     st.subheader("Análise de Inequações")
+    incluir_igualdade = st.checkbox("Incluir f(x) = 0 (≥ e ≤)")
+    maior, menor = (">=", "<=") if incluir_igualdade else (">", "<")
     col1, col2 = st.columns(2)
 
     with col1:
-        if st.button("Resolver f(x) > 0"):
-            try:
-                # solveset resolve desigualdades
-                sol = solveset(expr > 0, variavel1, domain=S.Reals)
-                st.write(formatar_solucao_inequacao(sol))
-            except:
-                st.error("Não foi possível resolver essa inequação.")
+        if st.button(f"Resolver f(x) {'≥' if incluir_igualdade else '>'} 0"):
+            _exibir_inequacao(variavel1, expr, maior)
 
     with col2:
-        if st.button("Resolver f(x) < 0"):
-            try:
-                sol = solveset(expr < 0, variavel1, domain=S.Reals)
-                st.write(formatar_solucao_inequacao(sol))
-            except:
-                st.error("Não foi possível resolver essa inequação.")
+        if st.button(f"Resolver f(x) {'≤' if incluir_igualdade else '<'} 0"):
+            _exibir_inequacao(variavel1, expr, menor)
+
+
+def separar_raizes(variavel1, expr, x_vals=None, y_vals=None):
+    """
+    Parte matemática (sem interface): raízes de f(x) = 0 separadas em (reais, complexas).
+    Funções racionais: raízes exatas (todas). Demais funções: raízes reais numéricas (Float),
+    procuradas na grade do gráfico (x_vals, y_vals); sem grade, usa a janela padrão do gráfico.
+    """
+    zeros = obter_analise(variavel1, expr).raizes  # Resolve a equação f(x) = 0 (só racionais)
+
+    if zeros is None:
+        if x_vals is None:
+            x_vals, y_vals, *_ = calcular_dados_grafico(variavel1, expr, 0)
+        return [Float(r) for r in raizes_na_grade(variavel1, expr, x_vals, y_vals)], []
+
+    reais = []
+    complexas = []
+
+    # Separa raízes reais de complexas
+    for z in zeros:
+        if z.is_real:
+            reais.append(z)
+        else:
+            complexas.append(z)
+
+    return reais, complexas
 
 
-def calcular_raizes(variavel1,expr):
-    """Encontra onde a função cruza o eixo X (f(x) = 0)."""
+def calcular_raizes(variavel1,expr, calculo=None):
+    """
+    Encontra onde a função cruza o eixo X (f(x) = 0).
+    Devolve as raízes reais (para marcar no gráfico), ou uma lista vazia se não der.
+    """
     st.write("### Raízes da Função")
     try:
-        zeros = solve(expr, variavel1)  # Resolve a equação f(x) = 0
-        reais = []
-        complexas = []
-
-        # Separa raízes reais de complexas
-        for z in zeros:
-            if z.is_real:
-                reais.append(z)
-            else:
-                complexas.append(z)
+        reais, complexas = obter_resultado(calculo, separar_raizes, variavel1, expr)
 
         if reais:
             st.success("A função possui raízes reais:")
-            for r in reais:
-                st.latex(f"x = {latex(r)}")
+            for r in reais[:MAXIMO_RAIZES_EXIBIDAS]:
+                # Raízes numéricas (Float) aparecem aproximadas
+                if r.is_Float:
+                    st.latex(rf"x \approx {r:.10g}")
+                else:
+                    st.latex(f"x = {latex(r)}")
+            if len(reais) > MAXIMO_RAIZES_EXIBIDAS:
+                st.caption(f"... e mais {len(reais) - MAXIMO_RAIZES_EXIBIDAS} raízes (todas marcadas no gráfico).")
+            if any(r.is_Float for r in reais) and not obter_analise(variavel1, expr).e_racional:
+                st.caption("Raízes encontradas numericamente no intervalo exibido no gráfico.")
 
         if complexas:
             if not reais:
@@ -96,8 +199,10 @@ def calcular_raizes(variavel1,expr):
 
         if not reais and not complexas:
             st.warning("Não foram encontradas raízes para essa função.")
+
+        return reais
+    except TempoEsgotado:
+        st.warning(MENSAGEM_TEMPO_ESGOTADO)
     except:
         st.error("Não foi possível determinar as raízes da função.")
-
-
-
+    return []
@@ -0,0 +1,289 @@
+import threading
+from functools import lru_cache
+
+# Sympy: Biblioteca de matemática simbólica. Ela resolve equações, limites e derivadas
+# da mesma forma que um humano faria no papel (algebricamente), e não apenas aproximando números.
+from sympy import S
+from sympy.calculus.util import continuous_domain
+
+from utils.analise_local import AnaliseLocal, analisar_localmente
+from utils.cache_persistente import em_cache
+from utils.continuidade import fora_do_dominio_real, valor_se_continua
+from utils.execucao_limitada import TempoEsgotado, agendar, executar_com_prazo
+from utils.funcoes_racionais import decompor_funcao_racional
+from utils.operacoes_simbolicas import calcular_limite, raizes_de_funcao_racional, zeros_do_denominador
+from utils.quadro_de_sinais import montar_quadro_numerico, montar_quadro_racional
+
+
+# ==========================================
+# CONTEXTO DE ANÁLISE (UM POR EXPRESSÃO)
+# ==========================================
+# Vários painéis precisam dos mesmos limites (ex: o limite em +∞ aparece nas
+# assíntotas horizontais, nas oblíquas e no painel de limite). Este objeto calcula
+# cada resultado só quando alguém pede pela primeira vez e depois só devolve o valor
+# guardado, para todos os painéis (mesmo que peçam ao mesmo tempo, em threads diferentes).
+# Funções racionais (P/Q) não passam pelo limit/solve: usam o caminho rápido de polinômios
+# (utils/funcoes_racionais.py); as demais seguem o caminho geral.
+
+# Tabela de limites em andamento de cada sessão (visitante): a tabela de uma expressão só
+# continua enquanto ela é a última agendada por alguma sessão (a de uma expressão antiga
+# para no próximo ponto e não ocupa os trabalhadores)
+_tabelas_em_andamento = {}
+_trava_tabelas = threading.Lock()
+
+# Pontos da tabela que podem estourar o prazo antes de ela desistir: numa função em que
+# o limite demora demais (ex: x^x^x), cada ponto seguraria um trabalhador pelo prazo inteiro
+MAXIMO_PRAZOS_ESGOTADOS_TABELA = 2
+
+
+class AnaliseExpressao:
+    """Resultados da análise de uma expressão, calculados sob demanda e uma única vez."""
+
+    def __init__(self, variavel1, expr):
+        self.variavel1 = variavel1
+        self.expr = expr
+        self._resultados = {}
+        self._travas = {}
+        self._trava_geral = threading.Lock()
+        self._tabela_agendada = False
+
+    def _memorizar(self, chave, calcular):
+        """Calcula o resultado da chave uma vez; quem pedir ao mesmo tempo espera o primeiro cálculo."""
+        if chave in self._resultados:
+            return self._resultados[chave]
+
+        with self._trava_geral:
+            trava = self._travas.setdefault(chave, threading.Lock())
+
+        with trava:
+            if chave not in self._resultados:
+                # Se o cálculo der erro (ou estourar o prazo) nada é guardado: tenta de novo na próxima vez
+                self._resultados[chave] = calcular()
+            return self._resultados[chave]
+
+    # ------------------------------------------
+    # Limites
+    # ------------------------------------------
+    @property
+    def racional(self):
+        """Decomposição P/Q da função (FuncaoRacional), ou None se ela não for racional."""
+        if not self.e_racional:
+            return None
+        return self._memorizar("racional", lambda: decompor_funcao_racional(self.variavel1, self.expr))
+
+    @property
+    def limite_mais_infinito(self):
+        """lim f(x) quando x → +∞"""
+        def calcular():
+            if self.racional is not None:
+                return self.racional.limite_no_infinito(1)
+            return calcular_limite(self.expr, self.variavel1, S.Infinity)
+
+        return self._memorizar(("limite", S.Infinity), calcular)
+
+    @property
+    def limite_menos_infinito(self):
+        """lim f(x) quando x → -∞"""
+        def calcular():
+            if self.racional is not None:
+                return self.racional.limite_no_infinito(-1)
+            return calcular_limite(self.expr, self.variavel1, -S.Infinity)
+
+        return self._memorizar(("limite", -S.Infinity), calcular)
+
+    def limite_em(self, ponto):
+        """lim f(x) quando x → ponto (aceita ±∞ e reaproveita os limites no infinito)."""
+        if ponto == S.Infinity:
+            return self.limite_mais_infinito
+        if ponto == -S.Infinity:
+            return self.limite_menos_infinito
+
+        def calcular():
+            # Ponto onde f é claramente contínua: o limite é f(ponto), sem cálculo simbólico
+            valor = self.valor_se_continua(ponto)
+            if valor is not None:
+                return valor
+
+            if self.racional is not None:
+                resultado = self.racional.limite_em(ponto)
+                if resultado is not None:
+                    return resultado
+            else:
+                # Reaproveita a análise local (série no ponto), que já tem os dois limites laterais
+                local = self.analise_local(ponto)
+                if local.limite is not None:
+                    return local.limite
+                if local.classificacao == "salto":
+                    raise ValueError(
+                        f"O limite não existe: pela esquerda é {local.limite_esquerda} "
+                        f"e pela direita é {local.limite_direita}."
+                    )
+                if local.classificacao == "fora":
+                    raise ValueError("O limite não existe: a função não é real perto do ponto.")
+            return calcular_limite(self.expr, self.variavel1, ponto)
+
+        return self._memorizar(("limite", ponto), calcular)
+
+    def analise_local(self, ponto):
+        """Limites laterais, classificação e termo dominante perto de um ponto finito (AnaliseLocal)."""
+        def calcular():
+            # Ponto de continuidade: os dois laterais são f(ponto), não precisa da série
+            valor = self.valor_se_continua(ponto)
+            if valor is not None:
+                return AnaliseLocal(ponto, valor, valor, valor, None, None)
+
+            # Fora do domínio real (ex: log(x) em x = -5): não existe limite real, nem precisa da série
+            if fora_do_dominio_real(self.variavel1, self.expr, ponto):
+                return AnaliseLocal(ponto, None, None, None, None, None, fora_do_dominio=True)
+            return analisar_localmente(self.variavel1, self.expr, ponto)
+
+        return self._memorizar(("analise_local", ponto), calcular)
+
+    def valor_se_continua(self, ponto):
+        """f(ponto) se f é contínua no ponto (caminho rápido dos limites), senão None."""
+        return self._memorizar(("continua", ponto), lambda: valor_se_continua(self.variavel1, self.expr, ponto))
+
+    # ------------------------------------------
+    # Tabela de limites do controle deslizante
+    # ------------------------------------------
+    def preencher_tabela_de_limites(self, pontos):
+        """
+        Calcula o limite e a análise local em cada ponto, na ordem da lista, e guarda tudo
+        (depois, mover o controle deslizante é só uma consulta). Um ponto que dá erro ou
+        estoura o prazo fica de fora e é calculado na hora, se alguém pedir.
+        Para assim que nenhuma sessão está mais nesta expressão (e pode ser agendada de novo
+        depois), ou depois de MAXIMO_PRAZOS_ESGOTADOS_TABELA pontos que estouraram o prazo.
+        """
+        prazos_esgotados = 0
+        for ponto in pontos:
+            with _trava_tabelas:
+                em_uso = any(tabela is self for tabela in _tabelas_em_andamento.values())
+            if not em_uso:
+                with self._trava_geral:
+                    self._tabela_agendada = False
+                return
+            for calcular in (self.limite_em, self.analise_local):
+                try:
+                    calcular(ponto)
+                except TempoEsgotado:
+                    prazos_esgotados += 1
+                except Exception:
+                    pass
+            if prazos_esgotados >= MAXIMO_PRAZOS_ESGOTADOS_TABELA:
+                break
+
+        # Terminou (ou desistiu): as sessões que esperavam por ela não precisam mais
+        with _trava_tabelas:
+            for sessao in [s for s, tabela in _tabelas_em_andamento.items() if tabela is self]:
+                del _tabelas_em_andamento[sessao]
+
+    def agendar_tabela_de_limites(self, pontos, sessao):
+        """
+        Começa a preencher a tabela de limites em segundo plano (só uma vez por expressão).
+        'sessao' identifica o visitante: a tabela anterior da mesma sessão para no próximo ponto.
+        """
+        with _trava_tabelas:
+            _tabelas_em_andamento[sessao] = self
+        with self._trava_geral:
+            if self._tabela_agendada:
+                return
+            self._tabela_agendada = True
+        agendar(self.preencher_tabela_de_limites, list(pontos))
+
+    @property
+    def assintota_obliqua(self):
+        """
+        Coeficientes (a, b) de y = ax + b, com a = lim f(x)/x e b = lim (f(x) - ax).
+        Se o limite em +∞ já é finito, a = 0 sem precisar de outro limite.
+        Em funções racionais, saem da divisão de polinômios.
+        """
+        def calcular():
+            if self.racional is not None:
+                return self.racional.assintota_obliqua()
+            lim_inf = self.limite_mais_infinito
+            if lim_inf.is_finite:
+                return S.Zero, lim_inf
+            a = calcular_limite(self.expr / self.variavel1, self.variavel1, S.Infinity)
+            b = calcular_limite(self.expr - a * self.variavel1, self.variavel1, S.Infinity)
+            return a, b
+
+        return self._memorizar("assintota_obliqua", calcular)
+
+    # ------------------------------------------
+    # Zeros e domínio
+    # ------------------------------------------
+    @property
+    def e_racional(self):
+        """True se a função é um quociente de polinômios em x (só x como variável)."""
+        return self.expr.free_symbols <= {self.variavel1} and self.expr.is_rational_function(self.variavel1)
+
+    @property
+    def zeros_denominador(self):
+        """Pontos onde o denominador se anula (polos e furos)."""
+        def calcular():
+            if self.racional is not None:
+                return sorted(self.racional.polos + self.racional.furos, key=float)
+            return zeros_do_denominador(self.expr, self.variavel1)
+
+        return self._memorizar("zeros_denominador", calcular)
+
+    @property
+    def polos(self):
+        """
+        Zeros do denominador onde a função vai ao infinito (assíntotas verticais).
+        Fora das funções racionais, são todos os zeros do denominador.
+        """
+        if self.racional is not None:
+            return self.racional.polos
+        return self.zeros_denominador
+
+    @property
+    def furos(self):
+        """Descontinuidades removíveis: zeros do denominador que se cancelam com o numerador."""
+        if self.racional is not None:
+            return self.racional.furos
+        return []
+
+    @property
+    def raizes(self):
+        """
+        Soluções exatas de f(x) = 0, só para funções racionais (None nas demais:
+        para essas as raízes são procuradas numericamente, na grade do gráfico).
+        """
+        if not self.e_racional:
+            return None
+        return self._memorizar("raizes", lambda: raizes_de_funcao_racional(self.expr, self.variavel1))
+
+    @property
+    def dominio(self):
+        """Maior subconjunto dos reais onde a função está definida (e é contínua)."""
+        return self._memorizar(
+            "dominio",
+            lambda: em_cache(
+                "dominio", self.expr, (self.variavel1,),
+                lambda: executar_com_prazo(continuous_domain, self.expr, self.variavel1, S.Reals)
+            )
+        )
+
+    # ------------------------------------------
+    # Inequações
+    # ------------------------------------------
+    @property
+    def quadro_de_sinais(self):
+        """
+        Quadro de sinais de f (um por expressão), que responde f > 0, f < 0, f ≥ 0 e f ≤ 0.
+        Exato para funções racionais (reaproveita raízes e zeros do denominador já calculados);
+        numérico, a partir da grade do gráfico, para as demais.
+        """
+        def montar():
+            if self.e_racional:
+                return montar_quadro_racional(self.variavel1, self.expr, self.raizes, self.zeros_denominador)
+            return montar_quadro_numerico(self.variavel1, self.expr)
+
+        return self._memorizar("quadro_de_sinais", montar)
+
+
+@lru_cache(maxsize=128)
+def obter_analise(variavel1, expr):
+    """Devolve o contexto de análise da expressão (o mesmo objeto para todos os painéis)."""
+    return AnaliseExpressao(variavel1, expr)
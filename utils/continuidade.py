@@ -0,0 +1,70 @@
+# Sympy: Biblioteca de matemática simbólica. Aqui ela só substitui o ponto e confere sinais
+# (nada de limit): é o caminho rápido para os pontos onde a função é claramente contínua.
+from sympy import (
+    Abs, Add, Max, Min, Mul, Pow, acos, acosh, asin, atan, atanh, cos, cosh, cot, coth, csc, exp, log,
+    preorder_traversal, sec, sin, sinh, tan, tanh
+)
+
+from utils.avaliador_numerico import substituicao_exata_viavel
+from utils.dominio import ponto_no_interior, restricao_violada, restricoes_anuladas
+
+
+# ==========================================
+# CAMINHO RÁPIDO DA CONTINUIDADE
+# ==========================================
+# Se f é feita só de funções contínuas no próprio domínio, o ponto está no INTERIOR do
+# domínio e f(ponto) é um número real finito, então lim f(x) = f(ponto). Essa conferência
+# é só substituição, e evita o limit simbólico em quase todos os pontos do controle deslizante.
+# Do mesmo jeito se reconhecem os pontos fora do domínio real (ex: log(x) em x = -5).
+# Pontos em que a conta exata explodiria (ex: x^x^x em x = 100) ficam com o cálculo
+# completo, que roda num processo trabalhador com prazo.
+
+# Contínuas em todo ponto onde o valor existe (um polo já aparece como ∞ na substituição)
+_CONTINUAS_ONDE_FINITAS = (Add, Mul, Abs, Max, Min, exp, sin, cos, tan, cot, sec, csc,
+                           sinh, cosh, tanh, coth, atan)
+
+# Contínuas no próprio domínio, que vem de utils/dominio.py (raízes, log, asen/acos...)
+_CONTINUAS_NO_DOMINIO = (Pow, log, asin, acos, acosh, atanh)
+
+
+def _so_funcoes_conhecidas(variavel1, expr):
+    """False se aparece alguma função fora das conhecidas (floor, Piecewise, ...): aí nada é garantido."""
+    return all(
+        no.is_Atom or not no.has(variavel1) or isinstance(no, _CONTINUAS_ONDE_FINITAS + _CONTINUAS_NO_DOMINIO)
+        for no in preorder_traversal(expr)
+    )
+
+
+def valor_se_continua(variavel1, expr, ponto):
+    """
+    f(ponto) se f é contínua no ponto (finito), e então o limite é esse valor.
+    None quando não dá para garantir (polo, 0/0, borda do domínio, floor, Piecewise...):
+    nesses pontos vale o cálculo completo do limite.
+    """
+    if not _so_funcoes_conhecidas(variavel1, expr) or not substituicao_exata_viavel(variavel1, expr, ponto):
+        return None
+    valor = expr.subs(variavel1, ponto)
+    if not (valor.is_extended_real and valor.is_finite):
+        return None
+
+    # O ponto precisa estar no INTERIOR do domínio (todas as restrições valem com folga)
+    if ponto_no_interior(variavel1, expr, ponto) is not True:
+        return None
+    return valor
+
+
+def fora_do_dominio_real(variavel1, expr, ponto):
+    """
+    True se f não é real em toda uma vizinhança do ponto (ex: log(x) perto de x = -5):
+    alguma restrição do domínio é estritamente violada ali, ou f(ponto) tem parte imaginária e
+    nenhuma restrição se anula no ponto (os ramos principais de raiz, log e asen/acos são contínuos
+    ao longo da reta fora desses pontos).
+    """
+    if not _so_funcoes_conhecidas(variavel1, expr) or not substituicao_exata_viavel(variavel1, expr, ponto):
+        return False
+    if restricao_violada(variavel1, expr, ponto):
+        return True
+    valor = expr.subs(variavel1, ponto)
+    if not valor.is_finite or valor.is_extended_real is not False:
+        return False
+    return not restricoes_anuladas(variavel1, expr, ponto)
@@ -1,6 +1,38 @@
+import os
+from functools import lru_cache
+from itertools import islice
+
 import streamlit as st
 import sympy as sp
 
+from utils.simplificacao import simplificar_com_orcamento
+from utils.verificacao import verificar_equivalencia
+
+# Quantos passos no máximo são formatados e exibidos (expressões enormes geram centenas)
+LIMITE_PASSOS = int(os.environ.get("LIMITE_PASSOS", "80"))
+
+
+def calcular_derivada(variavel1, expressao):
+    """
+    Parte matemática (sem interface) da página de derivadas.
+    Retorna (expressão simplificada, derivada simplificada, lista de passos).
+    Os passos são objetos Passo: o LaTeX de cada um só é montado quando alguém pede.
+    """
+    # Simplifica a expressão antes de começar para evitar passos desnecessários (ex: x + x vira 2x)
+    expressao_simplificada = simplificar_com_orcamento(expressao)
+
+    resultado, passos = obter_passos_derivada(expressao_simplificada, variavel1)
+    resultado = simplificar_com_orcamento(resultado)
+
+    # Confere o resultado montado pelas regras com o sp.diff (numericamente, em milissegundos).
+    # Se as contas não baterem, mostra a derivada do Sympy e avisa no fim dos passos.
+    referencia = sp.diff(expressao_simplificada, variavel1)
+    if verificar_equivalencia(variavel1, resultado, referencia) is False:
+        resultado = simplificar_com_orcamento(referencia)
+        passos.append(Passo(lambda: r"\text{Conferência: o resultado foi corrigido pela derivada direta.}"))
+
+    return expressao_simplificada, resultado, passos
+
 
 def calcular_e_exibir_derivada(variavel1, expressao):
     """
@@ -10,183 +42,335 @@ def calcular_e_exibir_derivada(variavel1, expressao):
     st.markdown("---")
 
     try:
-        # Simplifica a expressão antes de começar para evitar passos desnecessários (ex: x + x vira 2x)
-        expressao_simplificada = sp.simplify(expressao)
-
-        resultado, passos = obter_passos_derivada(expressao_simplificada, variavel1)
+        expressao_simplificada, resultado, passos = calcular_derivada(variavel1, expressao)
 
+        # Resultado final primeiro (é barato); os passos vêm depois, só se pedidos
+        st.success("Resultado Final:")
+        st.latex(
+            rf"\frac{{d}}{{dx}} \left( {sp.latex(expressao_simplificada)} \right) = {sp.latex(resultado)}")
 
         #faz a interface bonitinha dde exibir quando a pessoa clica
         if passos:
-            with st.expander("Ver detalhes do cálculo"):
+            # st.toggle em vez de st.expander: o corpo do expander roda mesmo fechado,
+            # e aqui o LaTeX dos passos só deve ser montado se a pessoa quiser vê-los
+            if st.toggle("Ver detalhes do cálculo", key="detalhes_derivada"):
                 st.write("Aplicando as regras de derivação:")
-                for passo in passos:
+                for passo in gerar_passos_latex(passos):
                     st.latex(passo)
         else:
             st.info("Para esta função, a derivada é direta.")
 
-        # Resultado final
-        st.success("Resultado Final:")
-        st.latex(
-            rf"\frac{{d}}{{dx}} \left( {sp.latex(expressao_simplificada)} \right) = {sp.latex(sp.simplify(resultado))}")
-
     except Exception as e:
         st.error(f"Erro ao processar: {e}")
         st.latex(sp.latex(sp.diff(expressao, variavel1)))
 
 
+# ==========================================
+# MOTOR DE DERIVAÇÃO PASSO A PASSO
+# ==========================================
+# Cada tipo de nó da árvore da expressão (soma, produto, potência, seno, ...) tem a sua
+# regra registrada em REGRAS_DERIVADA. Para ensinar uma regra nova basta escrever a
+# função e decorá-la com @regra_derivada(tipo), sem mexer no resto do motor.
+# Uma regra recebe (derivador, expr, x) e devolve (derivada, lista_de_passos).
+
+REGRAS_DERIVADA = {}
+
+
+def regra_derivada(*tipos):
+    """Registra a função decorada como a regra de derivação dos tipos informados."""
+    def registrar(funcao):
+        for tipo in tipos:
+            REGRAS_DERIVADA[tipo] = funcao
+        return funcao
+    return registrar
+
+
+@lru_cache(maxsize=4096)
+def _latex(expr):
+    """sp.latex com memória: o mesmo nó aparece em vários passos e só é convertido uma vez."""
+    return sp.latex(expr)
+
+
+class Passo:
+    """
+    Um passo da explicação. Guarda só a receita do texto (uma função sem argumentos);
+    o LaTeX é montado na primeira chamada de latex() e reaproveitado depois.
+    """
+
+    __slots__ = ("formatar", "_texto")
+
+    def __init__(self, formatar):
+        self.formatar = formatar
+        self._texto = None
+
+    def latex(self):
+        if self._texto is None:
+            self._texto = self.formatar()
+        return self._texto
+
+
+def gerar_passos_latex(passos, limite=None):
+    """
+    Gera o LaTeX dos passos um de cada vez, parando no limite (LIMITE_PASSOS por padrão).
+    Se sobrar passo, o último item avisa quantos foram omitidos.
+    """
+    limite = LIMITE_PASSOS if limite is None else limite
+    for passo in islice(passos, limite):
+        yield passo.latex()
+    if len(passos) > limite:
+        yield rf"\text{{... mais {len(passos) - limite} passos omitidos}}"
+
+
+class _Derivador:
+    """
+    Percorre a árvore aplicando as regras registradas.
+    Cada subárvore diferente é derivada uma única vez (memória por nó), então o
+    custo cresce com o número de nós distintos, e não com o formato da árvore.
+    """
+
+    def __init__(self, x):
+        self.x = x
+        self.memoria = {}
+
+    def derivar(self, expr):
+        if expr in self.memoria:
+            # Essa parte já foi derivada (e explicada) antes: reaproveita sem repetir os passos
+            return self.memoria[expr], []
+
+        resultado, passos = self._aplicar_regra(expr)
+        self.memoria[expr] = resultado
+        return resultado, passos
+
+    def _aplicar_regra(self, expr):
+        x = self.x
+
+        # ---------------------------------------------------------
+        # 1. CASOS TRIVIAIS (Números e x isolado)
+        # ---------------------------------------------------------
+        if not expr.has(x):
+            return sp.Integer(0), []  # Não mostra passo para derivada de constante (reduz poluição visual)
+
+        if expr == x:
+            return sp.Integer(1), []  # Não mostra passo para derivada de x (reduz poluição visual)
+
+        # Procura a regra do tipo do nó (ou de um tipo "pai", ex: sp.log para ln)
+        for tipo in type(expr).__mro__:
+            regra = REGRAS_DERIVADA.get(tipo)
+            if regra is not None:
+                resposta = regra(self, expr, x)
+                if resposta is not None:
+                    return resposta
+                break
+
+        # ---------------------------------------------------------
+        # GENÉRICO (Se nenhuma regra registrada serviu)
+        # ---------------------------------------------------------
+        res = sp.diff(expr, x)
+        return res, [Passo(lambda: rf"\text{{Derivada direta aplicada: }} {_latex(res)}")]
+
+
 def obter_passos_derivada(expr, x):
     """
     Núcleo lógico: Identifica a estrutura da função e aplica APENAS a regra correspondente.
-    Retorna: (expressão_derivada, lista_de_latex)
+    Retorna: (expressão_derivada, lista_de_passos)
     """
-    passos = []
+    return _Derivador(x).derivar(expr)
 
-    # ---------------------------------------------------------
-    # 1. CASOS TRIVIAIS (Números e x isolado)
-    # ---------------------------------------------------------
-    if expr.is_constant(x):
-        return sp.Integer(0), []  # Não mostra passo para derivada de constante (reduz poluição visual)
 
-    if expr == x:
-        return sp.Integer(1), []  # Não mostra passo para derivada de x (reduz poluição visual)
+# ---------------------------------------------------------
+# REGRA DA SOMA (Detecta + ou -)
+# ---------------------------------------------------------
+@regra_derivada(sp.Add)
+def _regra_soma(derivador, expr, x):
+    passos = [Passo(lambda: r"\text{Regra da Soma: Deriva-se cada termo separadamente.}")]
 
-    # ---------------------------------------------------------
-    # 2. REGRA DA SOMA (Detecta + ou -)
-    # ---------------------------------------------------------
-    if expr.is_Add:
-        passos.append(r"\text{Regra da Soma: Deriva-se cada termo separadamente.}")
+    resultado = 0
+    termos_derivados = []
 
-        termos = expr.args
-        resultado = 0
-        termos_derivados_latex = []
+    for termo in expr.args:
+        deriv, sub_passos = derivador.derivar(termo)
+        resultado += deriv
 
-        for termo in termos:
-            deriv, sub_passos = obter_passos_derivada(termo, x)
-            resultado += deriv
+        # Termos simples (x ou constante) não geram sub-passos
+        passos.extend(sub_passos)
 
-            # Só adiciona sub-passos se o termo for complexo (não for x ou constante)
-            if not termo.is_constant(x) and termo != x:
-                passos.extend(sub_passos)
+        termos_derivados.append(deriv)
 
-            termos_derivados_latex.append(sp.latex(deriv))
+    passos.append(Passo(lambda: rf"\text{{Juntando os termos: }} {' + '.join(_latex(t) for t in termos_derivados)}"))
+    return resultado, passos
 
-        passos.append(rf"\text{{Juntando os termos: }} {' + '.join(termos_derivados_latex)}")
-        return resultado, passos
 
-    # ---------------------------------------------------------
-    # 3. REGRA DA CONSTANTE E PRODUTO
-    # ---------------------------------------------------------
-    if expr.is_Mul:
-        # Verifica se é "Número * Função" (Ex: 3x^2) -> NÃO É REGRA DO PRODUTO, é linearidade
-        coeficientes = [arg for arg in expr.args if arg.is_constant(x)]
-        funcoes = [arg for arg in expr.args if not arg.is_constant(x)]
+# ---------------------------------------------------------
+# REGRA DA CONSTANTE, DO QUOCIENTE E DO PRODUTO
+# ---------------------------------------------------------
+@regra_derivada(sp.Mul)
+def _regra_produto(derivador, expr, x):
+    passos = []
+
+    # Verifica se é "Número * Função" (Ex: 3x^2) -> NÃO É REGRA DO PRODUTO, é linearidade
+    coeficientes = [arg for arg in expr.args if not arg.has(x)]
+    funcoes = [arg for arg in expr.args if arg.has(x)]
 
-        if coeficientes:
-            # Junta todos os números em um só (ex: 2 * 3 * x -> 6 * x)
-            constante = sp.Mul(*coeficientes)
-            resto = sp.Mul(*funcoes)
+    if coeficientes:
+        # Junta todos os números em um só (ex: 2 * 3 * x -> 6 * x)
+        constante = sp.Mul(*coeficientes)
+        resto = sp.Mul(*funcoes)
 
-            # Se sobrou apenas uma função (ex: 5 * x^2), deriva o resto e multiplica
-            deriv_resto, sub_passos = obter_passos_derivada(resto, x)
-            passos.extend(sub_passos)  # Mostra como derivou o x^2
+        # Se sobrou apenas uma função (ex: 5 * x^2), deriva o resto e multiplica
+        deriv_resto, sub_passos = derivador.derivar(resto)
+        passos.extend(sub_passos)  # Mostra como derivou o x^2
 
-            return constante * deriv_resto, passos
+        return constante * deriv_resto, passos
 
-        # Se chegou aqui, é Função * Função (Ex: x * sen(x)) -> REGRA DO PRODUTO REAL
-        else:
-            u = expr.args[0]
-            v = sp.Mul(*expr.args[1:])  # Trata todo o resto como 'v'
+    # Divisão explícita (ex: sen(x)/x) -> REGRA DO QUOCIENTE
+    numerador, denominador = sp.fraction(expr)
+    if denominador.has(x) and numerador.has(x):
+        return _regra_quociente(derivador, numerador, denominador)
+
+    # Se chegou aqui, é Função * Função (Ex: x * sen(x)) -> REGRA DO PRODUTO REAL
+    u = expr.args[0]
+    v = sp.Mul(*expr.args[1:])  # Trata todo o resto como 'v'
+
+    passos.append(Passo(lambda: r"\textbf{Regra do Produto:} (u \cdot v)' = u'v + uv'"))
+    passos.append(Passo(lambda: rf"u = {_latex(u)}, \quad v = {_latex(v)}"))
 
-            passos.append(r"\textbf{Regra do Produto:} (u \cdot v)' = u'v + uv'")
-            passos.append(rf"u = {sp.latex(u)}, \quad v = {sp.latex(v)}")
+    du, passos_u = derivador.derivar(u)
+    dv, passos_v = derivador.derivar(v)
 
-            du, passos_u = obter_passos_derivada(u, x)
-            dv, passos_v = obter_passos_derivada(v, x)
+    passos.extend(passos_u)
+    passos.extend(passos_v)
 
-            if passos_u: passos.extend(passos_u)
-            if passos_v: passos.extend(passos_v)
+    resultado = du * v + u * dv
+    passos.append(
+        Passo(lambda: rf"\text{{Aplicação: }} ({_latex(du)}) \cdot ({_latex(v)}) + ({_latex(u)}) \cdot ({_latex(dv)})"))
+    return resultado, passos
 
-            resultado = du * v + u * dv
+
+def _regra_quociente(derivador, numerador, denominador):
+    passos = [
+        Passo(lambda: r"\textbf{Regra do Quociente:} \left(\frac{u}{v}\right)' = \frac{u'v - uv'}{v^2}"),
+        Passo(lambda: rf"u = {_latex(numerador)}, \quad v = {_latex(denominador)}"),
+    ]
+
+    du, passos_u = derivador.derivar(numerador)
+    dv, passos_v = derivador.derivar(denominador)
+    passos.extend(passos_u)
+    passos.extend(passos_v)
+
+    resultado = (du * denominador - numerador * dv) / denominador ** 2
+    passos.append(
+        Passo(lambda: rf"\text{{Aplicação: }} \frac{{({_latex(du)}) \cdot ({_latex(denominador)}) - "
+        rf"({_latex(numerador)}) \cdot ({_latex(dv)})}}{{({_latex(denominador)})^2}}"))
+    return resultado, passos
+
+
+# ---------------------------------------------------------
+# REGRA DA POTÊNCIA E CADEIA (Ex: x^2, (x+1)^2, sqrt(x), 2^x, x^x)
+# ---------------------------------------------------------
+@regra_derivada(sp.Pow)
+def _regra_potencia(derivador, expr, x):
+    passos = []
+    base, expoente = expr.args
+
+    # Caso especial: Raiz Quadrada (Exponente 1/2)
+    if expoente == sp.Rational(1, 2):
+        passos.append(Passo(lambda:
+            r"\textbf{Regra da Raiz Quadrada:} \frac{d}{dx}\sqrt{u} = \frac{1}{2\sqrt{u}} \cdot u'"))
+        if base == x:
+            return 1 / (2 * sp.sqrt(x)), passos
+        dbase, sub = derivador.derivar(base)
+        passos.extend(sub)
+        return (1 / (2 * sp.sqrt(base))) * dbase, passos
+
+    # Regra do Tombo Padrão
+    if not expoente.has(x):
+        novo_expoente = expoente - 1
+
+        # Caso simples: x^n
+        if base == x:
             passos.append(
-                rf"\text{{Aplicação: }} ({sp.latex(du)}) \cdot ({sp.latex(v)}) + ({sp.latex(u)}) \cdot ({sp.latex(dv)})")
-            return resultado, passos
-
-    # ---------------------------------------------------------
-    # 4. REGRA DA POTÊNCIA E CADEIA (Ex: x^2, (x+1)^2, sqrt(x))
-    # ---------------------------------------------------------
-    if expr.is_Pow:
-        base, expoente = expr.args
-
-        # Caso especial: Raiz Quadrada (Exponente 1/2)
-        if expoente == sp.Rational(1, 2):
-            passos.append(r"\textbf{Regra da Raiz Quadrada:} \frac{d}{dx}\sqrt{u} = \frac{1}{2\sqrt{u}} \cdot u'")
-            if base == x:
-                return 1 / (2 * sp.sqrt(x)), passos
-            else:
-                dbase, sub = obter_passos_derivada(base, x)
-                passos.extend(sub)
-                return (1 / (2 * sp.sqrt(base))) * dbase, passos
-
-        # Regra do Tombo Padrão
-        if expoente.is_constant(x):
-            novo_expoente = expoente - 1
-
-            # Caso simples: x^n
-            if base == x:
-                passos.append(
-                    rf"\text{{Regra do Tombo: }} \frac{{d}}{{dx}}({sp.latex(expr)}) = {sp.latex(expoente)}x^{{{sp.latex(novo_expoente)}}}")
-                return expoente * x ** novo_expoente, passos
-
-            # Caso Cadeia: (u)^n
-            else:
-                passos.append(r"\textbf{Regra da Cadeia (Potência):} n(u)^{n-1} \cdot u'")
-                passos.append(rf"u = {sp.latex(base)}")
-
-                dbase, sub = obter_passos_derivada(base, x)
-                passos.extend(sub)
-
-                res = expoente * (base ** novo_expoente) * dbase
-                passos.append(
-                    rf"\text{{Resultado: }} {sp.latex(expoente)}({sp.latex(base)})^{{{sp.latex(novo_expoente)}}} \cdot ({sp.latex(dbase)})")
-                return res, passos
-
-    # ---------------------------------------------------------
-    # 5. TRIGONOMÉTRICAS (Seno, Cosseno, Tangente)
-    # ---------------------------------------------------------
-    if isinstance(expr, (sp.sin, sp.cos, sp.tan)):
-        arg = expr.args[0]
-        func_nome = type(expr).__name__
-
-        regras = {
-            'sin': (sp.cos(arg), r"\cos(u)"),
-            'cos': (-sp.sin(arg), r"-\sin(u)"),
-            'tan': (sp.sec(arg) ** 2, r"\sec^2(u)")
-        }
-
-        derivada_externa, nome_latex = regras[func_nome]
-
-        # Se for sin(x) simples
-        if arg == x:
-            passos.append(rf"\text{{Derivada Trigonométrica: }} ({sp.latex(expr)})' = {sp.latex(derivada_externa)}")
-            return derivada_externa, passos
-
-        # Se for sin(u) -> Cadeia
-        else:
-            passos.append(rf"\textbf{{Regra da Cadeia (Trig):}} \frac{{d}}{{dx}}{func_nome}(u) = {nome_latex} \cdot u'")
-            passos.append(rf"u = {sp.latex(arg)}")
-
-            darg, sub = obter_passos_derivada(arg, x)
-            passos.extend(sub)
-
-            res = derivada_externa * darg
-            passos.append(rf"\text{{Montagem: }} {sp.latex(derivada_externa)} \cdot ({sp.latex(darg)})")
-            return res, passos
-
-    # ---------------------------------------------------------
-    # 6. GENÉRICO (Se nada acima funcionou)
-    # ---------------------------------------------------------
-    # Este bloco só roda se for uma função que não mapeamos (ex: log, exp, sec)
-    res = sp.diff(expr, x)
-    passos.append(rf"\text{{Derivada direta aplicada: }} {sp.latex(res)}")
-    return res, passos
\ No newline at end of file
+                Passo(lambda: rf"\text{{Regra do Tombo: }} \frac{{d}}{{dx}}({_latex(expr)}) = {_latex(expoente)}x^{{{_latex(novo_expoente)}}}"))
+            return expoente * x ** novo_expoente, passos
+
+        # Caso Cadeia: (u)^n
+        passos.append(Passo(lambda: r"\textbf{Regra da Cadeia (Potência):} n(u)^{n-1} \cdot u'"))
+        passos.append(Passo(lambda: rf"u = {_latex(base)}"))
+
+        dbase, sub = derivador.derivar(base)
+        passos.extend(sub)
+
+        res = expoente * (base ** novo_expoente) * dbase
+        passos.append(
+            Passo(lambda: rf"\text{{Resultado: }} {_latex(expoente)}({_latex(base)})^{{{_latex(novo_expoente)}}} \cdot ({_latex(dbase)})"))
+        return res, passos
+
+    # Exponencial de base constante: a^u
+    if not base.has(x):
+        passos.append(Passo(lambda: r"\textbf{Regra da Exponencial:} \frac{d}{dx}a^{u} = a^{u} \ln(a) \cdot u'"))
+        passos.append(Passo(lambda: rf"a = {_latex(base)}, \quad u = {_latex(expoente)}"))
+        dexp, sub = derivador.derivar(expoente)
+        passos.extend(sub)
+        return expr * sp.log(base) * dexp, passos
+
+    # Potência geral u^v (base e expoente variam): derivação logarítmica
+    passos.append(
+        Passo(lambda: r"\textbf{Potência Geral (derivação logarítmica):} "
+        r"\frac{d}{dx}u^{v} = u^{v}\left(v' \ln(u) + v \frac{u'}{u}\right)"))
+    passos.append(Passo(lambda: rf"u = {_latex(base)}, \quad v = {_latex(expoente)}"))
+    dbase, passos_u = derivador.derivar(base)
+    dexp, passos_v = derivador.derivar(expoente)
+    passos.extend(passos_u)
+    passos.extend(passos_v)
+    return expr * (dexp * sp.log(base) + expoente * dbase / base), passos
+
+
+# ---------------------------------------------------------
+# FUNÇÕES DE UM ARGUMENTO (Trigonométricas, exponencial, logaritmo, inversas)
+# ---------------------------------------------------------
+# tipo -> (derivada externa em função de u, fórmula em LaTeX, nome da regra)
+TABELA_FUNCOES = {
+    sp.sin: (lambda u: sp.cos(u), r"\cos(u)", "Trig"),
+    sp.cos: (lambda u: -sp.sin(u), r"-\sin(u)", "Trig"),
+    sp.tan: (lambda u: sp.sec(u) ** 2, r"\sec^2(u)", "Trig"),
+    sp.cot: (lambda u: -sp.csc(u) ** 2, r"-\csc^2(u)", "Trig"),
+    sp.sec: (lambda u: sp.sec(u) * sp.tan(u), r"\sec(u)\tan(u)", "Trig"),
+    sp.csc: (lambda u: -sp.csc(u) * sp.cot(u), r"-\csc(u)\cot(u)", "Trig"),
+    sp.exp: (lambda u: sp.exp(u), r"e^{u}", "Exponencial"),
+    sp.log: (lambda u: 1 / u, r"\frac{1}{u}", "Logaritmo"),
+    sp.asin: (lambda u: 1 / sp.sqrt(1 - u ** 2), r"\frac{1}{\sqrt{1 - u^2}}", "Trig Inversa"),
+    sp.acos: (lambda u: -1 / sp.sqrt(1 - u ** 2), r"-\frac{1}{\sqrt{1 - u^2}}", "Trig Inversa"),
+    sp.atan: (lambda u: 1 / (1 + u ** 2), r"\frac{1}{1 + u^2}", "Trig Inversa"),
+    sp.acot: (lambda u: -1 / (1 + u ** 2), r"-\frac{1}{1 + u^2}", "Trig Inversa"),
+}
+
+
+@regra_derivada(*TABELA_FUNCOES)
+def _regra_funcao_tabelada(derivador, expr, x):
+    # log(u, b) tem dois argumentos: deixa para a derivada direta
+    if len(expr.args) != 1:
+        return None
+
+    arg = expr.args[0]
+    derivada, nome_latex, nome_regra = TABELA_FUNCOES[type(expr)]
+    derivada_externa = derivada(arg)
+    func_nome = type(expr).__name__
+
+    # Se for sin(x) simples
+    if arg == x:
+        return derivada_externa, [Passo(lambda:
+            rf"\text{{Derivada {'Trigonométrica' if nome_regra == 'Trig' else nome_regra}: }} "
+            rf"({_latex(expr)})' = {_latex(derivada_externa)}"
+        )]
+
+    # Se for sin(u) -> Cadeia
+    passos = [
+        Passo(lambda: rf"\textbf{{Regra da Cadeia ({nome_regra}):}} \frac{{d}}{{dx}}{func_nome}(u) = {nome_latex} \cdot u'"),
+        Passo(lambda: rf"u = {_latex(arg)}"),
+    ]
+
+    darg, sub = derivador.derivar(arg)
+    passos.extend(sub)
+
+    res = derivada_externa * darg
+    passos.append(Passo(lambda: rf"\text{{Montagem: }} {_latex(derivada_externa)} \cdot ({_latex(darg)})"))
+    return res, passos
@@ -0,0 +1,83 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+
+# ==========================================
+# DIAGNÓSTICO DE DESEMPENHO (OPCIONAL)
+# ==========================================
+# Liga com ?diagnostico=1 na URL (ou LIMITE_DIAGNOSTICO=1 no ambiente).
+# Com ?diagnostico=perfil, cada etapa também roda dentro do cProfile e as funções
+# que mais gastaram tempo podem ser baixadas em texto.
+# Obs: os cálculos simbólicos rodam em processos trabalhadores; aqui aparece o tempo
+# que a página ficou esperando por eles.
+
+class Diagnostico:
+    """Cronometra as etapas da página e, se pedido, guarda o perfil (cProfile) delas."""
+
+    def __init__(self, ativo=False, perfilar=False):
+        self.ativo = ativo
+        self.etapas = []
+        self.perfil = cProfile.Profile() if ativo and perfilar else None
+
+    @contextmanager
+    def etapa(self, nome):
+        """Uso: with diagnostico.etapa("Amostragem"): ..."""
+        if not self.ativo:
+            yield
+            return
+
+        inicio = time.perf_counter()
+        if self.perfil:
+            self.perfil.enable()
+        try:
+            yield
+        finally:
+            if self.perfil:
+                self.perfil.disable()
+            self.etapas.append((nome, time.perf_counter() - inicio))
+
+    def relatorio_perfil(self, quantidade=40):
+        """Texto com as funções de maior tempo acumulado (formato do pstats)."""
+        saida = io.StringIO()
+        pstats.Stats(self.perfil, stream=saida).sort_stats("cumulative").print_stats(quantidade)
+        return saida.getvalue()
+
+    def exibir(self):
+        """Mostra o tempo de cada etapa em um expander no fim da página."""
+        if not self.ativo:
+            return
+
+        total = sum(segundos for _, segundos in self.etapas)
+        with st.expander(f"🩺 Diagnóstico de desempenho ({total * 1000:.0f} ms)"):
+            st.table([
+                {
+                    "Etapa": nome,
+                    "Tempo (ms)": round(segundos * 1000, 1),
+                    "% do total": round(100 * segundos / total, 1) if total else 0.0,
+                }
+                for nome, segundos in self.etapas
+            ])
+
+            if self.perfil:
+                relatorio = self.relatorio_perfil()
+                st.code(relatorio[:4000], language="text")
+                st.download_button(
+                    label="⬇️ Baixar perfil completo",
+                    data=relatorio,
+                    file_name="perfil_limite_inteligente.txt",
+                    mime="text/plain",
+                    key="download_perfil"
+                )
+
+
+def obter_diagnostico():
+    """Cria o diagnóstico da execução atual, ligado ou não conforme a URL/ambiente."""
+    modo = st.query_params.get("diagnostico") or os.environ.get("LIMITE_DIAGNOSTICO", "")
+    ativo = modo in ("1", "true", "sim", "perfil")
+    return Diagnostico(ativo=ativo, perfilar=(modo == "perfil"))
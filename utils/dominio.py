@@ -0,0 +1,123 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Sympy: Biblioteca de matemática simbólica. Aqui ela percorre a árvore da expressão para
+# achar as restrições de domínio, e o "lambdify" transforma essas restrições em uma máscara vetorizada.
+from sympy import And, Ge, Gt, Ne, Pow, acos, acosh, asin, atanh, lambdify, log, preorder_traversal
+
+
+# ==========================================
+# DOMÍNIO REAL (RESTRIÇÕES + MÁSCARA VETORIZADA)
+# ==========================================
+# O domínio é deduzido UMA vez por expressão, direto da árvore:
+# - denominadores (potência inteira negativa): base ≠ 0;
+# - raízes (potência fracionária): base ≥ 0 (ou > 0, se o expoente é negativo);
+# - logaritmos: argumento > 0;  asen/acos: -1 ≤ u ≤ 1 (e assim por diante).
+# As restrições viram uma única função Numpy que devolve, para uma grade inteira,
+# True onde f existe. O gráfico, as raízes e as inequações usam essa mesma máscara.
+
+# Relação de cada restrição: expressão <relação> 0
+_RELACOES = {">": Gt, ">=": Ge, "!=": Ne}
+
+
+def _restricao_do_no(no, variavel1):
+    """Restrição (expressão, relação) que o pedaço 'no' impõe ao domínio, ou None."""
+    if isinstance(no, Pow):
+        if not no.base.has(variavel1):
+            return None
+        if no.exp.is_integer:
+            return (no.base, "!=") if no.exp.is_negative else None
+        if no.exp.is_positive and not no.exp.has(variavel1):
+            return no.base, ">="
+        return no.base, ">"
+    if isinstance(no, log):
+        return no.args[0], ">"
+    if isinstance(no, (asin, acos)):
+        return 1 - no.args[0] ** 2, ">="
+    if isinstance(no, acosh):
+        return no.args[0] - 1, ">="
+    if isinstance(no, atanh):
+        return 1 - no.args[0] ** 2, ">"
+    return None
+
+
+@lru_cache(maxsize=256)
+def restricoes_do_dominio(variavel1, expr):
+    """
+    Restrições do domínio real de expr: tupla de (expressão, relação), com relação '>', '>=' ou '!='
+    (a expressão comparada com zero). Tupla vazia: a função existe em toda a reta (fora os polos de tan etc.).
+    """
+    restricoes = []
+    for no in preorder_traversal(expr):
+        if no.is_Atom or not no.has(variavel1):
+            continue
+        restricao = _restricao_do_no(no, variavel1)
+        if restricao is not None:
+            restricoes.append(restricao)
+    return tuple(dict.fromkeys(restricoes))
+
+
+@lru_cache(maxsize=256)
+def compilar_mascara(variavel1, expr):
+    """Função Numpy que diz, ponto a ponto, se x está no domínio (None: domínio é a reta toda)."""
+    restricoes = restricoes_do_dominio(variavel1, expr)
+    if not restricoes:
+        return None
+    condicao = And(*[_RELACOES[relacao](restrito, 0) for restrito, relacao in restricoes])
+    return lambdify(variavel1, condicao, modules="numpy")
+
+
+def mascara_do_dominio(variavel1, expr, x_vals):
+    """
+    Vetor booleano: True onde expr está definida (nos reais), para todos os pontos de uma vez.
+    Pontos em que a própria restrição não existe (ex: log(log(x)) com x < 0) dão False.
+    """
+    x_vals = np.asarray(x_vals, dtype=float)
+    mascara = compilar_mascara(variavel1, expr)
+    if mascara is None:
+        return np.ones(x_vals.shape, dtype=bool)
+
+    try:
+        with np.errstate(all="ignore"):
+            dentro = np.asarray(mascara(x_vals))
+    except Exception:
+        # Restrição que o Numpy não entende: não exclui nada (o avaliador ainda marca NaN)
+        return np.ones(x_vals.shape, dtype=bool)
+    return np.broadcast_to(dentro.astype(bool), x_vals.shape).copy()
+
+
+def ponto_no_interior(variavel1, expr, ponto):
+    """
+    True se o ponto está no INTERIOR do domínio: todas as restrições valem com folga
+    (expressão estritamente positiva, ou não nula no caso de '≠'). None se não dá para decidir.
+    """
+    for restrito, relacao in restricoes_do_dominio(variavel1, expr):
+        valor = restrito.subs(variavel1, ponto)
+        folga = valor.is_zero is False if relacao == "!=" else valor.is_positive
+        if folga is not True:
+            return folga
+    return True
+
+
+def restricoes_anuladas(variavel1, expr, ponto):
+    """
+    True se alguma restrição do domínio se anula no ponto (ou não dá para saber):
+    é uma borda do domínio ou um ponto de ramificação de raiz/log.
+    """
+    return any(
+        restrito.subs(variavel1, ponto).is_zero is not False
+        for restrito, _ in restricoes_do_dominio(variavel1, expr)
+    )
+
+
+def restricao_violada(variavel1, expr, ponto):
+    """
+    True se alguma restrição de desigualdade é estritamente violada no ponto (ex: 1 - x² < 0 no asen
+    em x = 5). Como a violação é estrita, ela continua valendo numa vizinhança do ponto.
+    O ponto pode ser simbólico (ex: a - t com t > 0): aí a violação vale para todo t.
+    """
+    return any(
+        relacao != "!=" and restrito.subs(variavel1, ponto).expand().is_negative is True
+        for restrito, relacao in restricoes_do_dominio(variavel1, expr)
+    )
@@ -0,0 +1,247 @@
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ==========================================
+# EXECUÇÃO COM PRAZO (POOL DE PROCESSOS)
+# ==========================================
+# Alguns cálculos do Sympy (limit, solve, integrate) podem demorar "para sempre"
+# com certas funções. Para não travar a página, eles rodam em processos separados:
+# se o prazo estourar, o processo é encerrado à força e substituído por um novo.
+
+# Tempo máximo (em segundos) de cada operação simbólica
+PRAZO_PADRAO = float(os.environ.get("LIMITE_PRAZO_SEGUNDOS", 8))
+
+# Quantidade de processos trabalhadores
+NUMERO_TRABALHADORES = int(os.environ.get("LIMITE_TRABALHADORES", min(4, os.cpu_count() or 2)))
+
+MENSAGEM_TEMPO_ESGOTADO = "⏱️ Tempo limite excedido: este cálculo demorou demais e foi interrompido."
+
+# "spawn" cria processos limpos (sem copiar as threads do Streamlit), em qualquer sistema
+_contexto = multiprocessing.get_context("spawn")
+
+# Fica True dentro dos trabalhadores (e quando a execução local é pedida):
+# nesses casos as funções são chamadas diretamente, sem criar novos processos.
+_execucao_local = False
+
+
+class TempoEsgotado(TimeoutError):
+    """O cálculo passou do prazo e foi cancelado."""
+
+
+def _laco_do_trabalhador(conexao):
+    """Código que roda dentro de cada processo trabalhador: recebe tarefas e devolve resultados."""
+    global _execucao_local
+    _execucao_local = True
+
+    # Já carrega o Sympy para a primeira tarefa não pagar esse tempo
+    import sympy  # noqa: F401
+
+    while True:
+        try:
+            funcao, args, kwargs = conexao.recv()
+        except (EOFError, OSError):
+            break
+
+        try:
+            resposta = (True, funcao(*args, **kwargs))
+        except Exception as erro:
+            resposta = (False, erro)
+
+        try:
+            conexao.send(resposta)
+        except Exception as erro:
+            # O resultado (ou o erro) não pôde ser enviado de volta ao processo principal
+            conexao.send((False, RuntimeError(f"Resultado não transferível: {erro}")))
+
+
+class _ProcessoPerdido(Exception):
+    """O processo trabalhador morreu no meio do cálculo (ex: falta de memória)."""
+
+
+class _Trabalhador:
+    """Um processo separado, com um canal (Pipe) para conversar com ele."""
+
+    def __init__(self):
+        self.conexao, conexao_filho = _contexto.Pipe()
+        self.processo = _contexto.Process(target=_laco_do_trabalhador, args=(conexao_filho,), daemon=True)
+        self.processo.start()
+        conexao_filho.close()
+
+    def executar(self, funcao, args, kwargs, prazo):
+        try:
+            self.conexao.send((funcao, args, kwargs))
+            if not self.conexao.poll(max(prazo, 0)):
+                raise TempoEsgotado()
+            sucesso, valor = self.conexao.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError) as erro:
+            raise _ProcessoPerdido() from erro
+        if sucesso:
+            return valor
+        raise valor
+
+    def encerrar(self):
+        self.processo.kill()
+        self.processo.join(timeout=1)
+        self.conexao.close()
+
+
+class _PoolDeTrabalhadores:
+    """Guarda os processos ociosos e cria/substitui processos conforme a necessidade."""
+
+    def __init__(self, tamanho):
+        self.tamanho = tamanho
+        self.ociosos = queue.LifoQueue()
+        self.trava = threading.Lock()
+        self.criados = 0
+        self.todos = set()
+
+    def _pegar_trabalhador(self, prazo_final):
+        try:
+            return self.ociosos.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self.trava:
+            if self.criados < self.tamanho:
+                self.criados += 1
+                criar = True
+            else:
+                criar = False
+
+        if criar:
+            try:
+                trabalhador = _Trabalhador()
+            except Exception:
+                with self.trava:
+                    self.criados -= 1
+                raise
+            with self.trava:
+                self.todos.add(trabalhador)
+            return trabalhador
+
+        # Todos ocupados: espera um ficar livre (a espera também conta no prazo)
+        try:
+            return self.ociosos.get(timeout=max(prazo_final - time.monotonic(), 0))
+        except queue.Empty:
+            raise TempoEsgotado()
+
+    def _descartar(self, trabalhador):
+        trabalhador.encerrar()
+        with self.trava:
+            self.todos.discard(trabalhador)
+            self.criados -= 1
+
+        # Já deixa um substituto pronto em segundo plano (criar processo leva um tempinho)
+        threading.Thread(target=self._repor, daemon=True).start()
+
+    def _repor(self):
+        with self.trava:
+            if self.criados >= self.tamanho:
+                return
+            self.criados += 1
+        try:
+            trabalhador = _Trabalhador()
+        except Exception:
+            with self.trava:
+                self.criados -= 1
+            return
+        with self.trava:
+            self.todos.add(trabalhador)
+        self.ociosos.put(trabalhador)
+
+    def executar(self, funcao, args, kwargs, prazo):
+        prazo_final = time.monotonic() + prazo
+        trabalhador = self._pegar_trabalhador(prazo_final)
+
+        try:
+            valor = trabalhador.executar(funcao, args, kwargs, prazo_final - time.monotonic())
+        except TempoEsgotado:
+            # Processo travado: mata e substitui
+            self._descartar(trabalhador)
+            raise
+        except _ProcessoPerdido as erro:
+            self._descartar(trabalhador)
+            raise RuntimeError("O processo de cálculo foi interrompido.") from erro
+        except Exception:
+            # Erro do próprio cálculo (ex: NotImplementedError do Sympy): o processo continua bom
+            self.ociosos.put(trabalhador)
+            raise
+        except BaseException:
+            # Interrupção no meio da espera: o processo pode estar ocupado, então é descartado
+            self._descartar(trabalhador)
+            raise
+
+        self.ociosos.put(trabalhador)
+        return valor
+
+    def encerrar_todos(self):
+        with self.trava:
+            trabalhadores = list(self.todos)
+            self.todos.clear()
+            self.criados = 0
+        for trabalhador in trabalhadores:
+            trabalhador.encerrar()
+
+
+_pool = _PoolDeTrabalhadores(NUMERO_TRABALHADORES)
+atexit.register(_pool.encerrar_todos)
+
+
+def executar_com_prazo(funcao, *args, prazo=None, **kwargs):
+    """
+    Executa funcao(*args, **kwargs) em um processo trabalhador, com tempo máximo.
+    A função e os argumentos precisam ser "picklable" (funções de módulo, expressões do Sympy...).
+    Se o prazo acabar, o processo é morto e a exceção TempoEsgotado é lançada.
+    """
+    if prazo is None:
+        prazo = PRAZO_PADRAO
+
+    if _execucao_local:
+        return funcao(*args, **kwargs)
+
+    return _pool.executar(funcao, args, kwargs, prazo)
+
+
+def definir_execucao_local(ativo):
+    """Liga/desliga a execução direta no próprio processo (sem pool e sem prazo)."""
+    global _execucao_local
+    _execucao_local = ativo
+
+
+# ==========================================
+# ANÁLISES EM PARALELO
+# ==========================================
+# As análises de uma página não dependem umas das outras. Cada uma é agendada
+# em uma thread (que só espera o processo trabalhador responder), e a página
+# mostra os resultados na ordem de sempre: o tempo total fica perto do da análise mais lenta.
+
+_threads_de_analise = ThreadPoolExecutor(max_workers=2 * NUMERO_TRABALHADORES, thread_name_prefix="analise")
+
+
+def agendar(funcao, *args, **kwargs):
+    """Começa a calcular funcao(*args, **kwargs) em segundo plano e devolve um Future."""
+    return _threads_de_analise.submit(funcao, *args, **kwargs)
+
+
+def obter_resultado(calculo, funcao, *args):
+    """
+    Resultado de um cálculo agendado com agendar().
+    Se nada foi agendado (calculo=None), calcula na hora com funcao(*args).
+    Erros do cálculo aparecem aqui, como se a função tivesse sido chamada direto.
+    """
+    if calculo is None:
+        return funcao(*args)
+    return calculo.result()
+
+
+def configurar_trabalhadores(quantidade):
+    """Muda a quantidade máxima de processos trabalhadores (ex: um por núcleo na análise em lote)."""
+    global _threads_de_analise
+    _pool.tamanho = max(1, quantidade)
+    _threads_de_analise = ThreadPoolExecutor(max_workers=2 * _pool.tamanho, thread_name_prefix="analise")
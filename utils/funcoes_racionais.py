@@ -0,0 +1,122 @@
+# Sympy: Biblioteca de matemática simbólica. Aqui só entram os algoritmos de polinômios
+# (mdc, divisão, isolamento de raízes reais), bem mais rápidos que limit e solve.
+from sympy import S, Poly, expand, factorial, fraction, roots, sign, together
+from sympy.polys.polyerrors import BasePolynomialError
+
+
+# ==========================================
+# CAMINHO RÁPIDO PARA FUNÇÕES RACIONAIS
+# ==========================================
+# Quando f = P/Q com P e Q polinômios de coeficientes racionais, limites e assíntotas
+# saem direto dos polinômios, sem limit nem solve:
+# - mdc(P, Q) separa os furos (descontinuidades removíveis) dos polos verdadeiros;
+# - a comparação dos graus dá os limites em ±∞ (assíntotas horizontais);
+# - a divisão de polinômios dá a assíntota oblíqua;
+# - as raízes reais do denominador são isoladas pelo teorema de Sturm (count_roots/real_roots).
+
+
+class FuncaoRacional:
+    """
+    f = numerador / denominador, já sem fatores comuns (polinômios de coeficientes racionais).
+    'polos' são os zeros reais do denominador reduzido; 'furos' são os zeros reais que
+    sumiram na simplificação (f não existe ali, mas o limite é finito).
+    """
+
+    def __init__(self, variavel1, numerador, denominador, polos, furos):
+        self.variavel1 = variavel1
+        self.numerador = numerador
+        self.denominador = denominador
+        self.polos = polos
+        self.furos = furos
+
+    def _valor(self, polinomio, ponto):
+        """Valor do polinômio no ponto (por substituição: um ponto decimal continua decimal)."""
+        return expand(polinomio.as_expr().subs(self.variavel1, ponto))
+
+    def limite_no_infinito(self, lado):
+        """lim f(x) quando x → +∞ (lado = 1) ou x → -∞ (lado = -1), pela comparação dos graus."""
+        grau_p, grau_q = self.numerador.degree(), self.denominador.degree()
+        if self.numerador.is_zero or grau_p < grau_q:
+            return S.Zero
+
+        razao = self.numerador.LC() / self.denominador.LC()
+        if grau_p == grau_q:
+            return razao
+        return sign(razao) * S(lado) ** (grau_p - grau_q) * S.Infinity
+
+    def limite_em(self, ponto, direcao="+-"):
+        """
+        lim f(x) quando x → ponto (finito), pelo valor de P/Q reduzida.
+        Num polo de multiplicidade m, f ≈ c/(x - ponto)^m: o sinal de c e a paridade de m dão os laterais.
+        Devolve None se não der para decidir se o ponto anula o denominador (ponto irracional complicado).
+        """
+        valor_q = self._valor(self.denominador, ponto)
+        if valor_q.is_zero is None:
+            return None
+        if not valor_q.is_zero:
+            return self._valor(self.numerador, ponto) / valor_q
+
+        # Multiplicidade do polo: ordem da primeira derivada do denominador que não se anula no ponto
+        multiplicidade, derivada = 0, self.denominador
+        while self._valor(derivada, ponto).is_zero:
+            derivada = derivada.diff(self.variavel1)
+            multiplicidade += 1
+        coeficiente = self._valor(self.numerador, ponto) * factorial(multiplicidade) / self._valor(derivada, ponto)
+
+        direita = sign(coeficiente) * S.Infinity
+        esquerda = sign(coeficiente) * S.NegativeOne ** multiplicidade * S.Infinity
+        if direcao == "+":
+            return direita
+        if direcao == "-":
+            return esquerda
+        # Laterais com sinais diferentes: mesmo resultado do limit do Sympy (infinito complexo)
+        return direita if direita == esquerda else S.ComplexInfinity
+
+    def assintota_obliqua(self):
+        """
+        Coeficientes (a, b) de y = ax + b. Se grau(P) = grau(Q) + 1, saem do quociente da divisão P ÷ Q;
+        se grau(P) ≤ grau(Q), a = 0 e b é o limite em +∞; acima disso não existe (a infinito).
+        """
+        grau_p, grau_q = self.numerador.degree(), self.denominador.degree()
+        if self.numerador.is_zero or grau_p <= grau_q:
+            return S.Zero, self.limite_no_infinito(1)
+        if grau_p == grau_q + 1:
+            quociente = self.numerador.quo(self.denominador)
+            return quociente.coeff_monomial(self.variavel1), quociente.coeff_monomial(1)
+        return sign(self.numerador.LC() / self.denominador.LC()) * S.Infinity, S.NaN
+
+
+def _raizes_reais(polinomio):
+    """
+    Raízes reais distintas, em ordem crescente. Exatas quando o roots acha todas
+    (conferido pela contagem de Sturm); senão, isoladas pelo real_roots e aproximadas.
+    """
+    if polinomio.degree() <= 0:
+        return []
+
+    sem_repeticao = polinomio.sqf_part()
+    exatas = list(roots(sem_repeticao, filter='R'))
+    if len(exatas) == sem_repeticao.count_roots():
+        return sorted(exatas, key=float)
+    return [raiz.evalf() for raiz in sem_repeticao.real_roots()]
+
+
+def decompor_funcao_racional(variavel1, expr):
+    """
+    FuncaoRacional de expr, ou None se expr não for um quociente de polinômios
+    de coeficientes racionais em variavel1 (nesse caso vale o caminho geral).
+    """
+    numerador, denominador = fraction(together(expr))
+    try:
+        p = Poly(numerador, variavel1, domain='QQ')
+        q = Poly(denominador, variavel1, domain='QQ')
+    except BasePolynomialError:
+        return None
+
+    # O mdc tem os fatores que cancelam: suas raízes que não são polos viram furos
+    comum = p.gcd(q)
+    p_reduzido, q_reduzido = p.quo(comum), q.quo(comum)
+
+    polos = _raizes_reais(q_reduzido)
+    furos = [r for r in _raizes_reais(comum) if not expand(q_reduzido.as_expr().subs(variavel1, r)).is_zero]
+    return FuncaoRacional(variavel1, p_reduzido, q_reduzido, polos, furos)
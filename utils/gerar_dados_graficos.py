@@ -1,4 +1,5 @@
-
+import math
+from functools import lru_cache
 
 import numpy as np
 # Sympy: Biblioteca de matemática simbólica. Ela resolve equações, limites e derivadas
@@ -8,6 +9,18 @@ from sympy import (
     Poly, degree, solveset, Interval, latex
 )
 
+from utils.avaliador_numerico import avaliar_em_grade
+from utils.reducao_grafico import reduzir_para_pixels
+
+# Pontos da amostragem em alta resolução (grade uniforme, calculada só no servidor)
+PONTOS_ALTA_RESOLUCAO = 2_000_000
+
+# Blocos da amostragem com zoom: no nível 0 cada bloco tem essa largura, e cada nível
+# acima divide a largura por 2. A janela visível sempre cobre de 4 a 8 blocos.
+LARGURA_BLOCO_BASE = 20.0
+BLOCOS_POR_JANELA = 4
+PONTOS_POR_BLOCO = 512
+
 
 def calcular_dados_grafico(variavel1,expr, tendencia):
     """
@@ -21,34 +34,215 @@ def calcular_dados_grafico(variavel1,expr, tendencia):
     else:
         x_min, x_max = -10, 10
 
-    # Cria 2000 pontos entre o mínimo e o máximo para a linha ficar suave
-    x_vals = np.linspace(x_min, x_max, 2000)
-    y_vals = []
-
-    # Calcula o valor de Y para cada ponto X
-    for val in x_vals:
-        try:
-            # Substitui x pelo valor numérico na expressão
-            y = float(expr.subs(variavel1, val))
-
-            # Se o valor for muito grande (assíntota), define como NaN (Not a Number)
-            # Isso faz o gráfico "quebrar" a linha em vez de desenhar um risco vertical feio
-            if abs(y) > 1e3:
-                y_vals.append(np.nan)
-            else:
-                y_vals.append(y)
-        except:
-            # Se der erro matemático (ex: raiz de negativo), salva como NaN
-            y_vals.append(np.nan)
-
-    # Lógica para definir o tamanho automático do eixo Y (zoom vertical)
-    y_validos = [v for v in y_vals if not np.isnan(v)]
-    if y_validos:
-        y_range = max(abs(min(y_validos)), abs(max(y_validos)))
-        # Limita o zoom para não ficar gigante, máximo de 20 ou 1.2x o valor
-        y_lim = min(y_range * 1.2, 20)
-    else:
-        y_lim = 10
+    x_vals, y_vals, y_lim = amostrar_funcao(variavel1, expr, x_min, x_max)
 
     return x_vals, y_vals, x_min, x_max, y_lim
 
+
+# ==========================================
+# AMOSTRAGEM ADAPTATIVA
+# ==========================================
+
+def amostrar_funcao(variavel1, expr, x_min, x_max, pontos_iniciais=201, orcamento=1000):
+    """
+    Amostra a função gastando os pontos onde eles fazem diferença no desenho.
+    Começa com uma grade grossa e vai colocando pontos novos só nos trechos
+    curvos ou com saltos, até acabar o orçamento. Nos polos (onde a função
+    "explode" trocando de sinal) a linha é quebrada com NaN.
+    Retorna (x_vals, y_vals, y_lim).
+    """
+    x_vals = np.linspace(x_min, x_max, pontos_iniciais)
+    y_vals = avaliar_em_grade(variavel1, expr, x_vals)
+
+    # Primeira estimativa da janela vertical: define o que é "visível" no refinamento
+    y_lim = _calcular_y_lim(x_vals, y_vals)
+
+    # Intervalos menores que isso não são mais divididos
+    largura_minima = (x_max - x_min) * 1e-7
+
+    while x_vals.size < orcamento:
+        notas = _notas_de_refinamento(x_vals, y_vals, y_lim, largura_minima)
+        candidatos = np.flatnonzero(notas > 1.0)
+        if candidatos.size == 0:
+            break
+
+        # Divide primeiro os piores intervalos, sem estourar o orçamento
+        vagas = orcamento - x_vals.size
+        if candidatos.size > vagas:
+            candidatos = candidatos[np.argsort(notas[candidatos])[-vagas:]]
+
+        x_novos = (x_vals[candidatos] + x_vals[candidatos + 1]) / 2
+        y_novos = avaliar_em_grade(variavel1, expr, x_novos)
+
+        # Intercala os pontos novos mantendo o vetor ordenado
+        posicoes = candidatos + 1
+        x_vals = np.insert(x_vals, posicoes, x_novos)
+        y_vals = np.insert(y_vals, posicoes, y_novos)
+
+    # A janela vertical final vem dos pontos refinados
+    y_lim = _calcular_y_lim(x_vals, y_vals)
+
+    return _quebrar_descontinuidades(x_vals, y_vals, y_lim, largura_minima)
+
+
+def _calcular_y_lim(x_vals, y_vals):
+    """
+    Define o tamanho automático do eixo Y (zoom vertical).
+    Cada ponto pesa pela largura de x que ele representa, assim os muitos
+    pontos colocados perto de um polo não "puxam" o zoom para valores enormes.
+    """
+    validos = ~np.isnan(y_vals)
+    if not validos.any():
+        return 10
+
+    # Peso de cada ponto = metade da distância até os vizinhos
+    larguras = np.diff(x_vals)
+    pesos = np.zeros_like(x_vals)
+    pesos[:-1] += larguras / 2
+    pesos[1:] += larguras / 2
+
+    modulo = np.abs(y_vals[validos])
+    pesos = pesos[validos]
+    ordem = np.argsort(modulo)
+    acumulado = np.cumsum(pesos[ordem])
+    if acumulado[-1] <= 0:
+        return 10
+
+    # Percentil 95 ponderado de |y|: ignora só a "pontinha" perto das assíntotas
+    y_range = float(modulo[ordem][np.searchsorted(acumulado, 0.95 * acumulado[-1])])
+
+    # Limita o zoom para não ficar gigante, máximo de 20 ou 1.2x o valor
+    y_lim = min(y_range * 1.2, 20)
+    return y_lim if y_lim > 0 else 10
+
+
+def _notas_de_refinamento(x_vals, y_vals, y_lim, largura_minima):
+    """
+    Dá uma nota para cada intervalo [x_i, x_i+1]. Nota acima de 1 significa
+    que vale a pena dividir o intervalo (curva ou salto maiores que ~1 pixel).
+    """
+    # Tolerância vertical: aproximadamente um pixel em um gráfico de 500px de altura
+    tolerancia = 2 * y_lim / 500
+
+    y0, y1 = y_vals[:-1], y_vals[1:]
+    with np.errstate(all="ignore"):
+        # Salto grande entre os extremos do intervalo (mais de 5% da altura visível)
+        notas = np.abs(y1 - y0) / (20 * tolerancia)
+
+        # Curvatura (segunda diferença) distribuída para os dois intervalos vizinhos
+        curvatura = np.abs(y_vals[:-2] - 2 * y_vals[1:-1] + y_vals[2:]) / tolerancia
+        curvatura = np.nan_to_num(curvatura)
+        notas[:-1] = np.fmax(notas[:-1], curvatura)
+        notas[1:] = np.fmax(notas[1:], curvatura)
+
+    # Borda do domínio (um lado existe e o outro não): refina para achar onde começa
+    borda = np.isnan(y0) != np.isnan(y1)
+    notas = np.where(borda, 2.0, np.nan_to_num(notas))
+
+    # Trechos totalmente fora da janela (acima ou abaixo) não aparecem no desenho
+    fora = ((y0 > y_lim) & (y1 > y_lim)) | ((y0 < -y_lim) & (y1 < -y_lim))
+    notas[fora] = 0
+
+    notas[np.diff(x_vals) <= largura_minima] = 0
+    return notas
+
+
+def _quebrar_descontinuidades(x_vals, y_vals, y_lim, largura_minima):
+    """
+    Insere NaN entre dois pontos quando a linha não deve ligá-los:
+    - polos: a função troca de sinal "explodindo" (os dois lados fora da janela);
+    - saltos: a inclinação do intervalo é muito maior que a dos vizinhos
+      (numa função contínua, depois do refinamento, vizinhos têm inclinações parecidas).
+    """
+    y0, y1 = y_vals[:-1], y_vals[1:]
+    larguras = np.diff(x_vals)
+    with np.errstate(all="ignore"):
+        polo = (y0 * y1 < 0) & (np.minimum(np.abs(y0), np.abs(y1)) > y_lim)
+
+        inclinacao = np.nan_to_num(np.abs(y1 - y0) / larguras)
+        vizinhas = np.zeros_like(inclinacao)
+        vizinhas[1:] = inclinacao[:-1]
+        vizinhas[:-1] = np.maximum(vizinhas[:-1], inclinacao[1:])
+        salto = (inclinacao > 10 * vizinhas) & (np.abs(y1 - y0) > 2 * y_lim / 100)
+
+    quebras = np.flatnonzero(polo | salto)
+    if quebras.size:
+        x_meio = (x_vals[quebras] + x_vals[quebras + 1]) / 2
+        x_vals = np.insert(x_vals, quebras + 1, x_meio)
+        y_vals = np.insert(y_vals, quebras + 1, np.nan)
+
+    return x_vals, y_vals, y_lim
+
+
+# ==========================================
+# ALTA RESOLUÇÃO
+# ==========================================
+
+@lru_cache(maxsize=8)
+def amostrar_em_alta_resolucao(variavel1, expr, x_min, x_max, y_lim, pontos=PONTOS_ALTA_RESOLUCAO):
+    """
+    Amostra a função numa grade uniforme enorme (milhões de pontos, vetorizado) e devolve
+    só o que cabe na largura do gráfico (min/máx por coluna de pixel): pega oscilações
+    rápidas que a amostragem adaptativa não vê, sem aumentar o que vai para o navegador.
+    Retorna (x_vals, y_vals), ou None se a função não puder ser avaliada de forma vetorizada.
+    """
+    x_vals = np.linspace(x_min, x_max, pontos)
+    y_vals = avaliar_em_grade(variavel1, expr, x_vals, ponto_a_ponto=False)
+    if y_vals is None:
+        return None
+
+    x_vals, y_vals, _ = _quebrar_descontinuidades(x_vals, y_vals, y_lim, (x_max - x_min) * 1e-7)
+    return reduzir_para_pixels(x_vals, y_vals, x_min, x_max)
+
+
+# ==========================================
+# AMOSTRAGEM POR BLOCOS (ZOOM E ARRASTE)
+# ==========================================
+# Com zoom, a janela visível é reamostrada. O eixo x é dividido em blocos fixos por nível
+# de zoom (bloco i do nível n = [i·L, (i+1)·L], com L = 20 / 2ⁿ), e cada bloco é avaliado
+# uma vez só por expressão: arrastar o gráfico para os lados e voltar reaproveita os blocos.
+
+def nivel_da_janela(x_min, x_max):
+    """Nível de zoom em que a janela [x_min, x_max] cobre pelo menos BLOCOS_POR_JANELA blocos."""
+    return math.ceil(math.log2(BLOCOS_POR_JANELA * LARGURA_BLOCO_BASE / (x_max - x_min)))
+
+
+@lru_cache(maxsize=512)
+def amostrar_bloco(variavel1, expr, nivel, indice, pontos=PONTOS_POR_BLOCO):
+    """
+    Grade uniforme do bloco 'indice' no nível 'nivel' e os valores de f nela (x_vals, y_vals).
+    Os vetores ficam no cache: quem usa não deve alterá-los.
+    Com mais pontos que o normal (alta resolução), só a avaliação vetorizada é usada.
+    """
+    largura = LARGURA_BLOCO_BASE / 2 ** nivel
+    x_vals = np.linspace(indice * largura, (indice + 1) * largura, pontos)
+    y_vals = avaliar_em_grade(variavel1, expr, x_vals, ponto_a_ponto=pontos <= PONTOS_POR_BLOCO)
+    if y_vals is None:
+        return amostrar_bloco(variavel1, expr, nivel, indice, PONTOS_POR_BLOCO)
+    return x_vals, y_vals
+
+
+def amostrar_janela(variavel1, expr, x_min, x_max, y_lim, pontos=PONTOS_POR_BLOCO):
+    """
+    Amostra a janela visível juntando os blocos (do cache) que a cobrem, quebra a linha
+    nos polos e saltos e reduz para a largura em pixels. Retorna (x_vals, y_vals).
+    """
+    nivel = nivel_da_janela(x_min, x_max)
+    largura = LARGURA_BLOCO_BASE / 2 ** nivel
+    indices = range(math.floor(x_min / largura), math.ceil(x_max / largura))
+    blocos = [amostrar_bloco(variavel1, expr, nivel, i, pontos) for i in indices]
+
+    x_vals = np.concatenate([x for x, _ in blocos])
+    y_vals = np.concatenate([y for _, y in blocos])
+
+    # Blocos vizinhos repetem o ponto da divisa
+    unicos = np.r_[True, np.diff(x_vals) > 0]
+    x_vals, y_vals = x_vals[unicos], y_vals[unicos]
+
+    # Só a janela (e um ponto além de cada borda, para a linha chegar até a borda)
+    inicio = max(np.searchsorted(x_vals, x_min) - 1, 0)
+    fim = np.searchsorted(x_vals, x_max, side="right") + 1
+    x_vals, y_vals = x_vals[inicio:fim], y_vals[inicio:fim]
+
+    x_vals, y_vals, _ = _quebrar_descontinuidades(x_vals, y_vals, y_lim, (x_max - x_min) * 1e-7)
+    return reduzir_para_pixels(x_vals, y_vals, x_min, x_max)
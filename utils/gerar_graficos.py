@@ -10,27 +10,60 @@ from sympy import (
     Poly, degree, solveset, Interval, latex
 )
 
+from utils.avaliador_numerico import avaliar_em_grade, substituicao_exata_viavel
+from utils.contexto_analise import obter_analise
+from utils.execucao_limitada import TempoEsgotado, MENSAGEM_TEMPO_ESGOTADO, obter_resultado
+from utils.gerar_dados_graficos import PONTOS_POR_BLOCO, amostrar_em_alta_resolucao, amostrar_janela
+from utils.reducao_grafico import traco_de_linha
+
 # ==========================================
 # 4. CRIAÇÃO DOS GRÁFICOS
 # ==========================================
+# Marca (meta) dos traços de detalhe: o ponto analisado e a visualização do limite.
+# O modo "apenas a função" só esconde esses traços, sem recalcular nada.
+DETALHE = "detalhe"
+
+# Marca do traço da própria função (trocado pela versão em alta resolução, se pedida)
+FUNCAO = "funcao"
+
+
+def _traco_da_funcao(x_vals, y_vals, x_min, x_max):
+    """Linha azul da função, já reduzida e compactada para o envio ao navegador."""
+    return traco_de_linha(
+        x_vals, y_vals, x_min, x_max, mode='lines', name='f(x)',
+        line=dict(width=3, color='#3388ff'), meta=FUNCAO
+    )
+
+
 
-def criar_figura_base(variavel1,x_vals, y_vals, tendencia, expr, modo_simples):
+def _valor_no_ponto(variavel1, expr, ponto):
+    """
+    f(ponto) em ponto flutuante, para a bolinha do ponto analisado. É numérico (vetorizado):
+    a substituição exata pode travar a página (ex: x^x^x em x = 100). Só se o Numpy não
+    entende a função é que substitui, e mesmo assim apenas quando a conta exata é segura.
+    """
+    y = avaliar_em_grade(variavel1, expr, [float(ponto)], ponto_a_ponto=False)
+    if y is not None:
+        return float(y[0])
+    if not substituicao_exata_viavel(variavel1, expr, ponto):
+        raise ValueError("Valor grande demais para a conta exata.")
+    return float(expr.subs(variavel1, ponto))
+
+
+def criar_figura_base(variavel1,x_vals, y_vals, tendencia, expr):
     """Cria o objeto do gráfico (Figure) e desenha a linha azul da função."""
     fig = go.Figure()
 
     # Adiciona a linha principal da função (azul)
-    fig.add_trace(go.Scatter(
-        x=x_vals, y=y_vals, mode='lines', name='f(x)',
-        line=dict(width=3, color='#3388ff')
-    ))
+    fig.add_trace(_traco_da_funcao(x_vals, y_vals, x_vals[0], x_vals[-1]))
 
-    # Se não estiver no modo simples, desenha uma bolinha vermelha no ponto escolhido
-    if not modo_simples and tendencia not in [S.Infinity, -S.Infinity]:
+    # Desenha uma bolinha vermelha no ponto escolhido (detalhe)
+    if tendencia not in [S.Infinity, -S.Infinity]:
         try:
-            y_tend = float(expr.subs(variavel1, tendencia))
+            y_tend = _valor_no_ponto(variavel1, expr, tendencia)
             fig.add_trace(go.Scatter(
-                x=[tendencia], y=[y_tend], mode='markers', name='Ponto analisado',
-                marker=dict(size=10, color='red')
+                x=[float(tendencia)], y=[y_tend], mode='markers', name='Ponto analisado',
+                marker=dict(size=10, color='red'), meta=DETALHE
             ))
         except:
             pass  # Se o ponto não existir, apenas ignora
@@ -66,12 +99,12 @@ def configurar_layout_grafico(fig, theme, x_min, x_max, y_lim):
     )
 
 
-def adicionar_visualizacao_limite(variavel1, fig, expr, tendencia, x_min, x_max, y_lim, modo_simples):
-    """Desenha as linhas pontilhadas laranjas que mostram o limite visualmente."""
-    if not modo_simples and tendencia not in [S.Infinity, -S.Infinity]:
+def adicionar_visualizacao_limite(variavel1, fig, expr, tendencia, x_min, x_max, y_lim, calculo=None):
+    """Desenha as linhas pontilhadas laranjas que mostram o limite visualmente (traços de detalhe)."""
+    if tendencia not in [S.Infinity, -S.Infinity]:
         try:
             # Calcula o limite exato usando Sympy
-            lim_val = limit(expr, variavel1, tendencia)
+            lim_val = obter_resultado(calculo, obter_analise(variavel1, expr).limite_em, tendencia)
 
             # Só desenha se o limite for um número real (não infinito ou complexo)
             if lim_val.is_real:
@@ -79,23 +112,23 @@ def adicionar_visualizacao_limite(variavel1, fig, expr, tendencia, x_min, x_max,
                 # Linha horizontal laranja
                 fig.add_trace(go.Scatter(
                     x=[x_min, x_max], y=[lim_float, lim_float], mode="lines",
-                    name=f"Valor do limite: {lim_val}", line=dict(color="orange", width=3)
+                    name=f"Valor do limite: {lim_val}", line=dict(color="orange", width=3), meta=DETALHE
                 ))
                 # Linha vertical pontilhada
                 fig.add_trace(go.Scatter(
                     x=[float(tendencia), float(tendencia)], y=[-y_lim, y_lim], mode="lines",
-                    name=f"x → {tendencia}", line=dict(color="orange", width=2, dash="dot")
+                    name=f"x → {tendencia}", line=dict(color="orange", width=2, dash="dot"), meta=DETALHE
                 ))
                 # Ponto diamante laranja no encontro das linhas
                 fig.add_trace(go.Scatter(
                     x=[float(tendencia)], y=[lim_float], mode='markers',
-                    name='Valor do Limite', marker=dict(size=12, color='orange', symbol='diamond')
+                    name='Valor do Limite', marker=dict(size=12, color='orange', symbol='diamond'), meta=DETALHE
                 ))
         except:
             pass
 
 def inicializar_grafico(expr, col_esq):
-    """Mostra a função escrita bonitinha (LaTeX) e opções de visualização."""
+    """Mostra a função escrita bonitinha (LaTeX) e o título do gráfico."""
     with col_esq:
         try:
             # Converte a função para formato LaTeX (matemática bonita)
@@ -105,22 +138,151 @@ def inicializar_grafico(expr, col_esq):
             st.write("Não foi possível converter a função para LaTeX.")
 
         st.subheader("Gráfico da Função")
-        # Checkbox para o usuário limpar o gráfico se quiser
-        modo_simples = st.checkbox("Exibir apenas a função (sem detalhes)")
 
-    return modo_simples
+
+# ------------------------------------------
+# Janela visível (zoom e arraste)
+# ------------------------------------------
+# O Streamlit não avisa o servidor quando o Plotly dá zoom; então o zoom é pela seleção
+# em caixa (arrastar o mouse sobre o gráfico) e os botões ao lado movem/afastam a janela.
+# A janela fica no session_state junto com a expressão e a janela original: se qualquer
+# um dos dois mudar, volta para a janela padrão.
+CHAVE_JANELA = "janela_grafico"
+CHAVE_GRAFICO = "grafico_funcao"
+
+
+def _janela_atual(expr, x_min, x_max):
+    """(x0, x1, y0, y1) da janela com zoom, ou None se o gráfico está na janela padrão."""
+    salva = st.session_state.get(CHAVE_JANELA)
+    if salva is None or salva["origem"] != (expr, x_min, x_max):
+        return None
+    return salva["janela"]
+
+
+def _guardar_janela(origem, x0, x1, y0, y1):
+    """Guarda a nova janela (ignora janelas degeneradas, ex: um clique sem arrastar)."""
+    if x1 > x0 and y1 > y0:
+        st.session_state[CHAVE_JANELA] = {"origem": origem, "janela": (x0, x1, y0, y1)}
+
+
+def _ao_selecionar(origem):
+    """Seleção em caixa no gráfico: a caixa vira a nova janela (zoom)."""
+    caixas = st.session_state[CHAVE_GRAFICO].selection.box
+    if caixas:
+        x0, x1 = sorted(caixas[0]["x"])
+        y0, y1 = sorted(caixas[0]["y"])
+        _guardar_janela(origem, x0, x1, y0, y1)
+
+
+def _mover_janela(origem, janela, deslocamento, fator):
+    """Arrasta a janela (deslocamento em larguras) e/ou afasta o zoom (fator > 1) em volta do centro."""
+    x0, x1, y0, y1 = janela
+    largura, altura = (x1 - x0) * fator, (y1 - y0) * fator
+    centro_x = (x0 + x1) / 2 + deslocamento * (x1 - x0)
+    centro_y = (y0 + y1) / 2
+    _guardar_janela(origem, centro_x - largura / 2, centro_x + largura / 2,
+                    centro_y - altura / 2, centro_y + altura / 2)
+
+
+def _restaurar_janela():
+    """Volta para a janela padrão do gráfico."""
+    st.session_state.pop(CHAVE_JANELA, None)
+
+
+def _reta_na_janela(traco, x0, x1, y0, y1):
+    """
+    Retas de dois pontos (assíntotas e linhas do limite) esticadas até as bordas da janela.
+    Devolve uma cópia: os traços da figura original não mudam.
+    """
+    if traco.mode != "lines" or traco.x is None or len(traco.x) != 2:
+        return traco
+    (xa, xb), (ya, yb) = traco.x, traco.y
+    if xa == xb:
+        return type(traco)(traco, y=[y0, y1])
+    inclinacao = (yb - ya) / (xb - xa)
+    return type(traco)(traco, x=[x0, x1], y=[ya + inclinacao * (x0 - xa), ya + inclinacao * (x1 - xa)])
+
+
+@st.fragment
+def exibir_grafico(variavel1, expr, fig, theme, x_min, x_max, y_lim):
+    """
+    Desenha a figura já montada. É um fragmento: marcar "Exibir apenas a função" ou
+    "Alta resolução", dar zoom ou arrastar roda só este trecho (troca os traços e
+    reaplica o layout), sem refazer as análises.
+    """
+    # Checkbox para o usuário limpar o gráfico se quiser
+    modo_simples = st.checkbox("Exibir apenas a função (sem detalhes)")
+    alta_resolucao = st.checkbox(
+        "Alta resolução", help="Amostra milhões de pontos no servidor (envia só o que cabe na tela)."
+    )
+
+    tracos = list(fig.data)
+    if modo_simples:
+        tracos = [traco for traco in tracos if traco.meta != DETALHE]
+
+    origem = (expr, x_min, x_max)
+    janela = _janela_atual(*origem)
+    if janela is not None:
+        # Com zoom: reamostra só a janela visível, a partir dos blocos guardados da expressão
+        x0, x1, y0, y1 = janela
+        pontos = PONTOS_POR_BLOCO * (16 if alta_resolucao else 1)
+        amostra = amostrar_janela(variavel1, expr, x0, x1, max(abs(y0), abs(y1)), pontos)
+        tracos = [_traco_da_funcao(*amostra, x0, x1)] + \
+                 [_reta_na_janela(t, x0, x1, y0, y1) for t in tracos if t.meta != FUNCAO]
+    elif alta_resolucao:
+        amostra = amostrar_em_alta_resolucao(variavel1, expr, x_min, x_max, y_lim)
+        if amostra is None:
+            st.caption("Essa função não pode ser avaliada em alta resolução; mostrando a amostragem normal.")
+        else:
+            tracos = [_traco_da_funcao(*amostra, x_min, x_max)] + [t for t in tracos if t.meta != FUNCAO]
+
+    # Figura nova: a original continua inteira para as próximas execuções do fragmento
+    figura = go.Figure(data=tracos, layout=fig.layout)
+
+    # Aplica o layout (agora com os limites dos eixos corretos) e desenha o gráfico na tela
+    configurar_layout_grafico(figura, theme, x_min, x_max, y_lim)
+    if janela is not None:
+        figura.update_layout(xaxis_range=[x0, x1], yaxis_range=[y0, y1])
+    # Arrastar o mouse seleciona uma caixa, que vira o novo zoom (reamostrado)
+    figura.update_layout(dragmode="select")
+    st.plotly_chart(
+        figura, use_container_width=True, key=CHAVE_GRAFICO,
+        on_select=lambda: _ao_selecionar(origem), selection_mode="box"
+    )
+
+    # Botões da janela (a janela padrão vira ponto de partida quando ainda não há zoom)
+    atual = janela if janela is not None else (x_min, x_max, -y_lim, y_lim)
+    st.caption("Zoom: arraste o mouse sobre o gráfico para selecionar a região.")
+    col_esq, col_dir, col_afastar, col_restaurar = st.columns(4)
+    col_esq.button("◀", use_container_width=True, on_click=_mover_janela, args=(origem, atual, -0.5, 1))
+    col_dir.button("▶", use_container_width=True, on_click=_mover_janela, args=(origem, atual, 0.5, 1))
+    col_afastar.button("➖ Afastar", use_container_width=True, on_click=_mover_janela, args=(origem, atual, 0, 2))
+    col_restaurar.button("↺ Original", use_container_width=True, on_click=_restaurar_janela,
+                         disabled=janela is None)
 
 # ==========================================
 # 5. ANÁLISE MATEMÁTICA (ASSÍNTOTAS)
 # ==========================================
 
 
-def analisar_assintotas_verticais(variavel1,expr, fig, y_lim):
-    """Procura onde o denominador é zero (divisão por zero) para achar assíntotas verticais."""
+def calcular_assintotas_verticais(variavel1, expr):
+    """Parte matemática (sem interface): pontos onde o denominador é zero e a função vai ao infinito."""
+    return obter_analise(variavel1, expr).polos  # Resolve denominador = 0 (sem os furos)
+
+
+def calcular_descontinuidades_removiveis(variavel1, expr):
+    """Parte matemática (sem interface): furos, onde o denominador zera mas o limite é finito."""
+    return obter_analise(variavel1, expr).furos
+
+
+def analisar_assintotas_verticais(variavel1,expr, fig, y_lim, calculo=None):
+    """
+    Procura onde o denominador é zero (divisão por zero) para achar assíntotas verticais.
+    'calculo' é o resultado agendado em paralelo (se não vier, calcula aqui mesmo).
+    """
     st.write("### Assíntotas Verticais")
     try:
-        d = denom(expr)  # Pega o denominador da função
-        verticais = solve(d, variavel1)  # Resolve denominador = 0
+        verticais = obter_resultado(calculo, calcular_assintotas_verticais, variavel1, expr)
         if verticais:
             for v in verticais:
                 st.write(f"x = {v}")
@@ -131,17 +293,28 @@ def analisar_assintotas_verticais(variavel1,expr, fig, y_lim):
                 ))
         else:
             st.write("Nenhuma assíntota vertical detectada.")
+
+        # Furos: o denominador zera, mas o fator se cancela (ex: (4 - x²)/(2 + x) em x = -2)
+        for furo in calcular_descontinuidades_removiveis(variavel1, expr):
+            st.caption(f"x = {furo} é um furo (descontinuidade removível), não uma assíntota.")
+    except TempoEsgotado:
+        st.warning(MENSAGEM_TEMPO_ESGOTADO)
     except:
         st.write("Erro ao calcular assíntotas verticais.")
 
 
 
-def analisar_assintotas_horizontais(variavel1,expr, fig, x_min, x_max):
+def calcular_assintotas_horizontais(variavel1, expr):
+    """Parte matemática (sem interface): limites em +infinito e -infinito."""
+    analise = obter_analise(variavel1, expr)
+    return analise.limite_mais_infinito, analise.limite_menos_infinito
+
+
+def analisar_assintotas_horizontais(variavel1,expr, fig, x_min, x_max, calculo=None):
     """Calcula o limite no infinito para ver se a função se estabiliza horizontalmente."""
     st.write("### Assíntotas Horizontais")
     try:
-        lim_inf = limit(expr, variavel1, S.Infinity)  # Limite em +infinito
-        lim_minf = limit(expr, variavel1, -S.Infinity)  # Limite em -infinito
+        lim_inf, lim_minf = obter_resultado(calculo, calcular_assintotas_horizontais, variavel1, expr)
 
         found = False
         # Se limite em +infinito for um número real
@@ -165,32 +338,59 @@ def analisar_assintotas_horizontais(variavel1,expr, fig, x_min, x_max):
 
         if not found:
             st.write("Nenhuma assíntota horizontal detectada.")
+    except TempoEsgotado:
+        st.warning(MENSAGEM_TEMPO_ESGOTADO)
     except:
         st.write("Erro ao calcular assíntotas horizontais.")
 
 
-def analisar_assintotas_obliquas(variavel1,expr, fig, x_vals):
+def calcular_assintota_obliqua(variavel1, expr):
     """
-    Verifica se existe assíntota inclinada (oblíqua).
-    Fórmula: y = ax + b, onde a = lim f(x)/x e b = lim (f(x) - ax)
+    Parte matemática (sem interface) da assíntota oblíqua y = ax + b.
+    Fórmula: a = lim f(x)/x e b = lim (f(x) - ax)
     """
+    return obter_analise(variavel1, expr).assintota_obliqua
+
+
+def analisar_assintotas_obliquas(variavel1,expr, fig, x_vals, calculo=None):
+    """Verifica se existe assíntota inclinada (oblíqua) e desenha a reta."""
     st.write("### Assíntotas Oblíquas")
     try:
-        a = limit(expr / variavel1, variavel1, S.Infinity)
-        b = limit(expr - a * variavel1, variavel1, S.Infinity)
+        a, b = obter_resultado(calculo, calcular_assintota_obliqua, variavel1, expr)
 
         # Se 'a' e 'b' forem reais e 'a' não for zero (senão seria horizontal)
         if a.is_real and b.is_real and a != 0:
             st.write(f"y = {a}x + {b}")
-            # Calcula os pontos Y da reta oblíqua para desenhar
-            y_obl = [float(a * v + b) for v in x_vals]
+            # Reta: os dois pontos das pontas da janela bastam para desenhar
+            x_pontas = x_vals[[0, -1]]
+            y_obl = avaliar_em_grade(variavel1, a * variavel1 + b, x_pontas)
             fig.add_trace(go.Scatter(
-                x=x_vals, y=y_obl, mode='lines',
+                x=x_pontas, y=y_obl, mode='lines',
                 line=dict(dash='dash', color='magenta'), name=f"Assíntota: y={a}x+{b}"
             ))
         else:
             st.write("Nenhuma assíntota oblíqua detectada.")
+    except TempoEsgotado:
+        st.warning(MENSAGEM_TEMPO_ESGOTADO)
     except:
         st.write("Nenhuma assíntota oblíqua detectada.")
 
 
+
+
+def adicionar_marcadores_raizes(fig, raizes, x_min, x_max):
+    """Marca no eixo X as raízes reais que caem dentro da janela do gráfico."""
+    x_raizes = []
+    for r in raizes:
+        try:
+            valor = float(r)
+        except (TypeError, ValueError):
+            continue
+        if x_min <= valor <= x_max:
+            x_raizes.append(valor)
+
+    if x_raizes:
+        fig.add_trace(go.Scatter(
+            x=x_raizes, y=[0] * len(x_raizes), mode='markers', name='Raízes',
+            marker=dict(size=9, color='#22bb55', symbol='circle', line=dict(width=1, color='white'))
+        ))
@@ -0,0 +1,101 @@
+import numpy as np
+
+from utils.avaliador_numerico import avaliar_em_grade
+
+
+# ==========================================
+# QUADRATURA ADAPTATIVA VETORIZADA (GAUSS-KRONROD 7-15)
+# ==========================================
+# Em cada rodada, TODOS os subintervalos ainda não aceitos são avaliados de uma vez só
+# (uma chamada do avaliador compilado com 15 pontos por subintervalo). A diferença entre
+# a regra de Kronrod (15 pontos) e a de Gauss (7 pontos) estima o erro de cada pedaço;
+# os pedaços com erro alto são divididos ao meio e voltam para a próxima rodada.
+
+# Nós de Kronrod em [-1, 1] (só a metade não negativa; a outra metade é simétrica)
+_NOS_KRONROD = np.array([
+    0.991455371120812639206854697526329,
+    0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926,
+    0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013,
+    0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245,
+    0.000000000000000000000000000000000,
+])
+_PESOS_KRONROD = np.array([
+    0.022935322010529224963732008058970,
+    0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518,
+    0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550,
+    0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649,
+    0.209482141084727828012999174891714,
+])
+# Pesos de Gauss (7 pontos), que usam os nós de índice ímpar de Kronrod
+_PESOS_GAUSS = np.array([
+    0.129484966168869693270611432679082,
+    0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975,
+    0.417959183673469387755102040816327,
+])
+
+# Os 15 nós completos (negativos, zero, positivos) e os pesos correspondentes
+_NOS = np.concatenate([-_NOS_KRONROD[:-1], _NOS_KRONROD[::-1]])
+_PESOS_K = np.concatenate([_PESOS_KRONROD[:-1], _PESOS_KRONROD[::-1]])
+_PESOS_G = np.zeros(15)
+_PESOS_G[[1, 3, 5, 7, 9, 11, 13]] = np.concatenate([_PESOS_GAUSS[:-1], _PESOS_GAUSS[::-1]])
+
+
+def _regra_gauss_kronrod(variavel1, expr, inicios, fins):
+    """Integral (Kronrod) e erro estimado de cada subintervalo, todos de uma vez."""
+    centros = (inicios + fins) / 2
+    meias_larguras = (fins - inicios) / 2
+
+    # Matriz (subintervalos × 15 nós), avaliada em uma única chamada vetorizada
+    x_vals = centros[:, None] + meias_larguras[:, None] * _NOS[None, :]
+    y_vals = avaliar_em_grade(variavel1, expr, x_vals.ravel()).reshape(x_vals.shape)
+
+    kronrod = meias_larguras * (y_vals @ _PESOS_K)
+    gauss = meias_larguras * (y_vals @ _PESOS_G)
+    return kronrod, np.abs(kronrod - gauss)
+
+
+def integrar_numericamente(variavel1, expr, a, b, tolerancia=1e-10, maximo_subintervalos=5000):
+    """
+    Integral definida de expr entre a e b (números finitos) por Gauss-Kronrod adaptativo.
+    Retorna (valor, erro_estimado).
+    Lança ValueError se a função não existir (NaN) em algum ponto usado no intervalo.
+    """
+    if a == b:
+        return 0.0, 0.0
+    if a > b:
+        valor, erro = integrar_numericamente(variavel1, expr, b, a, tolerancia, maximo_subintervalos)
+        return -valor, erro
+
+    largura_total = b - a
+    inicios = np.linspace(a, b, 9)[:-1]
+    fins = np.linspace(a, b, 9)[1:]
+
+    valor, erro = 0.0, 0.0
+    while inicios.size:
+        integrais, erros = _regra_gauss_kronrod(variavel1, expr, inicios, fins)
+        if not np.all(np.isfinite(integrais)):
+            raise ValueError("A função não está definida (ou é infinita) em parte do intervalo.")
+
+        # Cada pedaço tem direito a uma fatia da tolerância proporcional à sua largura
+        larguras = fins - inicios
+        permitido = np.maximum(tolerancia, 1e-12 * abs(valor + integrais.sum())) * larguras / largura_total
+        aceitos = (erros <= permitido) | (larguras < largura_total * 1e-12)
+
+        # Sem espaço para dividir mais: aceita tudo o que falta
+        if 2 * np.count_nonzero(~aceitos) + inicios.size > maximo_subintervalos:
+            aceitos[:] = True
+
+        valor += integrais[aceitos].sum()
+        erro += erros[aceitos].sum()
+
+        meios = (inicios[~aceitos] + fins[~aceitos]) / 2
+        inicios, fins = np.concatenate([inicios[~aceitos], meios]), np.concatenate([meios, fins[~aceitos]])
+
+    return float(valor), float(erro)
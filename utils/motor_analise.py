@@ -0,0 +1,132 @@
+import time
+
+# Sympy: Biblioteca de matemática simbólica. Ela resolve equações, limites e derivadas
+# da mesma forma que um humano faria no papel (algebricamente), e não apenas aproximando números.
+from sympy import symbols, S, sstr, latex
+
+from utils.calcular_e_exibir_integral import calcular_integral, gerar_passos_integral
+from utils.calculos import calcular_analise_local, calcular_limite_no_ponto, separar_raizes
+from utils.derivadas import calcular_derivada, gerar_passos_latex
+from utils.execucao_limitada import TempoEsgotado
+from utils.gerar_graficos import calcular_assintotas_verticais, calcular_assintotas_horizontais, \
+    calcular_assintota_obliqua
+from utils.normalizadores import interpretar_expressao
+from utils.operacoes_simbolicas import substituir_no_ponto
+
+
+# ==========================================
+# MOTOR DE ANÁLISE SEM INTERFACE
+# ==========================================
+# Faz as mesmas contas das páginas (limite, assíntotas, raízes, derivada e integral),
+# mas devolve só dados simples (dicionários, listas e textos), sem nenhum st.*.
+# É usado pela análise em lote (analise_em_lote.py).
+
+def _texto(valor):
+    """Converte um resultado do Sympy em texto simples."""
+    return sstr(valor)
+
+
+def _secao_assintotas_verticais(variavel1, expr, tendencia):
+    return [_texto(v) for v in calcular_assintotas_verticais(variavel1, expr)]
+
+
+def _secao_assintotas_horizontais(variavel1, expr, tendencia):
+    lim_inf, lim_minf = calcular_assintotas_horizontais(variavel1, expr)
+    return {
+        "mais_infinito": _texto(lim_inf) if lim_inf.is_real else None,
+        "menos_infinito": _texto(lim_minf) if lim_minf.is_real else None,
+    }
+
+
+def _secao_assintota_obliqua(variavel1, expr, tendencia):
+    a, b = calcular_assintota_obliqua(variavel1, expr)
+    # Mesma regra da página: 'a' e 'b' reais e 'a' diferente de zero
+    if a.is_real and b.is_real and a != 0:
+        return {"a": _texto(a), "b": _texto(b)}
+    return None
+
+
+def _secao_limite(variavel1, expr, tendencia):
+    # Pontos finitos: limites laterais e classificação (análise local)
+    local = calcular_analise_local(variavel1, expr, tendencia)
+
+    # Limites laterais diferentes: o limite bilateral não existe (valor None)
+    if local is not None and local.limite is None:
+        secao = {"ponto": _texto(tendencia), "valor": None,
+                 "indeterminacao": substituir_no_ponto(expr, variavel1, tendencia) in [S.NaN, S.ComplexInfinity]}
+    else:
+        resultado, substituicao = calcular_limite_no_ponto(variavel1, expr, tendencia)
+        secao = {
+            "ponto": _texto(tendencia),
+            "valor": _texto(resultado),
+            "indeterminacao": substituicao in [S.NaN, S.ComplexInfinity],
+        }
+
+    if local is not None:
+        secao["esquerda"] = _texto(local.limite_esquerda) if local.limite_esquerda is not None else None
+        secao["direita"] = _texto(local.limite_direita) if local.limite_direita is not None else None
+        secao["classificacao"] = local.classificacao
+    return secao
+
+
+def _secao_raizes(variavel1, expr, tendencia):
+    reais, complexas = separar_raizes(variavel1, expr)
+    return {"reais": [_texto(r) for r in reais], "complexas": [_texto(c) for c in complexas]}
+
+
+def _secao_derivada(variavel1, expr, tendencia):
+    _, resultado, passos = calcular_derivada(variavel1, expr)
+    return {"resultado": _texto(resultado), "latex": latex(resultado), "passos": list(gerar_passos_latex(passos))}
+
+
+def _secao_integral(variavel1, expr, tendencia):
+    resultado, regra = calcular_integral(variavel1, expr)
+    passos = list(gerar_passos_latex(gerar_passos_integral(regra))) if regra is not None else []
+    return {"resultado": _texto(resultado), "latex": latex(resultado), "passos": passos}
+
+
+SECOES = {
+    "assintotas_verticais": _secao_assintotas_verticais,
+    "assintotas_horizontais": _secao_assintotas_horizontais,
+    "assintota_obliqua": _secao_assintota_obliqua,
+    "limite": _secao_limite,
+    "raizes": _secao_raizes,
+    "derivada": _secao_derivada,
+    "integral": _secao_integral,
+}
+
+
+def analisar_expressao(expr_input, tendencia=0, secoes=None):
+    """
+    Analisa o texto de uma função e devolve um dicionário só com dados simples.
+    Cada seção tem seu próprio tempo (em segundos) e, se falhar, sua mensagem de erro,
+    sem impedir as outras seções.
+    """
+    variavel1 = symbols('x')
+    tendencia = S(tendencia)
+
+    relatorio = {"entrada": expr_input, "tendencia": _texto(tendencia), "resultados": {}, "erros": {}, "tempos": {}}
+
+    inicio = time.perf_counter()
+    try:
+        expr = interpretar_expressao(variavel1, expr_input)
+    except Exception as erro:
+        relatorio["erros"]["interpretacao"] = f"Expressão inválida: {erro}"
+        return relatorio
+    finally:
+        relatorio["tempos"]["interpretacao"] = time.perf_counter() - inicio
+
+    relatorio["expressao"] = _texto(expr)
+    relatorio["latex"] = latex(expr)
+
+    for nome in secoes or SECOES:
+        inicio = time.perf_counter()
+        try:
+            relatorio["resultados"][nome] = SECOES[nome](variavel1, expr, tendencia)
+        except TempoEsgotado:
+            relatorio["erros"][nome] = "tempo_esgotado"
+        except Exception as erro:
+            relatorio["erros"][nome] = f"{type(erro).__name__}: {erro}"
+        relatorio["tempos"][nome] = time.perf_counter() - inicio
+
+    return relatorio
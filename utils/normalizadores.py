@@ -1,3 +1,8 @@
+import hashlib
+import io
+import tokenize
+from functools import lru_cache
+
 # Ferramentas do Sympy para ler o texto que o usuário digita e transformar em matemática
 from sympy.parsing.sympy_parser import (
     parse_expr,
@@ -12,35 +17,103 @@ import streamlit as st
 # da mesma forma que um humano faria no papel (algebricamente), e não apenas aproximando números.
 from sympy import (
     symbols, sympify, limit, S, solve, denom, numer,
-    Poly, degree, solveset, Interval, latex,ConditionSet, ImageSet, Union, FiniteSet
+    Poly, degree, solveset, Interval, latex,ConditionSet, ImageSet, Union, FiniteSet, srepr
 )
 
 
-def interpretar_expressao(variavel1,expr_input):
+# Pedaços em português trocados dentro de qualquer nome (como sempre foi): assim
+# "sen", "senh", "asen" e "arcsen" viram "sin", "sinh", "asin" e "arcsin"
+TRECHOS_EM_PORTUGUES = (
+    ("sen", "sin"),
+    ("raiz", "sqrt"),
+)
+
+# Nomes inteiros (já com os trechos trocados) -> nome que o Sympy entende
+NOMES_EM_PORTUGUES = {
+    "tg": "tan",
+    "tgh": "tanh",
+    "cotg": "cot",
+    "cossec": "csc",
+    "atg": "atan",
+    "arctg": "atan",
+    "arcsin": "asin",
+    "arccos": "acos",
+    "arctan": "atan",
+    "arcsinh": "asinh",
+    "arccosh": "acosh",
+    "arctanh": "atanh",
+    "arctgh": "atanh",
+}
+
+# Regras de transformação (ex: entender que 2x é 2*x)
+TRANSFORMACOES = standard_transformations + (
+    implicit_multiplication_application,
+    convert_xor
+)
+
+
+def traduzir_nome(nome):
+    """Nome digitado (ex: "sen", "arcsen", "tg") -> nome que o Sympy entende ("sin", "asin", "tan")."""
+    for trecho, traducao in TRECHOS_EM_PORTUGUES:
+        nome = nome.replace(trecho, traducao)
+    return NOMES_EM_PORTUGUES.get(nome, nome)
+
+
+def canonicalizar_entrada(expr_input):
     """
-    Transforma o texto digitado (string) em uma expressão matemática do Sympy.
+    Reescreve o texto digitado em uma forma padrão, peça por peça (token a token):
+    minúsculas, nomes em português traduzidos, '^' virando '**' e espaços padronizados.
+    Assim 'x^2', 'x**2' e ' X^2 ' viram exatamente o mesmo texto.
     """
-    # Limpa espaços e coloca em minúsculas
     entrada = expr_input.strip().lower()
 
-    # Substitui nomes em português para inglês (o Python entende inglês)
-    entrada = entrada.replace("sen", "sin")
-    entrada = entrada.replace("raiz", "sqrt")
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(entrada).readline))
+    except (tokenize.TokenError, SyntaxError):
+        # Texto incompleto (ex: "x + ("): devolve como está e o parse_expr acusa o erro
+        return entrada
+
+    partes = []
+    for token in tokens:
+        if token.type in (tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER):
+            continue
+        if token.type == tokenize.NAME:
+            partes.append(traduzir_nome(token.string))
+        elif token.type == tokenize.OP and token.string == "^":
+            partes.append("**")
+        else:
+            partes.append(token.string)
+
+    return " ".join(partes)
+
+
+def interpretar_expressao(variavel1,expr_input):
+    """
+    Transforma o texto digitado (string) em uma expressão matemática do Sympy.
+    Entradas equivalentes compartilham o mesmo resultado já interpretado.
+    """
+    return _interpretar_canonica(variavel1, canonicalizar_entrada(expr_input))
 
-    # Define regras de transformação (ex: entender que 2x é 2*x)
-    transformations = standard_transformations + (
-        implicit_multiplication_application,
-        convert_xor
-    )
 
-    # Tenta converter o texto em expressão matemática
+@lru_cache(maxsize=512)
+def _interpretar_canonica(variavel1, entrada):
+    """Converte o texto já canonicalizado (feito uma vez por entrada diferente)."""
     return parse_expr(
         entrada,
-        transformations=transformations,
+        transformations=TRANSFORMACOES,
         local_dict={'x': variavel1}  # Diz que 'x' no texto refere-se ao símbolo 'x'
     )
 
 
+@lru_cache(maxsize=1024)
+def chave_expressao(expr):
+    """
+    Identificador estável da árvore da expressão (hash do srepr).
+    É o mesmo entre execuções e servidores, por isso serve de chave para os caches.
+    """
+    return hashlib.sha256(srepr(expr).encode("utf-8")).hexdigest()
+
+
 def formatar_solucao_inequacao(sol):
     """
     Formata a solução de forma robusta, aceitando intervalos simples,
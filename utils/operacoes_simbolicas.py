@@ -0,0 +1,83 @@
+# Sympy: Biblioteca de matemática simbólica. Ela resolve equações, limites e derivadas
+# da mesma forma que um humano faria no papel (algebricamente), e não apenas aproximando números.
+from sympy import limit, solve, solveset, integrate, denom, S, Poly, cancel, fraction, roots
+
+from utils.avaliador_numerico import substituicao_exata_viavel
+from utils.cache_persistente import em_cache
+from utils.execucao_limitada import executar_com_prazo
+
+
+# ==========================================
+# OPERAÇÕES SIMBÓLICAS COM CACHE
+# ==========================================
+# Todas as análises das páginas passam por aqui, assim cada resultado é
+# calculado uma única vez e reaproveitado (inclusive entre sessões).
+# O cálculo em si roda em um processo trabalhador com prazo (TempoEsgotado se demorar demais).
+
+def calcular_limite(expr, variavel1, ponto, direcao="+-"):
+    """Limite de expr quando variavel1 → ponto (direcao: '+-', '+' ou '-')."""
+    return em_cache(
+        "limite", expr, (variavel1, ponto, direcao),
+        lambda: executar_com_prazo(limit, expr, variavel1, ponto, direcao)
+    )
+
+
+def _substituir(expr, variavel1, ponto):
+    """expr com o ponto no lugar da variável (função de módulo, para rodar no trabalhador)."""
+    return expr.subs(variavel1, ponto)
+
+
+def substituir_no_ponto(expr, variavel1, ponto):
+    """
+    f(ponto), exato. Na hora, quando a conta é segura; onde ela explodiria (ex: x^x^x em
+    x = 100 vira 100^(100^100)), no processo trabalhador, com prazo.
+    """
+    if substituicao_exata_viavel(variavel1, expr, ponto):
+        return _substituir(expr, variavel1, ponto)
+    return executar_com_prazo(_substituir, expr, variavel1, ponto)
+
+
+def resolver_equacao(expr, variavel1):
+    """Soluções de expr = 0 (lista do solve)."""
+    return em_cache("solve", expr, (variavel1,), lambda: executar_com_prazo(solve, expr, variavel1))
+
+
+def _raizes_do_numerador(expr, variavel1):
+    """Raízes do numerador (já sem fatores comuns com o denominador), com repetição removida."""
+    numerador, _ = fraction(cancel(expr))
+    polinomio = Poly(numerador, variavel1)
+    exatas = roots(polinomio)
+
+    # Grau alto sem fórmula (ex: x^5 - x + 1): as raízes que faltam saem numéricas
+    if sum(exatas.values()) < polinomio.degree():
+        return list(dict.fromkeys(polinomio.nroots()))
+    return list(exatas)
+
+
+def raizes_de_funcao_racional(expr, variavel1):
+    """Soluções exatas de expr = 0 para funções racionais (quociente de polinômios em variavel1)."""
+    return em_cache(
+        "raizes_racionais", expr, (variavel1,),
+        lambda: executar_com_prazo(_raizes_do_numerador, expr, variavel1)
+    )
+
+
+def zeros_do_denominador(expr, variavel1):
+    """Pontos onde o denominador da expressão se anula."""
+    return em_cache(
+        "zeros_denominador", expr, (variavel1,),
+        lambda: executar_com_prazo(solve, denom(expr), variavel1)
+    )
+
+
+def resolver_inequacao(relacao, variavel1):
+    """Conjunto solução de uma inequação (ex: expr > 0) nos reais."""
+    return em_cache(
+        "solveset", relacao, (variavel1,),
+        lambda: executar_com_prazo(solveset, relacao, variavel1, domain=S.Reals)
+    )
+
+
+def integrar(expr, variavel1):
+    """Integral indefinida (sem a constante C)."""
+    return em_cache("integral", expr, (variavel1,), lambda: executar_com_prazo(integrate, expr, variavel1))
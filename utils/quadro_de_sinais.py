@@ -0,0 +1,194 @@
+from fractions import Fraction
+
+import numpy as np
+
+# Sympy: Biblioteca de matemática simbólica. Aqui ela só monta os conjuntos da resposta
+# (intervalos e uniões), no mesmo formato que o solveset devolveria.
+from sympy import S, Float, FiniteSet, Interval, Rational, Union
+
+from utils.avaliador_numerico import avaliar_em_grade
+from utils.dominio import mascara_do_dominio
+from utils.gerar_dados_graficos import amostrar_funcao
+from utils.raizes_numericas import localizar_trechos_nulos, localizar_trocas_de_sinal, refinar_trocas_de_sinal
+
+
+# ==========================================
+# QUADRO DE SINAIS (INEQUAÇÕES)
+# ==========================================
+# Em vez de chamar o solveset a cada clique, monta UMA vez por expressão o quadro de sinais:
+# os pontos críticos (raízes, zeros do denominador, bordas do domínio) dividem a reta em
+# intervalos, e o sinal de cada intervalo sai de uma única avaliação vetorizada em um ponto
+# de teste por intervalo. f > 0, f < 0, f ≥ 0 e f ≤ 0 são respondidas a partir do mesmo quadro.
+# Trechos em que f é nula (ex: floor(x) em [0, 1)) são intervalos de sinal 0, e as bordas do
+# domínio e desses trechos entram na resposta quando f existe nelas e o operador aceita o sinal.
+
+# Janela usada nas funções não racionais (a mesma do gráfico)
+JANELA_NUMERICA = 10
+
+# Pontos distantes usados para decidir se o sinal das pontas continua até ±∞
+_PONTOS_DISTANTES = np.geomspace(JANELA_NUMERICA, 1e4, 60)
+
+
+class QuadroDeSinais:
+    """
+    Intervalos (início, fim, sinal) que cobrem a reta, com sinal +1, -1, 0 (f nula no trecho todo)
+    ou NaN (fora do domínio), os pontos onde f = 0 e o sinal de f em outras bordas de intervalo
+    (bordas do domínio e dos trechos nulos) onde f existe, como pares (ponto, sinal).
+    'completo' é False quando o quadro só vale dentro de uma janela.
+    """
+
+    def __init__(self, intervalos, zeros, completo=True, sinais_nas_bordas=()):
+        self.intervalos = intervalos
+        self.zeros = zeros
+        self.completo = completo
+        self.sinais_nas_bordas = sinais_nas_bordas
+
+    def resolver(self, operador):
+        """Conjunto solução de f(x) <operador> 0, com operador em '>', '<', '>=' ou '<='."""
+        alvo = 1 if operador in (">", ">=") else -1
+        aceitos = {alvo, 0} if operador in (">=", "<=") else {alvo}
+
+        partes = [Interval.open(inicio, fim) for inicio, fim, sinal in self.intervalos if sinal in aceitos]
+        pontos = [ponto for ponto, sinal in self.sinais_nas_bordas if sinal in aceitos]
+        if 0 in aceitos:
+            pontos += list(self.zeros)
+        if pontos:
+            partes.append(FiniteSet(*pontos))
+        return Union(*partes) if partes else S.EmptySet
+
+
+def _sinais(variavel1, expr, pontos):
+    """Sinal de f em cada ponto (uma avaliação vetorizada); NaN onde f não existe."""
+    return np.sign(avaliar_em_grade(variavel1, expr, np.asarray(pontos, dtype=float)))
+
+
+def _sinais_dos_intervalos(variavel1, expr, inicios, fins):
+    """
+    Sinal de f em cada intervalo: o do ponto médio, conferido em mais dois pontos quando dá 0
+    (o meio pode cair bem numa raiz isolada; o sinal 0 só fica se f for nula nos três).
+    """
+    inicios, fins = np.asarray(inicios, dtype=float), np.asarray(fins, dtype=float)
+    sinais = _sinais(variavel1, expr, (inicios + fins) / 2)
+    nulos = np.flatnonzero(sinais == 0)
+    if nulos.size:
+        largura = fins[nulos] - inicios[nulos]
+        for fracao in (0.25, 0.75):
+            outro = _sinais(variavel1, expr, inicios[nulos] + fracao * largura)
+            trocar = (sinais[nulos] == 0) & np.isfinite(outro) & (outro != 0)
+            sinais[nulos[trocar]] = outro[trocar]
+    return sinais
+
+
+def _pontos_de_teste(criticos):
+    """Um ponto dentro de cada intervalo entre os pontos críticos (inclusive as pontas infinitas)."""
+    if not criticos:
+        return [0.0]
+    valores = [float(c) for c in criticos]
+    meios = [(a + b) / 2 for a, b in zip(valores, valores[1:])]
+    return [valores[0] - 1.0] + meios + [valores[-1] + 1.0]
+
+
+def montar_quadro_racional(variavel1, expr, raizes, polos):
+    """
+    Quadro exato de uma função racional, a partir das raízes e dos zeros do denominador (reais).
+    Nos zeros do denominador a função não existe, mesmo que o numerador também se anule (furo).
+    """
+    polos = {p for p in polos if p.is_real}
+    zeros = sorted({r for r in raizes if r.is_real} - polos, key=float)
+    criticos = sorted(set(zeros) | polos, key=float)
+
+    bordas = [-S.Infinity] + criticos + [S.Infinity]
+    sinais = _sinais(variavel1, expr, _pontos_de_teste(criticos))
+    intervalos = list(zip(bordas[:-1], bordas[1:], sinais))
+    return QuadroDeSinais(intervalos, zeros)
+
+
+def _ponto_legivel(valor):
+    """Número da borda em forma legível: fração simples (ex: 0, 3, 1/2) se for o caso, senão Float."""
+    fracao = Fraction(float(valor)).limit_denominator(100)
+    if abs(float(fracao) - valor) <= 1e-9 * max(1.0, abs(valor)):
+        return Rational(fracao.numerator, fracao.denominator)
+    return Float(valor, 8)
+
+
+def _bissecao(condicao, dentro, fora, iteracoes=60):
+    """
+    Bisseção vetorizada entre pontos onde condicao vale (dentro) e onde não vale (fora):
+    usada nas bordas do domínio (máscara) e nas bordas dos trechos em que f = 0.
+    """
+    dentro, fora = dentro.copy(), fora.copy()
+    for _ in range(iteracoes):
+        meio = (dentro + fora) / 2
+        vale = condicao(meio)
+        dentro = np.where(vale, meio, dentro)
+        fora = np.where(vale, fora, meio)
+    return (dentro + fora) / 2
+
+
+def _mesmo_sinal_ate_o_infinito(sinais_distantes, sinal_da_ponta):
+    """
+    True se o sinal da ponta do quadro se mantém nos pontos distantes.
+    Zeros e NaN por estouro/underflow (ex: e^x em x = 10⁴) não contam contra.
+    """
+    if np.isnan(sinal_da_ponta):
+        return bool(np.all(np.isnan(sinais_distantes)))
+    if sinal_da_ponta == 0:
+        return bool(np.all(sinais_distantes == 0))  # Trecho nulo (ex: max(x, 0) à esquerda)
+    conhecidos = sinais_distantes[np.isfinite(sinais_distantes) & (sinais_distantes != 0)]
+    return conhecidos.size >= sinais_distantes.size // 2 and bool(np.all(conhecidos == sinal_da_ponta))
+
+
+def montar_quadro_numerico(variavel1, expr):
+    """
+    Quadro numérico (funções não racionais), a partir dos pontos da amostragem adaptativa do gráfico:
+    trocas de sinal refinadas (raízes, polos e saltos) e bordas do domínio refinadas por bisseção.
+    As pontas só são estendidas até ±∞ se o sinal se mantém em pontos bem distantes.
+    """
+    x_vals, _, _ = amostrar_funcao(variavel1, expr, -JANELA_NUMERICA, JANELA_NUMERICA)
+
+    # Reavalia os pontos: os NaN que o gráfico coloca nos polos (só para quebrar a linha) saem
+    x_vals = x_vals[np.isfinite(x_vals)]
+    y_vals = avaliar_em_grade(variavel1, expr, x_vals)
+
+    inicios, fins, zeros_na_grade = localizar_trocas_de_sinal(x_vals, y_vals)
+    trocas, e_raiz = refinar_trocas_de_sinal(variavel1, expr, inicios, fins)
+
+    # Bordas do domínio: vizinhos com um ponto dentro e outro fora do domínio (a mesma máscara do gráfico)
+    existe = mascara_do_dominio(variavel1, expr, x_vals)
+    mudancas = np.flatnonzero(existe[:-1] != existe[1:])
+    lado_dentro = np.where(existe[mudancas], x_vals[mudancas], x_vals[mudancas + 1])
+    lado_fora = np.where(existe[mudancas], x_vals[mudancas + 1], x_vals[mudancas])
+    bordas_dominio = _bissecao(lambda pontos: mascara_do_dominio(variavel1, expr, pontos), lado_dentro, lado_fora)
+
+    # Bordas dos trechos em que f é nula (ex: floor(x) em [0, 1))
+    nulos, nao_nulos = localizar_trechos_nulos(x_vals, y_vals)
+    bordas_nulas = _bissecao(lambda pontos: avaliar_em_grade(variavel1, expr, pontos) == 0, nulos, nao_nulos)
+
+    zeros = sorted({_ponto_legivel(r) for r in np.concatenate([trocas[e_raiz], zeros_na_grade])})
+    bordas_com_sinal = {_ponto_legivel(p) for p in np.concatenate([bordas_dominio, bordas_nulas])} - set(zeros)
+    criticos = sorted(set(zeros) | bordas_com_sinal | {_ponto_legivel(p) for p in trocas[~e_raiz]})
+
+    criticos = [c for c in criticos if -JANELA_NUMERICA < c < JANELA_NUMERICA]
+    bordas = [S(-JANELA_NUMERICA)] + criticos + [S(JANELA_NUMERICA)]
+    valores = np.array([float(b) for b in bordas])
+    sinais = _sinais_dos_intervalos(variavel1, expr, valores[:-1], valores[1:])
+
+    # Nas bordas do domínio e dos trechos nulos, o próprio ponto entra na resposta se f existe nele
+    # (ex: √x - 1 ≤ 0 vale em x = 0). Nos polos e saltos a borda fica sempre aberta.
+    bordas_com_sinal = sorted(c for c in bordas_com_sinal if c in criticos)
+    sinais_nas_bordas = [
+        (ponto, sinal)
+        for ponto, sinal in zip(bordas_com_sinal, _sinais(variavel1, expr, [float(c) for c in bordas_com_sinal]))
+        if np.isfinite(sinal)
+    ]
+
+    # Estende as pontas até ±∞ quando o sinal não muda nos pontos distantes
+    completo = True
+    for indice, lado in ((0, -1), (-1, 1)):
+        if _mesmo_sinal_ate_o_infinito(_sinais(variavel1, expr, lado * _PONTOS_DISTANTES), sinais[indice]):
+            bordas[indice] = lado * S.Infinity
+        else:
+            completo = False
+
+    intervalos = list(zip(bordas[:-1], bordas[1:], sinais))
+    return QuadroDeSinais(intervalos, zeros, completo, sinais_nas_bordas)
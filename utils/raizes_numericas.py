@@ -0,0 +1,146 @@
+import numpy as np
+
+from utils.avaliador_numerico import avaliar_em_grade
+
+
+# ==========================================
+# RAÍZES NUMÉRICAS (TROCA DE SINAL + REFINAMENTO)
+# ==========================================
+# 1. Procura, na grade que o gráfico já calculou, os trechos onde f(x) troca de sinal
+#    (uma passada vetorizada; os polos já vêm separados por NaN na grade do gráfico).
+# 2. Refina todos esses trechos AO MESMO TEMPO pelo método de Illinois (falsa posição
+#    modificada): cada iteração é uma única avaliação vetorizada de todos os pontos novos.
+
+# Largura relativa em que um trecho é considerado resolvido
+TOLERANCIA_RAIZ = 1e-13
+
+# Máximo de iterações do refinamento (Illinois costuma precisar de menos de 20)
+MAXIMO_ITERACOES = 100
+
+
+def localizar_trocas_de_sinal(x_vals, y_vals):
+    """
+    Trechos [a, b] da grade onde f(a) e f(b) têm sinais opostos, e pontos da grade onde f = 0.
+    Zeros que ocupam vários pontos seguidos (f nula em um intervalo inteiro) ficam de fora:
+    as bordas desses trechos vêm de localizar_trechos_nulos.
+    Retorna (inicios, fins, zeros_na_grade).
+    """
+    x_vals = np.asarray(x_vals, dtype=float)
+    y_vals = np.asarray(y_vals, dtype=float)
+
+    # Pares vizinhos com os dois valores existentes e sinais opostos (NaN nunca entra).
+    # Compara só os sinais: o produto dos valores estoura (ou some) com números extremos.
+    with np.errstate(all="ignore"):
+        trocas = np.flatnonzero(np.sign(y_vals[:-1]) * np.sign(y_vals[1:]) < 0)
+
+    # Zeros exatos isolados: f = 0 no ponto e diferente de zero nos dois vizinhos
+    nulos = y_vals == 0
+    vizinhos_nulos = np.zeros_like(nulos)
+    vizinhos_nulos[1:] |= nulos[:-1]
+    vizinhos_nulos[:-1] |= nulos[1:]
+    zeros = x_vals[nulos & ~vizinhos_nulos]
+
+    return x_vals[trocas], x_vals[trocas + 1], zeros
+
+
+def localizar_trechos_nulos(x_vals, y_vals):
+    """
+    Bordas dos trechos em que f = 0 em vários pontos seguidos (ex: floor(x) em [0, 1)):
+    pares vizinhos da grade com um ponto nulo (do trecho) e o outro existente e não nulo.
+    Retorna (nulos, nao_nulos): o ponto de cada par dentro e fora do trecho.
+    """
+    x_vals = np.asarray(x_vals, dtype=float)
+    y_vals = np.asarray(y_vals, dtype=float)
+
+    nulos = y_vals == 0
+    em_trecho = np.zeros_like(nulos)
+    em_trecho[1:] |= nulos[1:] & nulos[:-1]
+    em_trecho[:-1] |= nulos[:-1] & nulos[1:]
+
+    nao_nulos = np.isfinite(y_vals) & ~nulos
+    entradas = np.flatnonzero(nao_nulos[:-1] & em_trecho[1:])
+    saidas = np.flatnonzero(em_trecho[:-1] & nao_nulos[1:])
+    return (np.concatenate([x_vals[entradas + 1], x_vals[saidas]]),
+            np.concatenate([x_vals[entradas], x_vals[saidas + 1]]))
+
+
+def refinar_raizes(variavel1, expr, inicios, fins):
+    """
+    Refina, todos juntos, os trechos com troca de sinal até a largura de TOLERANCIA_RAIZ.
+    Descarta os trechos em que a troca de sinal é um salto (ex: floor, |x|/x) e não uma raiz.
+    Retorna as raízes encontradas (vetor).
+    """
+    pontos, e_raiz = refinar_trocas_de_sinal(variavel1, expr, inicios, fins)
+    return pontos[e_raiz]
+
+
+def refinar_trocas_de_sinal(variavel1, expr, inicios, fins):
+    """
+    Refina os trechos com troca de sinal até o ponto onde o sinal troca.
+    Retorna (pontos, e_raiz): e_raiz é False onde a troca é um polo ou um salto (|f| não vai a zero)
+    ou onde a função deixa de existir dentro do trecho.
+    """
+    a = np.asarray(inicios, dtype=float).copy()
+    b = np.asarray(fins, dtype=float).copy()
+    if a.size == 0:
+        return a, np.zeros(0, dtype=bool)
+
+    fa = avaliar_em_grade(variavel1, expr, a)
+    fb = avaliar_em_grade(variavel1, expr, b)
+    escala = np.maximum(1.0, np.maximum(np.abs(fa), np.abs(fb)))
+
+    # Qual ponta foi trocada na iteração anterior (+1: a, -1: b), para a correção de Illinois
+    ultimo_lado = np.zeros(a.size)
+    raizes = (a + b) / 2
+    validos = np.ones(a.size, dtype=bool)
+
+    for _ in range(MAXIMO_ITERACOES):
+        ativos = validos & (b - a > TOLERANCIA_RAIZ * np.maximum(1.0, np.abs(a)))
+        if not ativos.any():
+            break
+        i = np.flatnonzero(ativos)
+
+        # Ponto da falsa posição; se sair do trecho (ou der NaN), usa o ponto médio
+        with np.errstate(all="ignore"):
+            c = (a[i] * fb[i] - b[i] * fa[i]) / (fb[i] - fa[i])
+        fora = ~np.isfinite(c) | (c <= a[i]) | (c >= b[i])
+        c[fora] = (a[i][fora] + b[i][fora]) / 2
+
+        fc = avaliar_em_grade(variavel1, expr, c)
+        raizes[i] = c
+
+        # Função inexistente dentro do trecho: não dá para garantir a raiz
+        validos[i[np.isnan(fc)]] = False
+
+        achou = fc == 0
+        a[i[achou]] = b[i[achou]] = c[achou]
+
+        troca_a = ~achou & (np.sign(fc) == np.sign(fa[i]))
+        troca_b = ~achou & ~troca_a & ~np.isnan(fc)
+
+        # Illinois: se a mesma ponta ficou parada duas vezes seguidas, seu valor cai pela metade
+        fb[i[troca_a & (ultimo_lado[i] == 1)]] /= 2
+        fa[i[troca_b & (ultimo_lado[i] == -1)]] /= 2
+
+        a[i[troca_a]], fa[i[troca_a]] = c[troca_a], fc[troca_a]
+        b[i[troca_b]], fb[i[troca_b]] = c[troca_b], fc[troca_b]
+        ultimo_lado[i[troca_a]] = 1
+        ultimo_lado[i[troca_b]] = -1
+
+    # Em um salto (ou polo) o trecho encolhe até a descontinuidade, mas |f| lá continua grande
+    f_raizes = avaliar_em_grade(variavel1, expr, raizes)
+    validos &= np.abs(f_raizes) <= 1e-6 * escala
+
+    return raizes, validos
+
+
+def raizes_na_grade(variavel1, expr, x_vals, y_vals):
+    """Raízes reais de expr dentro da janela da grade, em ordem e sem repetição."""
+    inicios, fins, zeros = localizar_trocas_de_sinal(x_vals, y_vals)
+    raizes = np.sort(np.concatenate([refinar_raizes(variavel1, expr, inicios, fins), zeros]))
+
+    if raizes.size > 1:
+        distintas = np.diff(raizes) > TOLERANCIA_RAIZ * 100 * np.maximum(1.0, np.abs(raizes[1:]))
+        raizes = raizes[np.concatenate([[True], distintas])]
+
+    return raizes
@@ -0,0 +1,98 @@
+import numpy as np
+
+# Plotly: Biblioteca para criar gráficos interativos (onde pode dar zoom, passar o mouse, etc).
+import plotly.graph_objects as go
+
+
+# ==========================================
+# REDUÇÃO DOS DADOS ENVIADOS AO NAVEGADOR
+# ==========================================
+# A tela só mostra uma coluna de pixels por intervalo de x. Dentro de cada coluna,
+# basta mandar o primeiro, o último, o menor e o maior ponto (min/máx por coluna, "M4"):
+# a linha desenhada fica igual, pixel por pixel, à linha com todos os pontos.
+# Os valores de y vão como float32 (metade do tamanho) e séries grandes usam WebGL (Scattergl).
+
+# Colunas de pixels consideradas na largura do gráfico (um pouco acima da largura real)
+LARGURA_EM_PIXELS = 1000
+
+# A partir desse número de pontos a série é desenhada com WebGL
+LIMIAR_WEBGL = 2000
+
+# Valores além disso não cabem em float32; para o desenho basta "muito fora da janela"
+_MAIOR_VALOR_DESENHAVEL = 1e30
+
+# Maior erro de arredondamento aceito, em fração da faixa de y (bem menos que um pixel)
+_ERRO_TOLERADO = 1e-5
+
+
+def reduzir_para_pixels(x_vals, y_vals, x_min, x_max, largura=LARGURA_EM_PIXELS):
+    """
+    Min/máx por coluna de pixel: de cada coluna fica o primeiro, o último, o menor e o maior ponto
+    (e o primeiro NaN, para a linha continuar quebrada nos polos e fora do domínio).
+    x_vals precisa estar em ordem crescente.
+    """
+    x_vals = np.asarray(x_vals, dtype=float)
+    y_vals = np.asarray(y_vals, dtype=float)
+    total = x_vals.size
+    if total <= 4 * largura:
+        return x_vals, y_vals
+
+    colunas = np.clip(((x_vals - x_min) / (x_max - x_min) * largura).astype(int), 0, largura - 1)
+    inicios = np.flatnonzero(np.r_[True, colunas[1:] != colunas[:-1]])
+    fins = np.r_[inicios[1:], total] - 1
+    coluna_do_ponto = np.repeat(np.arange(inicios.size), np.diff(np.r_[inicios, total]))
+    indices = np.arange(total)
+
+    nan = np.isnan(y_vals)
+    y_baixo = np.where(nan, np.inf, y_vals)
+    y_alto = np.where(nan, -np.inf, y_vals)
+    minimos = np.minimum.reduceat(y_baixo, inicios)
+    maximos = np.maximum.reduceat(y_alto, inicios)
+
+    def primeiro_onde(condicao):
+        """Primeiro índice de cada coluna em que a condição vale (total, se em nenhum)."""
+        return -np.maximum.reduceat(np.where(condicao, -indices, -total), inicios)
+
+    escolhidos = np.concatenate([
+        inicios, fins,
+        primeiro_onde(y_baixo == minimos[coluna_do_ponto]),
+        primeiro_onde(y_alto == maximos[coluna_do_ponto]),
+        primeiro_onde(nan),
+    ])
+    escolhidos = np.unique(escolhidos[escolhidos < total])
+    return x_vals[escolhidos], y_vals[escolhidos]
+
+
+def compactar(valores):
+    """
+    Valores de y em float32 (metade dos bytes do float64), com os gigantes limitados.
+    Se o arredondamento do float32 aparecer na tela (ex: zoom em y perto de 1000000,
+    numa faixa de 0.001), os valores seguem em float64.
+    """
+    valores = np.asarray(valores, dtype=float)
+    with np.errstate(invalid="ignore"):
+        valores = np.clip(valores, -_MAIOR_VALOR_DESENHAVEL, _MAIOR_VALOR_DESENHAVEL)
+    compactos = valores.astype(np.float32)
+
+    finitos = np.isfinite(valores)
+    if not finitos.any():
+        return compactos
+    # Faixa típica dos valores (sem os picos perto dos polos) e o maior erro do arredondamento nela
+    baixo, alto = np.percentile(valores[finitos], [1, 99])
+    tipicos = finitos & (valores >= baixo) & (valores <= alto)
+    erro = np.max(np.abs(compactos[tipicos].astype(float) - valores[tipicos]))
+    if erro > (alto - baixo) * _ERRO_TOLERADO:
+        return valores
+    return compactos
+
+
+def traco_de_linha(x_vals, y_vals, x_min, x_max, **opcoes):
+    """
+    Traço do Plotly para uma série longa: reduz à largura em pixels, compacta os vetores
+    e troca para Scattergl (WebGL) quando ainda sobram muitos pontos.
+    """
+    x_vals, y_vals = reduzir_para_pixels(x_vals, y_vals, x_min, x_max)
+    tipo = go.Scattergl if x_vals.size > LIMIAR_WEBGL else go.Scatter
+    # x segue em float64: no zoom, a janela pode ser estreita demais para o float32
+    # (em [50, 50.0001] milhares de pontos viram algumas dezenas de valores distintos)
+    return tipo(x=x_vals, y=compactar(y_vals), **opcoes)
@@ -0,0 +1,144 @@
+import os
+import time
+from functools import lru_cache
+
+# Sympy: Biblioteca de matemática simbólica. Aqui usamos os simplificadores "baratos"
+# (cancel, together, factor_terms, factor, trigsimp) antes de apelar para o simplify completo.
+import sympy as sp
+from sympy.functions.elementary.trigonometric import TrigonometricFunction
+
+from utils.cache_persistente import em_cache
+from utils.execucao_limitada import TempoEsgotado, executar_com_prazo
+
+
+# ==========================================
+# SIMPLIFICAÇÃO COM ORÇAMENTO DE TEMPO
+# ==========================================
+# O sp.simplify tenta dezenas de estratégias e, em produtos de trigonométricas com raízes,
+# pode levar vários segundos. Aqui as transformações baratas rodam primeiro (também num
+# processo trabalhador, com prazo), fica o menor
+# resultado (pela contagem de operações) e o simplify completo só entra se ainda sobrar tempo.
+
+# Tempo total (em segundos) que uma simplificação pode gastar
+ORCAMENTO_SIMPLIFICACAO = float(os.environ.get("LIMITE_ORCAMENTO_SIMPLIFICACAO", 1.0))
+
+# Abaixo disso não vale a pena acordar um processo trabalhador para o simplify completo
+_SOBRA_MINIMA = 0.1
+
+# Acima desta contagem de operações o simplify completo não é tentado
+_OPERACOES_MAXIMAS_SIMPLIFY = 25
+
+
+def _so_trigonometricas(expr):
+    """True se todas as funções da expressão forem trigonométricas (ex: sin, cos, tan)."""
+    funcoes = expr.atoms(sp.Function)
+    return bool(funcoes) and all(isinstance(f, TrigonometricFunction) for f in funcoes)
+
+
+def _cancelar_e_fatorar(expr):
+    """Forma racional canônica e depois fatorada (bom para quocientes de polinômios)."""
+    return sp.factor(sp.cancel(expr))
+
+
+def _juntar_e_colocar_em_evidencia(expr):
+    """Junta as frações em uma só e coloca os fatores comuns em evidência."""
+    return sp.factor_terms(sp.together(expr))
+
+
+def _transformacoes_baratas(expr):
+    """Lista das transformações rápidas que fazem sentido para esta expressão, da mais barata à mais cara."""
+    transformacoes = [sp.factor_terms, sp.together, _juntar_e_colocar_em_evidencia, sp.cancel]
+    if expr.is_rational_function():
+        transformacoes.append(_cancelar_e_fatorar)
+    if _so_trigonometricas(expr):
+        transformacoes.append(sp.trigsimp)
+    return transformacoes
+
+
+def _melhor_transformacao_barata(expr, orcamento):
+    """
+    Roda no processo trabalhador: aplica as transformações baratas (cada uma partindo da
+    expressão original) enquanto houver orçamento e fica a que tiver menos operações.
+    """
+    inicio = time.perf_counter()
+    melhor, custo = expr, sp.count_ops(expr)
+
+    for transformacao in _transformacoes_baratas(expr):
+        if time.perf_counter() - inicio > orcamento:
+            break
+        try:
+            candidato = transformacao(expr)
+        except Exception:
+            continue
+        custo_candidato = sp.count_ops(candidato)
+        if custo_candidato < custo:
+            melhor, custo = candidato, custo_candidato
+
+    return melhor
+
+
+def _simplificar(expr, orcamento):
+    """
+    Retorna (melhor expressão, completa). completa é False quando o prazo cortou algum passo
+    que deveria ter rodado: o resultado depende do momento (processo lento, pool frio).
+    """
+    inicio = time.perf_counter()
+
+    # Mesmo as transformações "baratas" podem travar (um factor ou cancel enorme),
+    # então rodam no processo trabalhador, com o orçamento como prazo
+    try:
+        melhor = executar_com_prazo(_melhor_transformacao_barata, expr, orcamento, prazo=orcamento)
+    except TempoEsgotado:
+        return expr, False
+    custo = sp.count_ops(melhor)
+
+    # Sobrou tempo: tenta o simplify completo, limitado ao que resta do orçamento.
+    # Em expressões muito grandes ele quase nunca termina a tempo, então nem é tentado.
+    if custo > _OPERACOES_MAXIMAS_SIMPLIFY:
+        return melhor, True
+
+    sobra = orcamento - (time.perf_counter() - inicio)
+    if sobra <= _SOBRA_MINIMA:
+        return melhor, False
+    try:
+        candidato = executar_com_prazo(sp.simplify, melhor, prazo=sobra)
+    except TempoEsgotado:
+        return melhor, False
+    if sp.count_ops(candidato) < custo:
+        melhor = candidato
+    return melhor, True
+
+
+class _SimplificacaoIncompleta(Exception):
+    """Leva o resultado cortado pelo prazo para fora do lru_cache (exceções não ficam guardadas)."""
+
+    def __init__(self, resultado):
+        super().__init__()
+        self.resultado = resultado
+
+
+@lru_cache(maxsize=256)
+def _simplificacao_guardada(expr, orcamento):
+    """Simplificação completa, guardada em memória e no disco; a incompleta volta como exceção."""
+    melhor, completa = em_cache(
+        "simplificar", expr, (orcamento,), lambda: _simplificar(expr, orcamento),
+        guardar=lambda resultado: resultado[1]
+    )
+    if not completa:
+        raise _SimplificacaoIncompleta(melhor)
+    return melhor
+
+
+def simplificar_com_orcamento(expr, orcamento=None):
+    """
+    Versão mais simples de expr encontrada dentro do orçamento de tempo (em segundos).
+    Nunca piora a expressão: se nada diminuir a contagem de operações, devolve a própria expr.
+    O resultado fica guardado por expressão (em memória e no cache em disco), a não ser que
+    o prazo tenha cortado algum passo: aí a próxima chamada tenta de novo.
+    """
+    if orcamento is None:
+        orcamento = ORCAMENTO_SIMPLIFICACAO
+    try:
+        return _simplificacao_guardada(expr, orcamento)
+    except _SimplificacaoIncompleta as incompleta:
+        return incompleta.resultado
@@ -0,0 +1,108 @@
+import numpy as np
+
+# Sympy: Biblioteca de matemática simbólica. Aqui ela só entra na prova simbólica,
+# quando a comparação numérica não consegue decidir.
+import sympy as sp
+
+from utils.avaliador_numerico import avaliar_em_grade
+from utils.execucao_limitada import TempoEsgotado, executar_com_prazo
+
+
+# ==========================================
+# VERIFICAÇÃO RÁPIDA DE EQUIVALÊNCIA
+# ==========================================
+# Para conferir se duas expressões são a mesma função, compara os valores das duas
+# em pontos sorteados (vetorizado, alguns milissegundos). Só quando os pontos não
+# bastam (ex: domínio minúsculo) é que se tenta provar simbolicamente, com prazo.
+
+# Quantidade de pontos sorteados e mínimo de pontos válidos (dentro do domínio) para decidir
+QUANTIDADE_PONTOS = 64
+MINIMO_PONTOS_VALIDOS = 8
+
+# Tolerâncias da comparação (relativa e absoluta)
+TOLERANCIA_RELATIVA = 1e-6
+TOLERANCIA_ABSOLUTA = 1e-9
+
+# Quantos pontos discordantes são refeitos com precisão alta (se houver mais, vale a prova simbólica)
+MAXIMO_PONTOS_PRECISOS = 5
+
+# Prazo (em segundos) da prova simbólica
+PRAZO_PROVA = 3
+
+# Semente fixa: a mesma verificação sorteia sempre os mesmos pontos
+_SEMENTE = 20240613
+
+
+def _sortear_pontos():
+    """Pontos espalhados em várias escalas: perto de zero, em [-10, 10] e longe da origem."""
+    sorteio = np.random.default_rng(_SEMENTE)
+    quarto = QUANTIDADE_PONTOS // 4
+    return np.concatenate([
+        sorteio.uniform(-1, 1, quarto),
+        sorteio.uniform(-10, 10, 2 * quarto),
+        sorteio.choice([-1, 1], quarto) * 10 ** sorteio.uniform(1, 2, quarto),
+    ])
+
+
+def _diferenca_nula(expr_a, expr_b):
+    """
+    Prova simbólica (roda no processo trabalhador): True se a diferença simplifica para zero.
+    Não conseguir simplificar não prova que são diferentes, então nesse caso devolve None.
+    """
+    return True if sp.simplify(expr_a - expr_b) == 0 else None
+
+
+def _valores_precisos_iguais(variavel1, expr_a, expr_b, pontos):
+    """Confere, com 30 dígitos, os pontos em que a comparação em float discordou."""
+    for ponto in pontos:
+        valor = sp.Float(float(ponto), 30)
+        a = expr_a.subs(variavel1, valor).evalf(30)
+        b = expr_b.subs(variavel1, valor).evalf(30)
+        if abs(a - b) > TOLERANCIA_ABSOLUTA + TOLERANCIA_RELATIVA * abs(b):
+            return False
+    return True
+
+
+def verificar_equivalencia(variavel1, expr_a, expr_b, prazo=None):
+    """
+    Confere se expr_a e expr_b são a mesma função de variavel1.
+    Retorna True (iguais), False (diferentes) ou None (não foi possível decidir a tempo).
+    """
+    # Derivadas e integrais que o Sympy deixou sem resolver (ex: derivada de floor) não têm valor numérico
+    if expr_a.has(sp.Derivative, sp.Integral) or expr_b.has(sp.Derivative, sp.Integral):
+        return None
+
+    pontos = _sortear_pontos()
+    try:
+        valores_a = avaliar_em_grade(variavel1, expr_a, pontos)
+        valores_b = avaliar_em_grade(variavel1, expr_b, pontos)
+    except Exception:
+        return None  # Não deu para avaliar: inconclusivo, não é erro
+
+    # Só valem os pontos onde as duas existem (domínio real)
+    validos = np.isfinite(valores_a) & np.isfinite(valores_b)
+
+    if np.count_nonzero(validos) >= MINIMO_PONTOS_VALIDOS:
+        iguais = np.isclose(valores_a[validos], valores_b[validos],
+                            rtol=TOLERANCIA_RELATIVA, atol=TOLERANCIA_ABSOLUTA)
+        if iguais.all():
+            return True
+
+        # Discordância em float pode ser só cancelamento numérico: refaz alguns desses pontos
+        # com precisão alta. Se todos eles baterem mas sobrarem outros, decide a prova simbólica.
+        discordantes = pontos[validos][~iguais]
+        try:
+            if not _valores_precisos_iguais(variavel1, expr_a, expr_b, discordantes[:MAXIMO_PONTOS_PRECISOS]):
+                return False
+            if discordantes.size <= MAXIMO_PONTOS_PRECISOS:
+                return True
+        except Exception:
+            pass
+
+    # Inconclusivo: tenta provar simbolicamente, com prazo
+    try:
+        return executar_com_prazo(_diferenca_nula, expr_a, expr_b, prazo=PRAZO_PROVA if prazo is None else prazo)
+    except TempoEsgotado:
+        return None
+    except Exception:
+        return None  # O simplify falhou: também não decide